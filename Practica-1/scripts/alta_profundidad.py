@@ -0,0 +1,111 @@
+# --------- PSEUDOCOLOR PARA IMÁGENES DE ALTA PROFUNDIDAD (16 BITS Y FLOTANTES) ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# cv2.applyColorMap solo acepta imágenes de 8 bits. Aquí las imágenes uint16 y float32 (radiografías exportadas
+# de DICOM, termografía radiométrica) se normalizan en una sola pasada a índices de una tabla de búsqueda grande
+# (4096 o 65536 entradas) y se colorean con una indexación vectorizada, sin reducirlas antes a 8 bits.
+
+import numpy as np
+
+from registro_mapas import obtener_lut_extendida # Importar las tablas de búsqueda extendidas del registro
+from coloreado_paralelo import en_bandas # Importar el coloreado por bandas en paralelo
+
+# Número de entradas por defecto de la tabla de búsqueda para imágenes de alta profundidad
+N_ENTRADAS_ALTA = 4096
+
+# Número máximo de píxeles que se muestrean para estimar percentiles en imágenes flotantes
+MUESTRA_PERCENTILES = 1_000_000
+
+METODOS_NORMALIZACION = ("rango", "ventana", "percentil")
+
+
+def percentiles(imagen: np.ndarray, p_bajo: float, p_alto: float) -> tuple:
+    """
+    Calcula los percentiles p_bajo y p_alto de la imagen.
+    Para enteros de 8 y 16 bits se usa un histograma (np.bincount, una sola pasada, exacto);
+    para flotantes se estiman sobre una muestra uniforme de la imagen.
+    """
+    if imagen.dtype in (np.uint8, np.uint16):
+        histograma = np.bincount(imagen.ravel(), minlength=256)
+        acumulado = np.cumsum(histograma)
+        total = acumulado[-1]
+        bajo = int(np.searchsorted(acumulado, total * p_bajo / 100.0))
+        alto = int(np.searchsorted(acumulado, total * p_alto / 100.0))
+        return float(bajo), float(alto)
+
+    plano = imagen.ravel()
+    if plano.size > MUESTRA_PERCENTILES:
+        plano = plano[::plano.size // MUESTRA_PERCENTILES]
+    bajo, alto = np.nanpercentile(plano, [p_bajo, p_alto])
+    return float(bajo), float(alto)
+
+
+def limites_normalizacion(imagen: np.ndarray, metodo: str = "rango", ventana: tuple = None,
+                          rango_percentiles: tuple = (1.0, 99.0)) -> tuple:
+    """
+    Retorna los límites (minimo, maximo) de intensidad que se asignan al primer y al último color del mapa.
+    metodo: str → "rango" (mínimo y máximo de la imagen), "ventana" (centro y ancho, como window/level
+                  en radiología) o "percentil" (recorte por percentiles)
+    ventana: tuple → (centro, ancho), requerido con el método "ventana"
+    rango_percentiles: tuple → (p_bajo, p_alto) para el método "percentil"
+    """
+    if metodo == "ventana":
+        if ventana is None:
+            raise ValueError("El método 'ventana' requiere (centro, ancho).")
+        centro, ancho = ventana
+        if ancho <= 0:
+            raise ValueError("El ancho de la ventana debe ser positivo.")
+        return centro - ancho / 2.0, centro + ancho / 2.0
+    if metodo == "percentil":
+        return percentiles(imagen, *rango_percentiles)
+    if metodo == "rango":
+        return float(np.nanmin(imagen)), float(np.nanmax(imagen))
+    raise ValueError(f"Método '{metodo}' no válido. Opciones disponibles: {list(METODOS_NORMALIZACION)}")
+
+
+def indices_lut(imagen: np.ndarray, minimo: float, maximo: float, n: int = N_ENTRADAS_ALTA) -> np.ndarray:
+    """
+    Convierte la imagen en índices de una tabla de n entradas (desplazamiento, escala y recorte) sin copias intermedias.
+    Retorna un arreglo uint16 con valores entre 0 y n - 1.
+    """
+    escala = (n - 1) / (maximo - minimo) if maximo > minimo else 0.0
+    # Operaciones en el mismo búfer flotante para no crear copias intermedias
+    indices = imagen.astype(np.float32)
+    indices -= minimo
+    indices *= escala
+    np.clip(indices, 0, n - 1, out=indices)
+    # Los NaN (píxeles sin dato) se asignan al primer color
+    np.nan_to_num(indices, copy=False, nan=0.0)
+    return np.rint(indices, out=indices).astype(np.uint16)
+
+
+def aplicar_mapa_alta_profundidad(imagen: np.ndarray, nombre: str, n: int = N_ENTRADAS_ALTA,
+                                  metodo: str = "rango", ventana: tuple = None,
+                                  rango_percentiles: tuple = (1.0, 99.0), dst: np.ndarray = None,
+                                  hilos: int = None) -> np.ndarray:
+    """
+    Aplica el mapa de color indicado a una imagen en escala de grises de cualquier profundidad (uint8, uint16, float).
+    dst: np.ndarray → búfer opcional H x W x 3 (uint8) donde escribir el resultado
+    hilos: int → hilos para colorear por bandas las imágenes grandes; None usa hilos_coloreado de config.py
+    Retorna la imagen pseudocoloreada en BGR (uint8).
+    """
+    if imagen.ndim != 2:
+        raise ValueError("La imagen debe estar en escala de grises (H x W).")
+    minimo, maximo = limites_normalizacion(imagen, metodo, ventana, rango_percentiles)
+    lut = obtener_lut_extendida(nombre, n)
+    if dst is None:
+        dst = np.empty(imagen.shape + (3,), dtype=np.uint8)
+
+    # Los índices siempre están dentro de la tabla: mode="clip" evita el búfer intermedio de mode="raise"
+    if imagen.dtype in (np.uint8, np.uint16):
+        # Enteros: se compone la normalización con la tabla de colores en una tabla por valor de entrada,
+        # de modo que cada píxel cuesta una sola búsqueda
+        valores = np.arange(np.iinfo(imagen.dtype).max + 1, dtype=np.float32)
+        tabla = np.take(lut, indices_lut(valores, minimo, maximo, n), axis=0)
+        return en_bandas(lambda entrada, salida: np.take(tabla, entrada, axis=0, out=salida, mode="clip"),
+                         imagen, dst, hilos)
+
+    # Flotantes: cada banda calcula sus propios índices, lo que también limita la memoria temporal
+    return en_bandas(lambda entrada, salida: np.take(lut, indices_lut(entrada, minimo, maximo, n), axis=0,
+                                                     out=salida, mode="clip"), imagen, dst, hilos)
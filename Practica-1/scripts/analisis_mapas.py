@@ -0,0 +1,290 @@
+# --------- ANÁLISIS PERCEPTUAL DE MAPAS DE COLOR ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Métricas objetivas para comparar mapas de color (de OpenCV o paletas personalizadas) en el espacio CIELAB:
+#   - monotonicidad de la luminosidad L* (un mapa cuya luminosidad sube y baja crea bordes falsos)
+#   - uniformidad perceptual (ΔE entre muestras equiespaciadas de la tabla de búsqueda lo más constante posible)
+#   - distinguibilidad bajo simulación de daltonismo (matrices de Machado et al., 2009, severidad 1.0)
+# Todas las métricas se calculan vectorizadas sobre las tablas de 256 entradas de todos los mapas a la vez,
+# y opcionalmente se ponderan con el histograma de una imagen (solo importan los niveles que la imagen usa).
+
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from registro_mapas import apilar_luts_rgb, crear_lut, nombres_mapas # Importar las tablas del registro de mapas
+from alta_profundidad import indices_lut, limites_normalizacion # Importar la normalización de alta profundidad
+
+# sRGB lineal → XYZ (iluminante D65)
+RGB_A_XYZ = np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+])
+XYZ_A_RGB = np.linalg.inv(RGB_A_XYZ)
+BLANCO_D65 = np.array([0.95047, 1.0, 1.08883])
+
+# Simulación de dicromacia sobre RGB lineal (Machado, Oliveira y Fernandes, 2009; severidad 1.0)
+MATRICES_DALTONISMO = {
+    "protanopia": np.array([
+        [0.152286, 1.052583, -0.204868],
+        [0.114503, 0.786281, 0.099216],
+        [-0.003882, -0.048116, 1.051998],
+    ]),
+    "deuteranopia": np.array([
+        [0.367322, 0.860646, -0.227968],
+        [0.280085, 0.672501, 0.047413],
+        [-0.011820, 0.042940, 0.968881],
+    ]),
+    "tritanopia": np.array([
+        [1.255528, -0.076749, -0.178779],
+        [-0.078411, 0.930809, 0.147602],
+        [0.004733, 0.691367, 0.303900],
+    ]),
+}
+
+# Pesos de cada métrica en la puntuación global (suman 1)
+PESOS_PUNTUACION = {
+    "monotonicidad": 0.30,
+    "uniformidad": 0.20,
+    "distinguibilidad": 0.25,
+    "contraste": 0.25,
+}
+
+# Separación (en entradas) de las muestras con las que se mide la uniformidad: entre entradas consecutivas de
+# una tabla uint8 el ΔE es del orden del error de cuantización y la métrica mediría ruido en lugar del mapa
+PASO_UNIFORMIDAD = 8
+
+
+def rgb_a_lineal(rgb: np.ndarray) -> np.ndarray:
+    """
+    Convierte colores sRGB (uint8 o flotantes en [0, 1]) a RGB lineal.
+    """
+    rgb = np.asarray(rgb)
+    # Los enteros (tablas uint8) están en 0-255; los flotantes ya están normalizados en [0, 1]
+    rgb = rgb / 255.0 if np.issubdtype(rgb.dtype, np.integer) else rgb.astype(np.float64)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def lineal_a_lab(lineal: np.ndarray) -> np.ndarray:
+    """
+    Convierte RGB lineal (... x 3) a CIELAB (... x 3) con el iluminante D65.
+    """
+    xyz = (lineal @ RGB_A_XYZ.T) / BLANCO_D65
+    delta = 6.0 / 29.0
+    f = np.where(xyz > delta ** 3, np.cbrt(xyz), xyz / (3 * delta ** 2) + 4.0 / 29.0)
+    lab = np.empty_like(f)
+    lab[..., 0] = 116.0 * f[..., 1] - 16.0
+    lab[..., 1] = 500.0 * (f[..., 0] - f[..., 1])
+    lab[..., 2] = 200.0 * (f[..., 1] - f[..., 2])
+    return lab
+
+
+def rgb_a_lab(rgb: np.ndarray) -> np.ndarray:
+    """
+    Convierte colores sRGB (... x 3) a CIELAB.
+    """
+    return lineal_a_lab(rgb_a_lineal(rgb))
+
+
+def lab_a_lineal(lab: np.ndarray) -> np.ndarray:
+    """
+    Convierte CIELAB (... x 3, iluminante D65) a RGB lineal; los colores fuera de la gama quedan fuera de [0, 1].
+    """
+    lab = np.asarray(lab, dtype=np.float64)
+    delta = 6.0 / 29.0
+    fy = (lab[..., 0] + 16.0) / 116.0
+    f = np.stack([fy + lab[..., 1] / 500.0, fy, fy - lab[..., 2] / 200.0], axis=-1)
+    xyz = np.where(f > delta, f ** 3, 3 * delta ** 2 * (f - 4.0 / 29.0)) * BLANCO_D65
+    return xyz @ XYZ_A_RGB.T
+
+
+def lineal_a_rgb(lineal: np.ndarray) -> np.ndarray:
+    """
+    Convierte RGB lineal a sRGB en [0, 1], recortando los colores fuera de la gama.
+    """
+    lineal = np.clip(lineal, 0.0, 1.0)
+    return np.where(lineal <= 0.0031308, lineal * 12.92, 1.055 * lineal ** (1.0 / 2.4) - 0.055)
+
+
+def lab_a_rgb(lab: np.ndarray) -> np.ndarray:
+    """
+    Convierte colores CIELAB (... x 3) a sRGB en [0, 1].
+    """
+    return lineal_a_rgb(lab_a_lineal(lab))
+
+
+def simular_daltonismo(lineal: np.ndarray, tipo: str) -> np.ndarray:
+    """
+    Simula cómo percibe los colores (RGB lineal, ... x 3) una persona con la deficiencia indicada.
+    tipo: str → "protanopia", "deuteranopia" o "tritanopia"
+    """
+    if tipo not in MATRICES_DALTONISMO:
+        raise ValueError(f"Opción '{tipo}' no válida. Opciones disponibles: {list(MATRICES_DALTONISMO.keys())}")
+    return np.clip(lineal @ MATRICES_DALTONISMO[tipo].T, 0.0, 1.0)
+
+
+def pesos_histograma(imagen_gris: np.ndarray, n: int = 256) -> np.ndarray:
+    """
+    Histograma normalizado de la imagen en n niveles (los mismos que indexan la tabla de búsqueda).
+    Las imágenes de 16 bits o flotantes se reparten en n niveles según su rango.
+    """
+    if imagen_gris.dtype == np.uint8 and n == 256:
+        histograma = np.bincount(imagen_gris.ravel(), minlength=256)
+    else:
+        minimo, maximo = limites_normalizacion(imagen_gris, "rango")
+        histograma = np.bincount(indices_lut(imagen_gris, minimo, maximo, n).ravel(), minlength=n)
+    return histograma / max(histograma.sum(), 1)
+
+
+def metricas_luts(luts_rgb: np.ndarray, pesos: np.ndarray = None) -> dict:
+    """
+    Calcula las métricas perceptuales de K tablas de búsqueda a la vez.
+    luts_rgb: np.ndarray → K x N x 3 (RGB, uint8 o flotante en [0, 1])
+    pesos: np.ndarray → histograma normalizado de N niveles; si se indica, los pasos entre niveles
+                        se ponderan por la frecuencia con la que la imagen los usa
+    Retorna un diccionario de arreglos de K elementos:
+        - monotonicidad: fracción de la variación de L* que avanza en su dirección global (1 = monótono)
+        - rango_l: diferencia de L* entre el primer y el último color
+        - uniformidad: 1 - coeficiente de variación de ΔE entre entradas separadas PASO_UNIFORMIDAD (1 = uniforme)
+        - longitud: suma de ΔE entre entradas consecutivas (contraste perceptual total del mapa)
+        - contraste: igual que longitud, ponderada con el histograma si se indica
+        - distinguibilidad: peor caso (entre las tres dicromacias) de la longitud simulada / longitud normal
+        - <tipo>: la misma razón para cada deficiencia simulada
+    """
+    lineal = rgb_a_lineal(luts_rgb)
+    lab = lineal_a_lab(lineal)
+
+    n_pasos = luts_rgb.shape[1] - 1
+    if pesos is None:
+        pesos_pasos = np.full(n_pasos, 1.0 / n_pasos)
+    else:
+        # Cada paso entre dos niveles pesa el promedio de sus frecuencias
+        pesos = np.asarray(pesos, dtype=np.float64)
+        pesos_pasos = (pesos[:-1] + pesos[1:]) / 2.0
+        pesos_pasos /= max(pesos_pasos.sum(), 1e-12)
+
+    # Monotonicidad: parte de la variación de L* que avanza en la dirección global del mapa
+    delta_l = np.diff(lab[..., 0], axis=1)
+    direccion = np.where(lab[:, -1, 0] >= lab[:, 0, 0], 1.0, -1.0)[:, None]
+    variacion = np.abs(delta_l) @ pesos_pasos
+    monotonicidad = np.divide(np.maximum(delta_l * direccion, 0.0) @ pesos_pasos, variacion,
+                              out=np.ones_like(variacion), where=variacion > 0)
+
+    # ΔE (CIE76) entre entradas consecutivas: K x (N - 1)
+    delta_e = np.linalg.norm(np.diff(lab, axis=1), axis=2)
+    # Uniformidad sobre muestras cada PASO_UNIFORMIDAD entradas (incluida siempre la última)
+    muestras = np.unique(np.r_[np.arange(0, n_pasos + 1, PASO_UNIFORMIDAD), n_pasos])
+    delta_e_muestras = np.linalg.norm(np.diff(lab[:, muestras], axis=1), axis=2)
+    media = delta_e_muestras.mean(axis=1)
+    desviacion = delta_e_muestras.std(axis=1)
+    uniformidad = np.clip(1.0 - np.divide(desviacion, media, out=np.ones_like(media), where=media > 0), 0.0, 1.0)
+    longitud = delta_e.sum(axis=1)
+    # Reescalado a N - 1 pasos para que sin histograma el contraste coincida con la longitud
+    contraste = (delta_e @ pesos_pasos) * n_pasos
+
+    metricas = {
+        "monotonicidad": monotonicidad,
+        "rango_l": np.abs(lab[:, -1, 0] - lab[:, 0, 0]),
+        "uniformidad": uniformidad,
+        "longitud": longitud,
+        "contraste": contraste,
+    }
+    razones = []
+    for tipo in MATRICES_DALTONISMO:
+        lab_simulado = lineal_a_lab(simular_daltonismo(lineal, tipo))
+        delta_e_simulado = np.linalg.norm(np.diff(lab_simulado, axis=1), axis=2)
+        razon = np.divide(delta_e_simulado @ pesos_pasos, delta_e @ pesos_pasos,
+                          out=np.zeros(len(contraste)), where=contraste > 0)
+        metricas[tipo] = np.clip(razon, 0.0, 1.0)
+        razones.append(metricas[tipo])
+    metricas["distinguibilidad"] = np.min(razones, axis=0)
+    return metricas
+
+
+def puntuaciones(metricas: dict) -> np.ndarray:
+    """
+    Combina las métricas en una puntuación entre 0 y 1 con PESOS_PUNTUACION.
+    El contraste se normaliza respecto al mayor de los mapas comparados.
+    """
+    contraste = metricas["contraste"]
+    normalizado = contraste / contraste.max() if contraste.max() > 0 else contraste
+    return (PESOS_PUNTUACION["monotonicidad"] * metricas["monotonicidad"]
+            + PESOS_PUNTUACION["uniformidad"] * metricas["uniformidad"]
+            + PESOS_PUNTUACION["distinguibilidad"] * metricas["distinguibilidad"]
+            + PESOS_PUNTUACION["contraste"] * normalizado)
+
+
+def analizar_mapa(mapa, imagen_gris: np.ndarray = None) -> dict:
+    """
+    Analiza un solo mapa de color.
+    mapa: str o list → nombre de un mapa registrado o lista de colores RGB en [0, 1] (paleta sin registrar)
+    imagen_gris: np.ndarray → si se indica, el contraste y la distinguibilidad se ponderan con su histograma
+    Retorna un diccionario con el valor de cada métrica.
+    """
+    if isinstance(mapa, str):
+        lut_rgb = apilar_luts_rgb([mapa.upper()])
+    else:
+        lut_rgb = crear_lut(mapa)[:, 0, ::-1][None]
+    pesos = pesos_histograma(imagen_gris, lut_rgb.shape[1]) if imagen_gris is not None else None
+    return {clave: float(valor[0]) for clave, valor in metricas_luts(lut_rgb, pesos).items()}
+
+
+def clasificar_mapas(nombres: list = None, imagen_gris: np.ndarray = None) -> list:
+    """
+    Calcula las métricas de todos los mapas indicados (por defecto, todos los registrados) y los ordena
+    de mejor a peor puntuación. Con imagen_gris las métricas se ponderan con el histograma de la imagen.
+    Retorna una lista de diccionarios con "nombre", "puntuacion" y cada métrica.
+    """
+    if nombres is None:
+        nombres = nombres_mapas()
+    nombres = [nombre.upper() for nombre in nombres]
+    pesos = pesos_histograma(imagen_gris) if imagen_gris is not None else None
+    metricas = metricas_luts(apilar_luts_rgb(nombres), pesos)
+    puntos = puntuaciones(metricas)
+    filas = [{"nombre": nombre, "puntuacion": float(puntos[i]),
+              **{clave: float(valor[i]) for clave, valor in metricas.items()}}
+             for i, nombre in enumerate(nombres)]
+    return sorted(filas, key=lambda fila: fila["puntuacion"], reverse=True)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Clasifica los mapas de color con métricas perceptuales (CIELAB).")
+    parser.add_argument("-m", "--mapas", nargs="+", default=None,
+                        help="Mapas a comparar (por defecto, todos los registrados).")
+    parser.add_argument("-i", "--imagen", default=None,
+                        help="Imagen cuyo histograma pondera las métricas (se lee con su profundidad original).")
+    parser.add_argument("-n", "--top", type=int, default=None, help="Mostrar solo los N mejores mapas.")
+    args = parser.parse_args(argv)
+
+    imagen_gris = None
+    if args.imagen is not None:
+        import cv2
+        imagen_gris = cv2.imread(args.imagen, cv2.IMREAD_GRAYSCALE | cv2.IMREAD_ANYDEPTH)
+        if imagen_gris is None:
+            print(f"No se pudo cargar la imagen: {args.imagen}")
+            return 1
+
+    inicio = time.perf_counter()
+    try:
+        filas = clasificar_mapas(args.mapas, imagen_gris)
+    except ValueError as e:
+        print("Error:", e)
+        return 1
+    duracion = time.perf_counter() - inicio
+
+    print(f"{'#':>3} {'Mapa':<22} {'Punt.':>6} {'Monot.':>7} {'Unif.':>6} {'Contr.':>8} "
+          f"{'Prot.':>6} {'Deut.':>6} {'Trit.':>6}")
+    for i, fila in enumerate(filas[:args.top], start=1):
+        print(f"{i:>3} {fila['nombre']:<22} {fila['puntuacion']:6.3f} {fila['monotonicidad']:7.3f} "
+              f"{fila['uniformidad']:6.3f} {fila['contraste']:8.1f} {fila['protanopia']:6.3f} "
+              f"{fila['deuteranopia']:6.3f} {fila['tritanopia']:6.3f}")
+    print(f"{len(filas)} mapa(s) analizados en {duracion*1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+# --------- BENCHMARK DE LAS RUTAS CRÍTICAS DE LA PRÁCTICA 1 ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Mide ImagenPseudocolor.__init__, guardar, comparar_mapas_color y mostrar_personalizacion_mapas
+# sobre gradientes sintéticos y las imágenes de resources/input a varias resoluciones.
+# Los resultados se guardan en JSON para comparar dos ejecuciones y detectar regresiones.
+#
+# Ejemplo de uso:
+#   python benchmark_pseudocolor.py -o base.json
+#   python benchmark_pseudocolor.py -r 512 2048 16384 --repeticiones 3 -o nuevo.json --comparar base.json
+#   python benchmark_pseudocolor.py --importacion -o arranque.json
+#   python benchmark_pseudocolor.py --escalado 8192 --hilos 1 2 4 8 16 -o escalado.json
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import datetime
+import tempfile
+import contextlib
+import subprocess
+import tracemalloc
+
+# Backend no interactivo: el benchmark nunca abre ventanas
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+import cv2
+import numpy as np
+
+import practica_1 # Importar el módulo principal para medir sus funciones de procesamiento
+from config import script_dir # Importar la variable script_dir desde config.py
+from imagen_pseudocolor import ImagenPseudocolor # Importar la clase ImagenPseudocolor
+from cache_resultados import CacheResultados # Importar la caché de resultados para desactivarla durante la medición
+
+# Resoluciones por defecto (lado mayor, en píxeles)
+RESOLUCIONES = [512, 1024, 2048, 4096]
+
+# Umbral (proporción) a partir del cual un caso se reporta como regresión al comparar ejecuciones
+UMBRAL_REGRESION = 1.10
+
+# Presupuesto de tiempo de importación (ms, mediana en un proceso nuevo) de los módulos que usan
+# los procesos del pool y las tareas cortas; ninguno debe cargar matplotlib ni PyQt
+PRESUPUESTO_IMPORTACION_MS = {
+    "config": 50,
+    "registro_mapas": 400,
+    "imagen_pseudocolor": 400,
+    "cli_pseudocolor": 500,
+}
+MODULOS_PESADOS = ("matplotlib", "PyQt5")
+
+# Lado de la imagen y variantes de coloreado que se miden en el benchmark de escalado por hilos
+LADO_ESCALADO = 8192
+VARIANTES_ESCALADO = {
+    "opencv_uint8": ("JET", np.uint8, {}),
+    "personalizado_uint8": ("PASTEL", np.uint8, {}),
+    "ecualizar_uint8": ("JET", np.uint8, {"realce": "ecualizar"}),
+    "alta_profundidad_uint16": ("JET", np.uint16, {}),
+}
+
+
+def memoria_pico_mb(fn):
+    """
+    Pico de memoria (MB) asignada por una ejecución de fn, medido con tracemalloc (incluye los arreglos de NumPy
+    y OpenCV). Se mide en una ejecución aparte para que tracemalloc no altere los tiempos.
+    """
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn()
+        return (tracemalloc.get_traced_memory()[1] - base) / (1024 * 1024)
+    finally:
+        tracemalloc.stop()
+
+
+class CacheDesactivada(CacheResultados):
+    """
+    Caché de resultados que nunca reutiliza un archivo: cada repetición mide el trabajo completo
+    (mosaico, figura y guardado) y los archivos se escriben en la carpeta temporal del benchmark.
+    """
+    def buscar(self, clave: str, extension: str):
+        return None
+
+
+def gradiente_sintetico(lado):
+    """
+    Gradiente diagonal de lado x lado en escala de grises (uint8).
+    """
+    fila = np.linspace(0, 255, lado, dtype=np.float32)
+    return ((fila[None, :] + fila[:, None]) / 2).astype(np.uint8)
+
+
+def imagenes_entrada(resoluciones, incluir_recursos=True):
+    """
+    Genera tuplas (nombre, imagen_gris) con los gradientes sintéticos y, opcionalmente,
+    las imágenes de resources/input reescaladas para que su lado mayor coincida con cada resolución.
+    """
+    originales = []
+    if incluir_recursos:
+        carpeta_input = os.path.join(script_dir, 'resources/input')
+        for archivo in sorted(os.listdir(carpeta_input)):
+            imagen = cv2.imread(os.path.join(carpeta_input, archivo), cv2.IMREAD_GRAYSCALE)
+            if imagen is not None:
+                originales.append((os.path.splitext(archivo)[0], imagen))
+
+    for lado in resoluciones:
+        yield f"gradiente_{lado}", gradiente_sintetico(lado)
+        for nombre, imagen in originales:
+            factor = lado / max(imagen.shape[:2])
+            tamano = (max(1, round(imagen.shape[1] * factor)), max(1, round(imagen.shape[0] * factor)))
+            interpolacion = cv2.INTER_AREA if factor < 1 else cv2.INTER_LINEAR
+            yield f"{nombre}_{lado}", cv2.resize(imagen, tamano, interpolation=interpolacion)
+
+
+def medir(fn, repeticiones):
+    """
+    Ejecuta fn el número de repeticiones indicado (más una de calentamiento) y retorna los tiempos en segundos.
+    """
+    fn()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fn()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def casos_benchmark(carpeta_temporal):
+    """
+    Casos medidos: nombre → función que recibe la imagen en escala de grises.
+    """
+    jet = {}
+
+    def init_opencv(imagen_gris):
+        jet["resultado"] = ImagenPseudocolor(imagen_gris, "JET")
+
+    def resultado_jet(imagen_gris):
+        # Reutilizar el resultado coloreado para medir solo el guardado
+        if "resultado" not in jet:
+            jet["resultado"] = ImagenPseudocolor(imagen_gris, "JET")
+        return jet["resultado"]
+
+    def guardar(imagen_gris):
+        resultado_jet(imagen_gris).guardar("bench", carpeta=carpeta_temporal)
+
+    def guardar_figura(imagen_gris):
+        resultado_jet(imagen_gris).guardar("bench", imagen_gris, carpeta=carpeta_temporal)
+        plt.close("all")
+
+    # Los mensajes de consola del módulo principal se descartan para no mezclarse con el reporte
+    def comparar(imagen_gris):
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            practica_1.comparar_mapas_color(imagen_gris)
+        plt.close("all")
+
+    def personalizar(imagen_gris):
+        with open(os.devnull, "w") as nulo, contextlib.redirect_stdout(nulo):
+            practica_1.mostrar_personalizacion_mapas(imagen_gris)
+        plt.close("all")
+
+    return {
+        "init_opencv": init_opencv,
+        "init_personalizado": lambda imagen_gris: ImagenPseudocolor(imagen_gris, "PASTEL"),
+        "guardar": guardar,
+        "guardar_figura": guardar_figura,
+        "comparar_mapas_color": comparar,
+        "mostrar_personalizacion_mapas": personalizar,
+    }, jet
+
+
+def ejecutar_benchmark(resoluciones=RESOLUCIONES, repeticiones=5, casos=None, incluir_recursos=True):
+    """
+    Ejecuta todos los casos sobre todas las imágenes y retorna el reporte como diccionario.
+    """
+    # Validar los casos antes de crear la carpeta temporal y redirigir el módulo principal
+    funciones, estado = casos_benchmark(None)
+    if casos:
+        invalidos = [nombre for nombre in casos if nombre not in funciones]
+        if invalidos:
+            raise ValueError(f"Casos no válidos: {invalidos}. Opciones disponibles: {list(funciones)}")
+
+    carpeta_temporal = tempfile.mkdtemp(prefix="bench_pseudocolor_")
+    funciones, estado = casos_benchmark(carpeta_temporal)
+    if casos:
+        funciones = {nombre: funciones[nombre] for nombre in casos}
+
+    # Redirigir las salidas del módulo principal y evitar que abra ventanas
+    script_dir_original, show_original = practica_1.script_dir, plt.show
+    cache_original = practica_1.obtener_cache_resultados
+    practica_1.script_dir = carpeta_temporal
+    plt.show = lambda *args, **kwargs: None
+    # Sin caché de resultados: se mide el trabajo real y no se toca resources/cache
+    cache = CacheDesactivada(os.path.join(carpeta_temporal, "cache"), 0, persistir=False)
+    practica_1.obtener_cache_resultados = lambda: cache
+
+    resultados = []
+    try:
+        for nombre_imagen, imagen_gris in imagenes_entrada(resoluciones, incluir_recursos):
+            estado.clear()
+            megapixeles = imagen_gris.size / 1e6
+            for nombre_caso, fn in funciones.items():
+                tiempos = medir(lambda: fn(imagen_gris), repeticiones)
+                mediana = float(np.median(tiempos))
+                resultados.append({
+                    "caso": nombre_caso,
+                    "imagen": nombre_imagen,
+                    "forma": list(imagen_gris.shape),
+                    "mediana_ms": mediana * 1000,
+                    "p95_ms": float(np.percentile(tiempos, 95)) * 1000,
+                    "mp_por_segundo": megapixeles / mediana if mediana > 0 else None,
+                    "memoria_pico_mb": memoria_pico_mb(lambda: fn(imagen_gris)),
+                })
+                print(f"{nombre_caso:32s} {nombre_imagen:45s} mediana {mediana*1000:9.2f} ms  "
+                      f"p95 {resultados[-1]['p95_ms']:9.2f} ms")
+    finally:
+        practica_1.script_dir, plt.show = script_dir_original, show_original
+        practica_1.obtener_cache_resultados = cache_original
+        shutil.rmtree(carpeta_temporal, ignore_errors=True)
+
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "entorno": {
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+        "repeticiones": repeticiones,
+        "resultados": resultados,
+    }
+
+
+def hilos_por_defecto():
+    """
+    Potencias de dos hasta el número de núcleos, más el número de núcleos si no es potencia de dos.
+    """
+    nucleos = os.cpu_count() or 1
+    hilos = [2 ** i for i in range(nucleos.bit_length()) if 2 ** i <= nucleos]
+    return hilos if hilos[-1] == nucleos else hilos + [nucleos]
+
+
+def benchmark_escalado(lado=LADO_ESCALADO, hilos=None, repeticiones=5):
+    """
+    Mide el coloreado de una sola imagen grande por bandas con distinto número de hilos.
+    Reporta la mediana, la aceleración respecto a un hilo y la eficiencia (aceleración / hilos).
+    """
+    hilos = sorted(set(hilos or hilos_por_defecto()) | {1})
+    base = gradiente_sintetico(lado)
+    resultados = []
+    for variante, (nombre, tipo, opciones) in VARIANTES_ESCALADO.items():
+        imagen_gris = base if tipo == np.uint8 else base.astype(tipo) * 257
+        # Un solo búfer de salida para no medir la asignación de memoria
+        resultado = ImagenPseudocolor(imagen_gris, nombre, **opciones)
+        referencia = None
+        for n in hilos:
+            tiempos = medir(lambda: resultado.aplicar(imagen_gris, nombre, hilos=n, **opciones), repeticiones)
+            mediana = float(np.median(tiempos))
+            referencia = referencia or mediana
+            resultados.append({
+                "caso": f"escalado_{variante}",
+                "imagen": f"gradiente_{lado}",
+                "hilos": n,
+                "mediana_ms": mediana * 1000,
+                "p95_ms": float(np.percentile(tiempos, 95)) * 1000,
+                "mp_por_segundo": imagen_gris.size / 1e6 / mediana if mediana > 0 else None,
+                "aceleracion": referencia / mediana if mediana > 0 else None,
+                "eficiencia": referencia / mediana / n if mediana > 0 else None,
+            })
+            print(f"escalado_{variante:28s} hilos {n:3d}  mediana {mediana*1000:9.2f} ms  "
+                  f"x{resultados[-1]['aceleracion']:.2f} (eficiencia {resultados[-1]['eficiencia']:.0%})")
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "nucleos": os.cpu_count(),
+        "repeticiones": repeticiones,
+        "resultados": resultados,
+    }
+
+
+def medir_importacion(modulo, repeticiones=5):
+    """
+    Mide el tiempo de importación de un módulo en procesos nuevos (sin caché de módulos) y
+    detecta si arrastra módulos pesados. Retorna la mediana en ms y la lista de módulos pesados cargados.
+    """
+    codigo = (
+        "import sys, time, json\n"
+        "inicio = time.perf_counter()\n"
+        f"import {modulo}\n"
+        "duracion = (time.perf_counter() - inicio) * 1000\n"
+        f"pesados = [m for m in {MODULOS_PESADOS!r} if m in sys.modules]\n"
+        "print(json.dumps({'ms': duracion, 'pesados': pesados}))\n"
+    )
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    tiempos, pesados = [], []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", codigo], cwd=directorio, capture_output=True,
+                                text=True, check=True).stdout
+        medicion = json.loads(salida.strip().splitlines()[-1])
+        tiempos.append(medicion["ms"])
+        pesados = medicion["pesados"]
+    return {"modulo": modulo, "mediana_ms": float(np.median(tiempos)), "pesados": pesados}
+
+
+def benchmark_importacion(repeticiones=5, presupuesto=PRESUPUESTO_IMPORTACION_MS):
+    """
+    Mide el arranque de cada módulo con presupuesto y retorna (resultados, lista de incumplimientos).
+    """
+    resultados, incumplimientos = [], []
+    for modulo, limite in presupuesto.items():
+        medicion = medir_importacion(modulo, repeticiones)
+        medicion["presupuesto_ms"] = limite
+        resultados.append(medicion)
+        estado = "OK"
+        if medicion["mediana_ms"] > limite or medicion["pesados"]:
+            estado = "EXCEDIDO"
+            incumplimientos.append(medicion)
+        print(f"import {modulo:24s} {medicion['mediana_ms']:8.1f} ms (presupuesto {limite} ms) "
+              f"pesados: {medicion['pesados'] or '-'}  [{estado}]")
+    return resultados, incumplimientos
+
+
+def comparar_reportes(anterior, actual, umbral=UMBRAL_REGRESION):
+    """
+    Compara dos reportes caso por caso (mediana) y retorna la lista de regresiones que superan el umbral.
+    """
+    # Los reportes de escalado incluyen el número de hilos en la clave de cada caso
+    previos = {(r["caso"], r["imagen"], r.get("hilos")): r for r in anterior["resultados"]}
+    regresiones = []
+    for r in actual["resultados"]:
+        previo = previos.get((r["caso"], r["imagen"], r.get("hilos")))
+        if previo is None or previo["mediana_ms"] <= 0:
+            continue
+        proporcion = r["mediana_ms"] / previo["mediana_ms"]
+        print(f"{r['caso']:32s} {r['imagen']:45s} {previo['mediana_ms']:9.2f} → {r['mediana_ms']:9.2f} ms "
+              f"(x{proporcion:.2f})")
+        if proporcion > umbral:
+            regresiones.append({"caso": r["caso"], "imagen": r["imagen"], "proporcion": proporcion})
+    return regresiones
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de las rutas críticas de pseudocolor.")
+    parser.add_argument("-r", "--resoluciones", type=int, nargs="+", default=RESOLUCIONES,
+                        help="Lados mayores a medir (por ejemplo 512 1024 ... 16384).")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones por caso.")
+    parser.add_argument("--casos", nargs="+", default=None, help="Subconjunto de casos a medir.")
+    parser.add_argument("--solo-sinteticas", action="store_true", help="No incluir las imágenes de resources/input.")
+    parser.add_argument("-o", "--salida", default="benchmark_pseudocolor.json", help="Archivo JSON de resultados.")
+    parser.add_argument("--comparar", default=None, help="Reporte JSON anterior contra el cual comparar.")
+    parser.add_argument("--importacion", action="store_true",
+                        help="Medir solo el tiempo de arranque y verificar el presupuesto de importación.")
+    parser.add_argument("--escalado", type=int, nargs="?", const=LADO_ESCALADO, default=None, metavar="LADO",
+                        help="Medir solo el coloreado por bandas de una imagen de LADO x LADO con distinto número "
+                             f"de hilos (por defecto {LADO_ESCALADO}).")
+    parser.add_argument("--hilos", type=int, nargs="+", default=None,
+                        help="Números de hilos para --escalado (por defecto, potencias de dos hasta los núcleos).")
+    args = parser.parse_args(argv)
+
+    if args.importacion:
+        resultados, incumplimientos = benchmark_importacion(args.repeticiones)
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+                       "importacion": resultados}, archivo, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en: {args.salida}")
+        if incumplimientos:
+            print(f"\n{len(incumplimientos)} módulo(s) exceden el presupuesto de importación")
+            return 1
+        return 0
+
+    if args.escalado:
+        reporte = benchmark_escalado(args.escalado, args.hilos, args.repeticiones)
+    else:
+        try:
+            reporte = ejecutar_benchmark(args.resoluciones, args.repeticiones, args.casos, not args.solo_sinteticas)
+        except ValueError as e:
+            print("Error:", e)
+            return 2
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en: {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            anterior = json.load(archivo)
+        print("\n=== Comparación con", args.comparar, "===")
+        regresiones = comparar_reportes(anterior, reporte)
+        if regresiones:
+            print(f"\n{len(regresiones)} regresión(es) mayores a x{UMBRAL_REGRESION:.2f}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# --------- CACHÉ DE IMÁGENES DECODIFICADAS ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import os
+import threading
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+from config import limite_cache_imagenes_mb # Importar el presupuesto de memoria de la caché desde config.py
+from instrumentacion import contar, tramo # Importar los contadores y tramos de la instrumentación
+
+# Modos de lectura soportados y su bandera de cv2.imread
+MODOS_LECTURA = {
+    "gris": cv2.IMREAD_GRAYSCALE,
+    "color": cv2.IMREAD_COLOR,
+    # Escala de grises conservando la profundidad original (16 bits o flotante)
+    "gris_profundo": cv2.IMREAD_GRAYSCALE | cv2.IMREAD_ANYDEPTH,
+}
+
+
+class CacheImagenes:
+    """
+    Caché LRU de imágenes decodificadas, limitada por un presupuesto de bytes.
+    Cada entrada se identifica por la ruta absoluta, la fecha de modificación y el tamaño del archivo,
+    de modo que un archivo modificado en disco se vuelve a leer automáticamente.
+    Atributos:
+        - limite_bytes: int → memoria máxima ocupada por las imágenes en caché
+        - aciertos, fallos, desalojos: int → estadísticas de uso
+    """
+    def __init__(self, limite_bytes: int) -> None:
+        self.limite_bytes: int = limite_bytes
+        self.aciertos: int = 0
+        self.fallos: int = 0
+        self.desalojos: int = 0
+        self._bytes: int = 0
+        self._entradas: OrderedDict = OrderedDict()
+        self._candado = threading.Lock()
+
+    def obtener(self, ruta: str, modo: str = "gris"):
+        """
+        Retorna la imagen decodificada (de solo lectura) en el modo indicado ("gris", "color" o "gris_profundo"),
+        leyéndola del disco solo si no está en caché. Retorna None si no se pudo cargar, igual que cv2.imread.
+        """
+        if modo not in MODOS_LECTURA:
+            raise ValueError(f"Modo '{modo}' no válido. Opciones disponibles: {list(MODOS_LECTURA.keys())}")
+        try:
+            estado = os.stat(ruta)
+        except OSError:
+            return None
+        clave = (os.path.abspath(ruta), estado.st_mtime_ns, estado.st_size, modo)
+
+        with self._candado:
+            imagen = self._entradas.get(clave)
+            if imagen is not None:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                contar("cache_imagenes.aciertos")
+                return imagen
+            self.fallos += 1
+        contar("cache_imagenes.fallos")
+
+        # Decodificar fuera del candado para no bloquear a otros hilos
+        with tramo("cargar.imread"):
+            imagen = cv2.imread(ruta, MODOS_LECTURA[modo])
+        if imagen is None:
+            return None
+        # Las imágenes compartidas son de solo lectura para que ningún consumidor las modifique
+        imagen.setflags(write=False)
+
+        with self._candado:
+            self._descartar_versiones_anteriores(clave)
+            if imagen.nbytes <= self.limite_bytes and clave not in self._entradas:
+                self._entradas[clave] = imagen
+                self._bytes += imagen.nbytes
+                self._ajustar_presupuesto()
+        return imagen
+
+    def _descartar_versiones_anteriores(self, clave: tuple) -> None:
+        """
+        Elimina las entradas de la misma ruta y modo que corresponden a una versión anterior del archivo.
+        """
+        ruta, _, _, modo = clave
+        obsoletas = [c for c in self._entradas if c[0] == ruta and c[3] == modo and c != clave]
+        for c in obsoletas:
+            self._bytes -= self._entradas.pop(c).nbytes
+
+    def _ajustar_presupuesto(self) -> None:
+        """
+        Desaloja las entradas menos usadas recientemente hasta respetar el presupuesto de bytes.
+        """
+        while self._bytes > self.limite_bytes and self._entradas:
+            _, imagen = self._entradas.popitem(last=False)
+            self._bytes -= imagen.nbytes
+            self.desalojos += 1
+
+    def limpiar(self) -> None:
+        """
+        Vacía la caché (las estadísticas se conservan).
+        """
+        with self._candado:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estadisticas(self) -> dict:
+        """
+        Retorna las estadísticas de uso de la caché.
+        """
+        with self._candado:
+            total = self.aciertos + self.fallos
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / total if total else 0.0,
+                "desalojos": self.desalojos,
+                "entradas": len(self._entradas),
+                "bytes": self._bytes,
+                "limite_bytes": self.limite_bytes,
+            }
+
+
+# Caché compartida por el menú de consola y la interfaz gráfica
+cache_imagenes = CacheImagenes(limite_cache_imagenes_mb * 1024 * 1024)
+
+
+def leer_gris(ruta: str) -> np.ndarray:
+    """
+    Lee la imagen en escala de grises a través de la caché compartida (None si no se pudo cargar).
+    """
+    return cache_imagenes.obtener(ruta, "gris")
+
+
+def leer_color(ruta: str) -> np.ndarray:
+    """
+    Lee la imagen a color (BGR) a través de la caché compartida (None si no se pudo cargar).
+    """
+    return cache_imagenes.obtener(ruta, "color")
+
+
+def leer_gris_profundo(ruta: str) -> np.ndarray:
+    """
+    Lee la imagen en escala de grises conservando su profundidad (uint16 o float32) a través de la caché compartida.
+    """
+    return cache_imagenes.obtener(ruta, "gris_profundo")
@@ -0,0 +1,225 @@
+# --------- CACHÉ EN DISCO DE RESULTADOS DE PSEUDOCOLOR (DIRECCIONADA POR CONTENIDO) ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Cada resultado se guarda con un nombre derivado del hash de los píxeles de entrada, de la identidad del mapa
+# de color (su tabla de búsqueda, que incluye los valores de las paletas de config.py) y de las opciones de salida.
+# Una petición repetida retorna el archivo existente sin volver a calcularlo.
+# Un índice JSON permite búsquedas O(1) y el desalojo LRU cuando se excede el tamaño máximo.
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from config import carpeta_cache_resultados, limite_cache_resultados_mb # Importar la configuración de la caché
+from registro_mapas import obtener_lut # Importar las tablas de búsqueda del registro de mapas de color
+from instrumentacion import contar # Importar los contadores de la instrumentación
+
+NOMBRE_INDICE = "indice.json"
+
+
+def huella_imagen(imagen: np.ndarray) -> str:
+    """
+    Hash (BLAKE2b) de los píxeles, la forma y el tipo de la imagen.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(f"{imagen.shape}|{imagen.dtype.str}".encode())
+    h.update(np.ascontiguousarray(imagen).data)
+    return h.hexdigest()
+
+
+def clave_resultado(huella: str, nombres: list, **opciones) -> str:
+    """
+    Clave de un resultado: huella de la imagen + tabla de búsqueda de cada mapa + opciones de salida.
+    Si una paleta personalizada cambia en config.py, cambia su tabla y con ella la clave.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    h.update(huella.encode())
+    for nombre in nombres:
+        h.update(nombre.upper().encode())
+        h.update(obtener_lut(nombre).tobytes())
+    h.update(json.dumps(opciones, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+class CacheResultados:
+    """
+    Caché de archivos de resultados con índice JSON y desalojo LRU por tamaño.
+    Atributos:
+        - carpeta: str → carpeta donde se guardan los archivos y el índice
+        - limite_bytes: int → tamaño máximo ocupado por los archivos en caché
+        - persistir: bool → si es False el índice no se escribe (procesos del pool que solo consultan;
+          el proceso principal registra sus accesos con registrar())
+    """
+    def __init__(self, carpeta: str, limite_bytes: int, persistir: bool = True) -> None:
+        self.carpeta: str = carpeta
+        self.limite_bytes: int = limite_bytes
+        self.persistir: bool = persistir
+        self.aciertos: int = 0
+        self.fallos: int = 0
+        self._candado = threading.Lock()
+        # clave -> {"archivo", "bytes", "acceso"}, ordenado del menos al más recientemente usado
+        self._indice: OrderedDict = OrderedDict()
+        self._bytes: int = 0
+        os.makedirs(carpeta, exist_ok=True)
+        self._cargar_indice()
+
+    def _ruta_indice(self) -> str:
+        return os.path.join(self.carpeta, NOMBRE_INDICE)
+
+    def _cargar_indice(self) -> None:
+        try:
+            with open(self._ruta_indice(), encoding="utf-8") as archivo:
+                entradas = json.load(archivo)
+        except (OSError, ValueError):
+            entradas = {}
+        for clave, entrada in sorted(entradas.items(), key=lambda par: par[1]["acceso"]):
+            self._indice[clave] = entrada
+            self._bytes += entrada["bytes"]
+
+    def guardar_indice(self) -> None:
+        """
+        Escribe el índice de forma atómica (archivo temporal + reemplazo).
+        """
+        if not self.persistir:
+            return
+        with self._candado:
+            datos = json.dumps(self._indice)
+        temporal = self._ruta_indice() + f".{os.getpid()}.tmp"
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            archivo.write(datos)
+        os.replace(temporal, self._ruta_indice())
+
+    def buscar(self, clave: str, extension: str):
+        """
+        Retorna la ruta del resultado en caché o None si no existe.
+        """
+        ruta = os.path.join(self.carpeta, clave + extension)
+        with self._candado:
+            entrada = self._indice.get(clave)
+            if entrada is not None and os.path.exists(ruta):
+                entrada["acceso"] = time.time()
+                self._indice.move_to_end(clave)
+                self.aciertos += 1
+                contar("cache_resultados.aciertos")
+                return ruta
+        # El archivo pudo haberlo creado otro proceso que todavía no actualiza el índice
+        if os.path.exists(ruta):
+            self.registrar(clave, clave + extension, os.path.getsize(ruta))
+            with self._candado:
+                self.aciertos += 1
+            contar("cache_resultados.aciertos")
+            return ruta
+        with self._candado:
+            self.fallos += 1
+        contar("cache_resultados.fallos")
+        return None
+
+    def registrar(self, clave: str, archivo: str, tamano: int, desalojar: bool = True) -> None:
+        """
+        Registra (o marca como recién usado) un archivo ya presente en la carpeta de la caché.
+        desalojar: bool → False para posponer el desalojo (por ejemplo, mientras los procesos de un pool
+                          todavía pueden estar copiando archivos de la caché); después se llama a desalojar()
+        """
+        with self._candado:
+            previa = self._indice.pop(clave, None)
+            if previa is not None:
+                self._bytes -= previa["bytes"]
+            self._indice[clave] = {"archivo": archivo, "bytes": tamano, "acceso": time.time()}
+            self._bytes += tamano
+            if desalojar:
+                self._desalojar()
+
+    def descartar(self, clave: str, extension: str) -> None:
+        """
+        Elimina una entrada de la caché y su archivo (por ejemplo, un resultado que ya no se puede leer).
+        """
+        with self._candado:
+            entrada = self._indice.pop(clave, None)
+            if entrada is not None:
+                self._bytes -= entrada["bytes"]
+        try:
+            os.remove(os.path.join(self.carpeta, clave + extension))
+        except OSError:
+            pass
+        self.guardar_indice()
+
+    def desalojar(self) -> None:
+        """
+        Aplica el desalojo LRU pendiente hasta respetar el tamaño máximo.
+        """
+        with self._candado:
+            self._desalojar()
+
+    def _desalojar(self) -> None:
+        """
+        Elimina los resultados menos usados recientemente hasta respetar el tamaño máximo.
+        Solo la instancia que persiste el índice desaloja archivos.
+        """
+        if not self.persistir:
+            return
+        while self._bytes > self.limite_bytes and len(self._indice) > 1:
+            _, entrada = self._indice.popitem(last=False)
+            self._bytes -= entrada["bytes"]
+            try:
+                os.remove(os.path.join(self.carpeta, entrada["archivo"]))
+            except OSError:
+                pass
+
+    def obtener_o_generar(self, clave: str, extension: str, generar) -> tuple:
+        """
+        Retorna (ruta, reutilizado). Si el resultado no está en caché, llama a generar(ruta_temporal),
+        que debe escribir el archivo en esa ruta, y lo incorpora a la caché.
+        """
+        ruta = self.buscar(clave, extension)
+        if ruta is not None:
+            return ruta, True
+        ruta = os.path.join(self.carpeta, clave + extension)
+        # El archivo temporal conserva la extensión para que OpenCV/matplotlib elijan el formato
+        temporal = os.path.join(self.carpeta, f"{clave}.{os.getpid()}.tmp{extension}")
+        try:
+            generar(temporal)
+            os.replace(temporal, ruta)
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+        self.registrar(clave, clave + extension, os.path.getsize(ruta))
+        self.guardar_indice()
+        return ruta, False
+
+    def estadisticas(self) -> dict:
+        with self._candado:
+            return {"aciertos": self.aciertos, "fallos": self.fallos, "entradas": len(self._indice),
+                    "bytes": self._bytes, "limite_bytes": self.limite_bytes}
+
+
+def copiar_resultado(ruta_cache: str, ruta_destino: str) -> str:
+    """
+    Coloca un resultado de la caché en ruta_destino (enlace duro si es posible, copia si no).
+    """
+    if os.path.exists(ruta_destino):
+        os.remove(ruta_destino)
+    try:
+        os.link(ruta_cache, ruta_destino)
+    except OSError:
+        shutil.copyfile(ruta_cache, ruta_destino)
+    return ruta_destino
+
+
+_cache_compartida = None
+
+
+def obtener_cache_resultados() -> CacheResultados:
+    """
+    Caché compartida del proceso, creada (y su índice cargado) solo la primera vez que se usa.
+    """
+    global _cache_compartida
+    if _cache_compartida is None:
+        _cache_compartida = CacheResultados(carpeta_cache_resultados, limite_cache_resultados_mb * 1024 * 1024)
+    return _cache_compartida
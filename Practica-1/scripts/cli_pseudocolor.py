@@ -0,0 +1,343 @@
+# --------- MODO POR LOTES (LÍNEA DE COMANDOS) PARA APLICAR PSEUDOCOLOR ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Ejemplo de uso:
+#   python cli_pseudocolor.py ../resources/input -m JET PASTEL -o ../resources/pseudocolor/lote -w 4
+#   python cli_pseudocolor.py "datos/*.png" -m INFERNO --workers 8
+#   python cli_pseudocolor.py ../resources/input -m JET --instrumentar ../resources/instrumentacion/lote --perfilar
+
+import os
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+
+from registro_mapas import es_mapa_valido, nombres_mapas # Importar el registro de mapas de color
+from imagen_pseudocolor import ImagenPseudocolor, parametros_codificacion # Importar la clase y los formatos de salida
+from cache_resultados import CacheResultados, clave_resultado, copiar_resultado, huella_imagen # Caché en disco
+from cache_resultados import obtener_cache_resultados # Importar la caché de resultados compartida
+import instrumentacion # Importar la instrumentación de etapas (tramos, contadores y perfilado)
+from instrumentacion import tramo # Importar los tramos de tiempo de la instrumentación
+
+# Extensiones de imagen aceptadas al recorrer un directorio
+EXTENSIONES_IMAGEN = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+
+
+def listar_imagenes(entradas):
+    """
+    Expande la lista de entradas (directorios, archivos o patrones glob) en una lista ordenada de rutas de imagen.
+    """
+    rutas = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            rutas.extend(os.path.join(entrada, f) for f in sorted(os.listdir(entrada))
+                         if f.lower().endswith(EXTENSIONES_IMAGEN))
+        elif os.path.isfile(entrada):
+            rutas.append(entrada)
+        else:
+            rutas.extend(f for f in sorted(glob.glob(entrada)) if os.path.isfile(f))
+    # Eliminar duplicados conservando el orden
+    return list(dict.fromkeys(rutas))
+
+
+def nombres_salida(rutas: list) -> dict:
+    """
+    Asigna a cada imagen el prefijo de sus archivos de salida (nombre sin extensión).
+    Las imágenes con el mismo nombre en carpetas distintas (a/x.png y b/x.png) se sobrescribirían entre sí,
+    así que su prefijo incluye la ruta relativa a la carpeta común (a_x, b_x) y, si aún coincide, un sufijo.
+    """
+    grupos = {}
+    for ruta in rutas:
+        grupos.setdefault(os.path.splitext(os.path.basename(ruta))[0], []).append(ruta)
+
+    bases, usados = {}, set()
+    for base, grupo in grupos.items():
+        if len(grupo) == 1:
+            bases[grupo[0]] = base
+            usados.add(base)
+    for base, grupo in grupos.items():
+        if len(grupo) == 1:
+            continue
+        absolutas = [os.path.abspath(ruta) for ruta in grupo]
+        comun = os.path.commonpath([os.path.dirname(ruta) for ruta in absolutas])
+        for ruta, absoluta in zip(grupo, absolutas):
+            relativa = os.path.splitext(os.path.relpath(absoluta, comun))[0]
+            candidato = relativa.replace(os.sep, "_")
+            sufijo = 2
+            while candidato in usados:
+                candidato = f"{relativa.replace(os.sep, '_')}_{sufijo}"
+                sufijo += 1
+            bases[ruta] = candidato
+            usados.add(candidato)
+    return bases
+
+
+# Caché de resultados del proceso del pool (se crea con el primer uso; solo consulta, no escribe el índice)
+_cache_proceso = None
+
+
+def procesar_imagen(ruta: str, mapas: list, carpeta_salida: str, formato: str = "png", calidad: int = None,
+                    normalizacion: dict = None, carpeta_cache: str = None, realce: dict = None,
+                    hilos: int = 1, modo_instrumentacion: str = None, base: str = None) -> dict:
+    """
+    Carga una imagen en escala de grises, le aplica cada mapa de color indicado y guarda los resultados.
+    Se ejecuta dentro de un proceso del pool, por lo que solo recibe y retorna datos serializables.
+    normalizacion: dict → si se indica, la imagen se lee con su profundidad original (16 bits o flotante) y se
+                          normaliza con estos parámetros (normalizacion, ventana, rango_percentiles)
+    carpeta_cache: str → si se indica, los resultados ya calculados se toman de la caché en disco
+    realce: dict → si se indica, realce de contraste previo (realce, teselas, limite_clahe, rango_percentiles)
+    hilos: int → hilos con los que se colorea cada imagen por bandas (el pool ya reparte las imágenes entre núcleos)
+    modo_instrumentacion: str → "tramos" o "perfil" para instrumentar el proceso; los datos se retornan con extraer()
+    base: str → prefijo de los archivos de salida (por defecto, el nombre de la imagen sin extensión)
+    Retorna un diccionario con la ruta, los archivos generados, las entradas de caché usadas,
+    el número de píxeles y los tiempos en segundos.
+    """
+    global _cache_proceso
+    if modo_instrumentacion is not None and not instrumentacion.activo():
+        instrumentacion.activar(perfil=modo_instrumentacion == "perfil")
+    inicio = time.perf_counter()
+    bandera = cv2.IMREAD_GRAYSCALE | cv2.IMREAD_ANYDEPTH if normalizacion else cv2.IMREAD_GRAYSCALE
+    with tramo("cargar.imread"):
+        imagen_gris = cv2.imread(ruta, bandera)
+    if imagen_gris is None:
+        return {"ruta": ruta, "error": "No se pudo cargar la imagen.",
+                "instrumentacion": instrumentacion.extraer() if instrumentacion.activo() else None}
+    t_carga = time.perf_counter() - inicio
+
+    cache = None
+    if carpeta_cache is not None:
+        if _cache_proceso is None or _cache_proceso.carpeta != carpeta_cache:
+            _cache_proceso = CacheResultados(carpeta_cache, 0, persistir=False)
+        cache = _cache_proceso
+        with tramo("cache.huella"):
+            huella = huella_imagen(imagen_gris)
+
+    base = base or os.path.splitext(os.path.basename(ruta))[0]
+    extension, _ = parametros_codificacion(formato, calidad)
+    generados, entradas_cache, reutilizados = [], [], 0
+    estado = {"resultado": None}
+    opciones = {**(normalizacion or {}), **(realce or {}), "hilos": hilos}
+
+    def colorear(nombre):
+        # Un solo búfer de salida por imagen, reutilizado para todos los mapas
+        if estado["resultado"] is None:
+            estado["resultado"] = ImagenPseudocolor.aplicar_pseudocolor(imagen_gris, nombre, **opciones)
+        else:
+            estado["resultado"].aplicar(imagen_gris, nombre, **opciones)
+        return estado["resultado"]
+
+    for nombre in mapas:
+        if cache is None:
+            # Guardado directo del arreglo a resolución nativa, sin figura de matplotlib
+            generados.append(colorear(nombre).guardar(base, formato=formato, calidad=calidad, carpeta=carpeta_salida))
+            continue
+        clave = clave_resultado(huella, [nombre], tipo="directo", formato=formato, calidad=calidad,
+                                normalizacion=normalizacion, realce=realce)
+        ruta_cache, reutilizado = cache.obtener_o_generar(
+            clave, extension, lambda destino, n=nombre: colorear(n).guardar_en(destino, calidad=calidad))
+        destino = os.path.join(carpeta_salida, f"{base}_{nombre}{extension}")
+        try:
+            tamano = os.path.getsize(ruta_cache)
+            generados.append(copiar_resultado(ruta_cache, destino))
+        except FileNotFoundError:
+            # Otro proceso desalojó el archivo entre la consulta y la copia: se vuelve a generar sin la caché
+            generados.append(colorear(nombre).guardar_en(destino, calidad=calidad))
+            continue
+        reutilizados += reutilizado
+        entradas_cache.append((clave, clave + extension, tamano))
+
+    return {
+        "ruta": ruta,
+        "salidas": generados,
+        "cache": entradas_cache,
+        "reutilizados": reutilizados,
+        "pixeles": int(imagen_gris.size),
+        "t_carga": t_carga,
+        "t_total": time.perf_counter() - inicio,
+        "instrumentacion": instrumentacion.extraer() if instrumentacion.activo() else None,
+    }
+
+
+def procesar_lote(rutas: list, mapas: list, carpeta_salida: str, workers: int = None,
+                  formato: str = "png", calidad: int = None, normalizacion: dict = None,
+                  usar_cache: bool = True, realce: dict = None, hilos: int = 1,
+                  modo_instrumentacion: str = None) -> dict:
+    """
+    Reparte las imágenes entre un pool de procesos y muestra el tiempo de cada una conforme terminan.
+    Si la instrumentación está activa, los tramos de cada proceso del pool se incorporan al proceso principal.
+    Retorna un resumen con el número de imágenes procesadas, errores, tiempo total y rendimiento.
+    """
+    os.makedirs(carpeta_salida, exist_ok=True)
+    procesadas, errores, pixeles, reutilizados = 0, 0, 0, 0
+    # El proceso principal es el único que actualiza el índice de la caché y desaloja archivos
+    cache = obtener_cache_resultados() if usar_cache else None
+    carpeta_cache = cache.carpeta if cache is not None else None
+    if modo_instrumentacion is None and instrumentacion.activo():
+        # Activada con la variable de entorno: los procesos del pool la heredan, pero se indica explícitamente
+        modo_instrumentacion = "tramos"
+
+    # Prefijos de salida únicos aunque dos entradas tengan el mismo nombre de archivo
+    bases = nombres_salida(rutas)
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futuros = {pool.submit(procesar_imagen, ruta, mapas, carpeta_salida, formato, calidad, normalizacion,
+                               carpeta_cache, realce, hilos, modo_instrumentacion, bases[ruta]): ruta
+                   for ruta in rutas}
+        for futuro in as_completed(futuros):
+            try:
+                res = futuro.result()
+            except Exception as e:
+                # Un error en un proceso no debe detener el resto del lote
+                res = {"ruta": futuros[futuro], "error": str(e)}
+            if res.get("instrumentacion"):
+                instrumentacion.incorporar(res["instrumentacion"])
+            if "error" in res:
+                errores += 1
+                print(f"[ERROR] {res['ruta']}: {res['error']}")
+                continue
+            procesadas += 1
+            pixeles += res["pixeles"]
+            reutilizados += res["reutilizados"]
+            if cache is not None:
+                # El desalojo se pospone hasta que termine el pool: los procesos pueden seguir copiando aciertos
+                for clave, archivo, tamano in res["cache"]:
+                    cache.registrar(clave, archivo, tamano, desalojar=False)
+            print(f"[OK] {res['ruta']} → {len(res['salidas'])} mapa(s) en {res['t_total']*1000:.1f} ms "
+                  f"(carga {res['t_carga']*1000:.1f} ms, {res['reutilizados']} desde caché)")
+    duracion = time.perf_counter() - inicio
+    if cache is not None:
+        cache.desalojar()
+        cache.guardar_indice()
+
+    return {
+        "procesadas": procesadas,
+        "errores": errores,
+        "reutilizados": reutilizados,
+        "segundos": duracion,
+        "imagenes_por_segundo": procesadas / duracion if duracion > 0 else 0.0,
+        "megapixeles_por_segundo": pixeles * len(mapas) / 1e6 / duracion if duracion > 0 else 0.0,
+    }
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """
+    Construye el analizador de argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Aplica mapas de color (OpenCV o personalizados) a directorios completos de imágenes, sin menús.")
+    parser.add_argument("entradas", nargs="+",
+                        help="Directorios, archivos o patrones glob con las imágenes de entrada.")
+    parser.add_argument("-m", "--mapas", nargs="+", default=["JET"],
+                        help=f"Mapas de color a aplicar. Disponibles: {', '.join(nombres_mapas())}")
+    parser.add_argument("-o", "--salida", default="pseudocolor_lote",
+                        help="Directorio donde se guardan los resultados.")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Número de procesos (por defecto, el número de núcleos).")
+    parser.add_argument("-f", "--formato", default="png", choices=["png", "jpg", "webp"],
+                        help="Formato de los archivos de salida.")
+    parser.add_argument("-q", "--calidad", type=int, default=None,
+                        help="Nivel de compresión PNG (0-9) o calidad JPEG/WebP (0-100).")
+    parser.add_argument("-n", "--normalizacion", choices=["rango", "ventana", "percentil"], default=None,
+                        help="Leer con la profundidad original (16 bits/flotante) y normalizar con este método.")
+    parser.add_argument("--ventana", type=float, nargs=2, metavar=("CENTRO", "ANCHO"),
+                        help="Centro y ancho para la normalización 'ventana' (window/level).")
+    parser.add_argument("--percentiles", type=float, nargs=2, metavar=("BAJO", "ALTO"), default=(1.0, 99.0),
+                        help="Percentiles para la normalización 'percentil' y el realce 'estirar'.")
+    parser.add_argument("-r", "--realce", choices=["ecualizar", "clahe", "estirar"], default=None,
+                        help="Realce de contraste previo al mapa de color (imágenes de 8 bits).")
+    parser.add_argument("--teselas", type=int, nargs=2, metavar=("FILAS", "COLUMNAS"), default=(8, 8),
+                        help="Cuadrícula de teselas de CLAHE.")
+    parser.add_argument("--limite-clahe", type=float, default=2.0,
+                        help="Límite de recorte del histograma de CLAHE.")
+    parser.add_argument("-t", "--hilos", type=int, default=1,
+                        help="Hilos por imagen para colorear por bandas (útil con pocas imágenes muy grandes).")
+    parser.add_argument("--sin-cache", action="store_true",
+                        help="No reutilizar ni guardar resultados en la caché en disco (resources/cache).")
+    parser.add_argument("--instrumentar", metavar="RUTA_BASE", default=None,
+                        help="Medir cada etapa y exportar RUTA_BASE.json (estadísticas) y RUTA_BASE.trace.json "
+                             "(traza para chrome://tracing o Perfetto).")
+    parser.add_argument("--perfilar", action="store_true",
+                        help="Con --instrumentar, añadir el perfil de cProfile y la memoria de tracemalloc.")
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+
+    # Validar los mapas antes de lanzar el pool de procesos
+    mapas = [m.upper() for m in args.mapas]
+    invalidos = [m for m in mapas if not es_mapa_valido(m)]
+    if invalidos:
+        print(f"Mapas no válidos: {invalidos}. Opciones disponibles: {nombres_mapas()}")
+        return 2
+
+    # Rangos de los argumentos numéricos: parser.error muestra el uso y termina con código 2
+    if args.workers is not None and args.workers < 1:
+        parser.error("el número de workers debe ser mayor o igual a 1.")
+    if args.hilos < 1:
+        parser.error("el número de hilos debe ser mayor o igual a 1.")
+
+    try:
+        parametros_codificacion(args.formato, args.calidad)
+    except ValueError as e:
+        print("Error:", e)
+        return 2
+
+    normalizacion = None
+    if args.normalizacion:
+        if args.normalizacion == "ventana" and args.ventana is None:
+            print("Error: la normalización 'ventana' requiere --ventana CENTRO ANCHO")
+            return 2
+        normalizacion = {"normalizacion": args.normalizacion, "ventana": args.ventana,
+                         "rango_percentiles": tuple(args.percentiles)}
+
+    realce = None
+    if args.realce:
+        if normalizacion:
+            print("Error: el realce de contraste y la normalización no se pueden combinar.")
+            return 2
+        realce = {"realce": args.realce, "teselas": tuple(args.teselas), "limite_clahe": args.limite_clahe,
+                  "rango_percentiles": tuple(args.percentiles)}
+
+    rutas = listar_imagenes(args.entradas)
+    if not rutas:
+        print("No se encontraron imágenes en las entradas indicadas.")
+        return 1
+
+    modo_instrumentacion = None
+    if args.instrumentar:
+        modo_instrumentacion = "perfil" if args.perfilar else "tramos"
+        instrumentacion.activar(perfil=args.perfilar)
+    elif args.perfilar:
+        print("Error: --perfilar requiere --instrumentar RUTA_BASE")
+        return 2
+
+    print(f"Procesando {len(rutas)} imagen(es) con {len(mapas)} mapa(s) de color...")
+    resumen = procesar_lote(rutas, mapas, args.salida, args.workers, args.formato, args.calidad, normalizacion,
+                            not args.sin_cache, realce, args.hilos, modo_instrumentacion)
+
+    print("\n=== Resumen ===")
+    print(f"Imágenes procesadas: {resumen['procesadas']} (errores: {resumen['errores']})")
+    print(f"Resultados reutilizados de la caché: {resumen['reutilizados']}")
+    print(f"Tiempo total: {resumen['segundos']:.2f} s")
+    print(f"Rendimiento: {resumen['imagenes_por_segundo']:.2f} imágenes/s, "
+          f"{resumen['megapixeles_por_segundo']:.2f} MP/s")
+
+    if args.instrumentar:
+        instrumentacion.desactivar()
+        print("\n=== Instrumentación ===")
+        print(instrumentacion.resumen())
+        ruta_json, ruta_traza = instrumentacion.exportar(args.instrumentar)
+        print(f"Estadísticas guardadas en: {ruta_json}")
+        print(f"Traza (chrome://tracing o Perfetto) guardada en: {ruta_traza}")
+    return 1 if resumen["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# --------- COLOREADO PARALELO DE UNA IMAGEN POR BANDAS HORIZONTALES ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# La imagen en escala de grises se divide en bandas de filas y cada banda se colorea en un hilo del pool,
+# escribiendo en su propia porción (disjunta) de un único arreglo de salida compartido.
+# cv2.applyColorMap y np.take liberan el GIL, así que los hilos trabajan en paralelo sin copiar datos.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config import hilos_coloreado, pixeles_minimos_banda # Importar la configuración del coloreado paralelo
+
+# Pools de hilos compartidos por número de hilos (se crean con el primer uso)
+_pools: dict = {}
+_candado = threading.Lock()
+
+
+def _pool(hilos: int) -> ThreadPoolExecutor:
+    with _candado:
+        pool = _pools.get(hilos)
+        if pool is None:
+            pool = _pools[hilos] = ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="coloreado")
+    return pool
+
+
+def resolver_hilos(hilos: int = None) -> int:
+    """
+    Número de hilos a usar: el indicado o, si es None, hilos_coloreado de config.py.
+    """
+    hilos = hilos_coloreado if hilos is None else hilos
+    if hilos < 1:
+        raise ValueError("El número de hilos debe ser mayor o igual a 1.")
+    return int(hilos)
+
+
+def limites_bandas(alto: int, ancho: int, hilos: int) -> list:
+    """
+    Divide alto filas en bandas contiguas de tamaño similar, sin bajar de pixeles_minimos_banda por banda.
+    Retorna una lista de tuplas (fila_inicio, fila_fin).
+    """
+    n = max(1, min(hilos, alto, (alto * ancho) // pixeles_minimos_banda))
+    cortes = np.linspace(0, alto, n + 1).astype(int)
+    return list(zip(cortes[:-1].tolist(), cortes[1:].tolist()))
+
+
+def en_bandas(funcion, imagen: np.ndarray, dst: np.ndarray, hilos: int = None) -> np.ndarray:
+    """
+    Ejecuta funcion(banda_entrada, banda_salida) sobre bandas horizontales de imagen y dst en paralelo.
+    funcion debe escribir su resultado en banda_salida (una vista de dst); las bandas no se solapan.
+    hilos: int → número de hilos; None usa hilos_coloreado de config.py
+    Retorna dst.
+    """
+    hilos = resolver_hilos(hilos)
+    bandas = limites_bandas(imagen.shape[0], imagen.shape[1], hilos)
+    if len(bandas) == 1:
+        funcion(imagen, dst)
+        return dst
+    futuros = [_pool(hilos).submit(funcion, imagen[inicio:fin], dst[inicio:fin]) for inicio, fin in bandas]
+    for futuro in futuros:
+        # Propagar la primera excepción de cualquier banda
+        futuro.result()
+    return dst
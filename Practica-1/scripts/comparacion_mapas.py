@@ -0,0 +1,103 @@
+# --------- MOTOR VECTORIZADO DE COMPARACIÓN DE MAPAS DE COLOR ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import cv2
+import numpy as np
+
+from registro_mapas import apilar_luts_rgb, nombres_mapas # Importar las tablas RGB del registro de mapas de color
+from realce_contraste import LIMITE_CLAHE, TESELAS_CLAHE, componer_lut, realzar, tabla_realce # Realce de contraste
+
+# Parámetros de la cuadrícula del mosaico (en píxeles)
+MARGEN = 10
+ALTO_TITULO = 28
+COLOR_FONDO = 255
+COLOR_TEXTO = (0, 0, 0)
+FUENTE = cv2.FONT_HERSHEY_SIMPLEX
+
+
+def aplicar_todos(imagen_gris: np.ndarray, nombres: list = None, out: np.ndarray = None,
+                  tabla: np.ndarray = None) -> np.ndarray:
+    """
+    Aplica todos los mapas indicados (por defecto, todos los registrados) en una sola operación vectorizada.
+    Las K tablas RGB se apilan en un arreglo de K x 256 x 3 y se indexan con la imagen completa (luts[:, gris]).
+    imagen_gris: np.ndarray → imagen en escala de grises de 8 bits (H x W)
+    out: np.ndarray → arreglo opcional de K x H x W x 3 (uint8) donde escribir el resultado
+    tabla: np.ndarray → transformación de niveles de gris (256, uint8) que se compone con las K tablas antes de indexar
+    Retorna un arreglo de K x H x W x 3 en orden RGB.
+    """
+    if imagen_gris.dtype != np.uint8 or imagen_gris.ndim != 2:
+        raise ValueError("La imagen debe estar en escala de grises de 8 bits (H x W, uint8).")
+    luts = apilar_luts_rgb(nombres)
+    if tabla is not None:
+        luts = componer_lut(luts, tabla, eje=1)
+    return np.take(luts, imagen_gris, axis=1, out=out)
+
+
+def _escribir_titulo(canvas: np.ndarray, titulo: str, x: int, y: int, ancho: int) -> None:
+    """
+    Escribe el título de una celda ajustando el tamaño de la letra al ancho disponible.
+    """
+    escala = 0.6
+    (ancho_texto, _), _ = cv2.getTextSize(titulo, FUENTE, escala, 1)
+    if ancho_texto > ancho:
+        escala *= ancho / ancho_texto
+    cv2.putText(canvas, titulo, (x, y + ALTO_TITULO - 8), FUENTE, escala, COLOR_TEXTO, 1, cv2.LINE_AA)
+
+
+def crear_mosaico(imagen_gris: np.ndarray, nombres: list = None, n_cols: int = 5, lado_max: int = 512,
+                  realce: str = None, teselas: tuple = TESELAS_CLAHE, limite_clahe: float = LIMITE_CLAHE,
+                  rango_percentiles: tuple = (1.0, 99.0)) -> np.ndarray:
+    """
+    Construye el mosaico de comparación (escala de grises + un pseudocolor por mapa) directamente en un lienzo
+    preasignado, sin subplots de matplotlib.
+    La cuadrícula se organiza de manera dinámica según la cantidad de mapas.
+    lado_max: int → lado máximo de cada celda; las imágenes más grandes se reducen antes de colorear
+    realce: str → None, "ecualizar", "clahe" o "estirar"; la celda gris muestra la imagen realzada
+    Retorna el mosaico en RGB (uint8).
+    """
+    if nombres is None:
+        nombres = nombres_mapas()
+
+    # La tabla de realce se calcula con el histograma de la imagen completa; CLAHE se aplica a resolución completa
+    # para que sus teselas cubran la misma región que al colorear la imagen original
+    tabla = None
+    if realce == "clahe":
+        imagen_gris = realzar(imagen_gris, realce, teselas, limite_clahe)
+    elif realce is not None:
+        tabla = tabla_realce(imagen_gris, realce, rango_percentiles)
+
+    # Reducir la imagen antes de colorear: es más barato reducir una imagen gris que K imágenes a color
+    alto, ancho = imagen_gris.shape[:2]
+    if max(alto, ancho) > lado_max:
+        factor = lado_max / max(alto, ancho)
+        imagen_gris = cv2.resize(imagen_gris, (max(1, round(ancho * factor)), max(1, round(alto * factor))),
+                                 interpolation=cv2.INTER_AREA)
+        alto, ancho = imagen_gris.shape[:2]
+
+    # Todas las versiones pseudocoloreadas en una sola operación
+    pseudocolores = aplicar_todos(imagen_gris, nombres, tabla=tabla)
+    if tabla is not None:
+        imagen_gris = tabla[imagen_gris]
+
+    # Calcular filas y columnas para la cuadrícula (+1 para la imagen en escala de grises)
+    total_imgs = len(nombres) + 1
+    n_cols = min(n_cols, total_imgs)
+    n_rows = int(np.ceil(total_imgs / n_cols))
+    alto_celda = ALTO_TITULO + alto
+
+    # Lienzo preasignado con fondo blanco
+    canvas = np.full((MARGEN + n_rows * (alto_celda + MARGEN), MARGEN + n_cols * (ancho + MARGEN), 3),
+                     COLOR_FONDO, dtype=np.uint8)
+
+    titulos = ['Escala de grises' if realce is None else f'Escala de grises ({realce})'] + list(nombres)
+    for idx, titulo in enumerate(titulos):
+        fila, col = divmod(idx, n_cols)
+        y = MARGEN + fila * (alto_celda + MARGEN)
+        x = MARGEN + col * (ancho + MARGEN)
+        _escribir_titulo(canvas, titulo, x, y, ancho)
+        celda = canvas[y + ALTO_TITULO:y + alto_celda, x:x + ancho]
+        # La primera celda es la imagen gris replicada en los tres canales
+        celda[...] = imagen_gris[..., None] if idx == 0 else pseudocolores[idx - 1]
+
+    return canvas
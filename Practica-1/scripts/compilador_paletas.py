@@ -0,0 +1,309 @@
+# --------- COMPILADOR DE PALETAS (ARCHIVOS JSON/TOML → TABLAS DE BÚSQUEDA PRECOMPILADAS) ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Cada archivo define una paleta (o varias bajo la clave "paletas") con:
+#   - nombre: str → nombre del mapa en los menús (letras, dígitos y guiones bajos; se usa en mayúsculas)
+#   - colores: list → colores de control "#RRGGBB" o [r, g, b] normalizados entre 0 y 1 (al menos dos)
+#   - posiciones: list → (opcional) posición de cada color entre 0 y 1, no decreciente; dos posiciones iguales
+#     crean un cambio brusco de color. Por defecto los colores se distribuyen de manera uniforme
+#   - espacio: str → (opcional) espacio de interpolación, "rgb" (por defecto) o "lab" (CIELAB, perceptual)
+#   - descripcion: str → (opcional) texto libre
+#
+# Ejemplo (TOML):
+#   nombre = "OCASO"
+#   espacio = "lab"
+#   colores = ["#1b0c41", "#b63679", "#fb8861", "#fcfdbf"]
+#   posiciones = [0.0, 0.4, 0.75, 1.0]
+#
+# El compilador valida todas las paletas y escribe un paquete con las tablas BGR de 256 entradas
+# (paletas-<hash>.npy) y un índice de nombres (paletas.json) que apunta a él. registro_mapas.py mapea el paquete
+# en memoria al importarse, así que las paletas compiladas aparecen junto a mapas_color en los menús,
+# la interfaz gráfica, la CLI y el servicio.
+#
+# Ejemplo de uso:
+#   python compilador_paletas.py                       (compila ../resources/paletas)
+#   python compilador_paletas.py mis_paletas/*.toml -o ../resources/paletas/compiladas
+#   python compilador_paletas.py --validar
+
+import os
+import re
+import sys
+import glob
+import json
+import hashlib
+import argparse
+import tomllib
+
+import numpy as np
+
+from config import carpeta_paletas, carpeta_paletas_compiladas # Importar las carpetas de paletas desde config.py
+from config import mapas_color, paletas_personalizadas # Importar los mapas ya existentes para evitar colisiones
+from registro_mapas import ARCHIVO_INDICE, N_ENTRADAS, PREFIJO_PAQUETE, VERSION_PAQUETE # Formato del paquete
+from analisis_mapas import lab_a_rgb, rgb_a_lab # Importar las conversiones entre sRGB y CIELAB
+
+FORMATOS_PALETA = (".json", ".toml")
+ESPACIOS_INTERPOLACION = ("rgb", "lab")
+CLAVES_PALETA = ("nombre", "colores", "posiciones", "espacio", "descripcion")
+PATRON_NOMBRE = re.compile(r"^[A-Z][A-Z0-9_]*$")
+PATRON_HEX = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+
+def leer_archivo(ruta: str) -> list:
+    """
+    Lee un archivo de paletas (JSON o TOML) y retorna la lista de definiciones sin validar.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in FORMATOS_PALETA:
+        raise ValueError(f"Formato '{extension}' no válido. Opciones disponibles: {list(FORMATOS_PALETA)}")
+    try:
+        if extension == ".toml":
+            with open(ruta, "rb") as archivo:
+                datos = tomllib.load(archivo)
+        else:
+            with open(ruta, encoding="utf-8") as archivo:
+                datos = json.load(archivo)
+    except (ValueError, tomllib.TOMLDecodeError) as e:
+        raise ValueError(f"{ruta}: no se pudo leer el archivo ({e})")
+    if not isinstance(datos, dict):
+        raise ValueError(f"{ruta}: el archivo debe contener una paleta o una lista 'paletas'.")
+    if "paletas" in datos:
+        if set(datos) != {"paletas"} or not isinstance(datos["paletas"], list):
+            raise ValueError(f"{ruta}: 'paletas' debe ser una lista y la única clave del archivo.")
+        return datos["paletas"]
+    return [datos]
+
+
+def _color(valor, origen: str) -> tuple:
+    """
+    Convierte un color "#RRGGBB" o [r, g, b] (entre 0 y 1) en una tupla de flotantes.
+    """
+    if isinstance(valor, str):
+        if not PATRON_HEX.match(valor):
+            raise ValueError(f"{origen}: el color '{valor}' debe tener el formato #RRGGBB.")
+        return tuple(int(valor[i:i + 2], 16) / 255.0 for i in (1, 3, 5))
+    if (not isinstance(valor, (list, tuple)) or len(valor) != 3
+            or not all(isinstance(c, (int, float)) and not isinstance(c, bool) for c in valor)):
+        raise ValueError(f"{origen}: el color {valor!r} debe ser '#RRGGBB' o [r, g, b].")
+    if min(valor) < 0.0 or max(valor) > 1.0:
+        raise ValueError(f"{origen}: el color {list(valor)} debe estar normalizado entre 0 y 1.")
+    return tuple(float(c) for c in valor)
+
+
+def validar_paleta(datos, origen: str) -> dict:
+    """
+    Valida una definición de paleta y la retorna normalizada
+    (nombre en mayúsculas, colores N x 3 y posiciones N como arreglos de flotantes, espacio en minúsculas).
+    Todos los problemas de la paleta se reúnen en un solo ValueError (uno por línea).
+    origen: str → texto que identifica la paleta en los mensajes de error (archivo y posición)
+    """
+    if not isinstance(datos, dict):
+        raise ValueError(f"{origen}: cada paleta debe ser un objeto (tabla) con sus claves.")
+    errores = []
+
+    nombre = datos.get("nombre")
+    if isinstance(nombre, str) and PATRON_NOMBRE.match(nombre.upper()):
+        nombre = nombre.upper()
+        origen = f"{origen} ({nombre})"
+    else:
+        errores.append(f"{origen}: 'nombre' debe comenzar con una letra y contener solo letras, dígitos y '_'.")
+
+    desconocidas = [clave for clave in datos if clave not in CLAVES_PALETA]
+    if desconocidas:
+        errores.append(f"{origen}: claves no válidas {desconocidas}. Opciones disponibles: {list(CLAVES_PALETA)}")
+
+    colores = datos.get("colores")
+    if not isinstance(colores, list) or len(colores) < 2:
+        errores.append(f"{origen}: 'colores' debe ser una lista con al menos dos colores.")
+        colores = None
+    else:
+        convertidos = []
+        for color in colores:
+            try:
+                convertidos.append(_color(color, origen))
+            except ValueError as e:
+                errores.append(str(e))
+        colores = np.array(convertidos, dtype=np.float64) if len(convertidos) == len(colores) else colores
+
+    posiciones = datos.get("posiciones")
+    if posiciones is None:
+        posiciones = np.linspace(0.0, 1.0, len(colores)) if colores is not None else None
+    elif (not isinstance(posiciones, list)
+            or not all(isinstance(p, (int, float)) and not isinstance(p, bool) for p in posiciones)):
+        errores.append(f"{origen}: 'posiciones' debe ser una lista de números.")
+    else:
+        if colores is not None and len(posiciones) != len(colores):
+            errores.append(f"{origen}: 'posiciones' debe tener una posición por color "
+                           f"({len(posiciones)} posiciones, {len(colores)} colores).")
+        posiciones = np.array(posiciones, dtype=np.float64)
+        if len(posiciones) == 0 or posiciones[0] != 0.0 or posiciones[-1] != 1.0 or np.any(np.diff(posiciones) < 0):
+            errores.append(f"{origen}: 'posiciones' debe ir de 0 a 1 sin decrecer.")
+
+    espacio = datos.get("espacio", "rgb")
+    if not isinstance(espacio, str) or espacio.lower() not in ESPACIOS_INTERPOLACION:
+        errores.append(f"{origen}: espacio '{espacio}' no válido. "
+                       f"Opciones disponibles: {list(ESPACIOS_INTERPOLACION)}")
+
+    descripcion = datos.get("descripcion", "")
+    if not isinstance(descripcion, str):
+        errores.append(f"{origen}: 'descripcion' debe ser texto.")
+
+    if errores:
+        raise ValueError("\n".join(errores))
+    return {"nombre": nombre, "colores": colores, "posiciones": posiciones, "espacio": espacio.lower(),
+            "descripcion": descripcion}
+
+
+def interpolar_paleta(colores: np.ndarray, posiciones: np.ndarray, espacio: str = "rgb",
+                      n: int = N_ENTRADAS) -> np.ndarray:
+    """
+    Interpola los colores de control (sRGB entre 0 y 1) en n muestras uniformes, en RGB o en CIELAB.
+    Retorna un arreglo n x 3 de colores sRGB entre 0 y 1.
+    """
+    muestras = np.linspace(0.0, 1.0, n)
+    puntos = rgb_a_lab(colores) if espacio == "lab" else colores
+    interpolados = np.stack([np.interp(muestras, posiciones, puntos[:, c]) for c in range(3)], axis=-1)
+    return lab_a_rgb(interpolados) if espacio == "lab" else interpolados
+
+
+def lut_paleta(paleta: dict) -> np.ndarray:
+    """
+    Tabla de búsqueda BGR de 256x1x3 (uint8) de una paleta validada, con el mismo formato que crear_lut.
+    """
+    rgb = interpolar_paleta(paleta["colores"], paleta["posiciones"], paleta["espacio"])
+    rgb = np.clip(np.rint(rgb * 255.0), 0, 255).astype(np.uint8)
+    return np.ascontiguousarray(rgb[:, ::-1]).reshape(N_ENTRADAS, 1, 3)
+
+
+def listar_archivos(entradas: list) -> list:
+    """
+    Expande directorios, archivos y patrones glob en la lista ordenada de archivos de paletas.
+    """
+    rutas = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            rutas.extend(os.path.join(entrada, f) for f in sorted(os.listdir(entrada))
+                         if f.lower().endswith(FORMATOS_PALETA))
+        elif os.path.isfile(entrada):
+            rutas.append(entrada)
+        else:
+            rutas.extend(f for f in sorted(glob.glob(entrada)) if os.path.isfile(f))
+    return list(dict.fromkeys(rutas))
+
+
+def cargar_paletas(rutas: list) -> list:
+    """
+    Lee y valida las paletas de todos los archivos.
+    Los errores de todos los archivos se reúnen en un solo ValueError (uno por línea) para corregirlos a la vez.
+    """
+    paletas, errores, origenes = [], [], {}
+    for ruta in rutas:
+        try:
+            definiciones = leer_archivo(ruta)
+        except (OSError, ValueError) as e:
+            errores.append(str(e))
+            continue
+        for i, datos in enumerate(definiciones, start=1):
+            origen = f"{os.path.basename(ruta)}[{i}]" if len(definiciones) > 1 else os.path.basename(ruta)
+            try:
+                paleta = validar_paleta(datos, origen)
+            except ValueError as e:
+                errores.append(str(e))
+                continue
+            nombre = paleta["nombre"]
+            if nombre in mapas_color or nombre in paletas_personalizadas:
+                errores.append(f"{origen}: el nombre '{nombre}' ya corresponde a un mapa de OpenCV o de config.py.")
+            elif nombre in origenes:
+                errores.append(f"{origen}: el nombre '{nombre}' ya está definido en {origenes[nombre]}.")
+            else:
+                origenes[nombre] = origen
+                paleta["archivo"] = os.path.basename(ruta)
+                paletas.append(paleta)
+    if errores:
+        raise ValueError("\n".join(errores))
+    return paletas
+
+
+def compilar(paletas: list, carpeta: str = carpeta_paletas_compiladas) -> tuple:
+    """
+    Escribe el paquete de tablas (K x 256 x 1 x 3, uint8) y su índice de nombres en la carpeta indicada.
+    El paquete se guarda con un nombre derivado de su contenido (paletas-<hash>.npy) y el índice, que apunta a él,
+    se reemplaza de forma atómica al final: un lector ve el índice anterior con su paquete o el nuevo con el suyo,
+    nunca una mezcla. Después se eliminan los paquetes anteriores. Retorna las rutas (paquete, índice).
+    """
+    os.makedirs(carpeta, exist_ok=True)
+    paquete = np.empty((len(paletas), N_ENTRADAS, 1, 3), dtype=np.uint8)
+    for i, paleta in enumerate(paletas):
+        paquete[i] = lut_paleta(paleta)
+    archivo_paquete = f"{PREFIJO_PAQUETE}{hashlib.blake2b(paquete.tobytes(), digest_size=8).hexdigest()}.npy"
+    indice = {
+        "version": VERSION_PAQUETE,
+        "paquete": archivo_paquete,
+        "paletas": [{"nombre": p["nombre"], "archivo": p["archivo"], "espacio": p["espacio"],
+                     "descripcion": p["descripcion"]} for p in paletas],
+    }
+
+    ruta_paquete = os.path.join(carpeta, archivo_paquete)
+    ruta_indice = os.path.join(carpeta, ARCHIVO_INDICE)
+    sufijo = f".{os.getpid()}.tmp"
+    # np.save añade la extensión .npy si el nombre no la tiene
+    np.save(ruta_paquete + sufijo + ".npy", paquete)
+    os.replace(ruta_paquete + sufijo + ".npy", ruta_paquete)
+    with open(ruta_indice + sufijo, "w", encoding="utf-8") as archivo:
+        json.dump(indice, archivo, indent=2, ensure_ascii=False)
+    os.replace(ruta_indice + sufijo, ruta_indice)
+
+    # Los paquetes anteriores ya no están referenciados (los procesos que los tienen mapeados conservan su copia)
+    for anterior in glob.glob(os.path.join(carpeta, PREFIJO_PAQUETE + "*.npy")):
+        if os.path.basename(anterior) != archivo_paquete:
+            try:
+                os.remove(anterior)
+            except OSError:
+                pass
+    return ruta_paquete, ruta_indice
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    """
+    Construye el analizador de argumentos de la línea de comandos.
+    """
+    parser = argparse.ArgumentParser(
+        description="Valida paletas de color en JSON/TOML y las compila en un paquete de tablas de búsqueda.")
+    parser.add_argument("entradas", nargs="*", default=[carpeta_paletas],
+                        help="Directorios, archivos o patrones glob con las paletas (por defecto resources/paletas).")
+    parser.add_argument("-o", "--salida", default=carpeta_paletas_compiladas,
+                        help="Carpeta donde se escribe el paquete compilado.")
+    parser.add_argument("--validar", action="store_true",
+                        help="Solo validar las paletas, sin escribir el paquete.")
+    return parser
+
+
+def main(argv=None) -> int:
+    args = crear_parser().parse_args(argv)
+    rutas = listar_archivos(args.entradas)
+    if not rutas:
+        print("No se encontraron archivos de paletas (.json o .toml) en las entradas indicadas.")
+        return 1
+
+    try:
+        paletas = cargar_paletas(rutas)
+    except ValueError as e:
+        print("Errores de validación:")
+        for linea in str(e).splitlines():
+            print(f"  - {linea}")
+        return 2
+
+    for paleta in paletas:
+        print(f"{paleta['nombre']:24s} {len(paleta['colores']):3d} colores, interpolación {paleta['espacio']} "
+              f"({paleta['archivo']})")
+    if args.validar:
+        print(f"{len(paletas)} paleta(s) válida(s).")
+        return 0
+
+    ruta_paquete, ruta_indice = compilar(paletas, args.salida)
+    print(f"{len(paletas)} paleta(s) compilada(s) en: {ruta_paquete} (índice: {ruta_indice})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,16 +3,41 @@
 # Fecha: 02-19-2026
 
 import os
-import cv2
+import functools
+from collections.abc import Mapping
 
 
 # Obtener el directorio del script y regresar un nivel en la jerarquía de carpetas
 script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # Diccionario de mapas de color disponibles en OpenCV
-# Obtener automáticamente todos los colormaps disponibles
-mapas_color = {name.replace("COLORMAP_", ""): getattr(cv2, name) 
-               for name in dir(cv2) if name.startswith("COLORMAP_")}
+# Obtener automáticamente todos los colormaps disponibles (solo la primera vez que se consultan)
+@functools.lru_cache(maxsize=None)
+def descubrir_mapas_color() -> dict:
+    import cv2
+    return {name.replace("COLORMAP_", ""): getattr(cv2, name) 
+            for name in dir(cv2) if name.startswith("COLORMAP_")}
+
+
+class _MapasColorOpenCV(Mapping):
+    """
+    Diccionario de solo lectura que descubre los colormaps de OpenCV al primer acceso,
+    para que importar config.py no tenga costo.
+    """
+    def __getitem__(self, nombre):
+        return descubrir_mapas_color()[nombre]
+
+    def __iter__(self):
+        return iter(descubrir_mapas_color())
+
+    def __len__(self):
+        return len(descubrir_mapas_color())
+
+    def __repr__(self):
+        return repr(descubrir_mapas_color())
+
+
+mapas_color = _MapasColorOpenCV()
 
 # Mapas de color personalizados
 # Definir colores pastel en formato RGB normalizado (valores entre 0 y 1)
@@ -72,3 +97,28 @@ colores_pastel_personalizados = [
     (0.9, 0.85, 0.8),  # crema pastel
     (0.85, 0.9, 0.75), # beige pastel
 ]
+
+# Registro de paletas personalizadas disponibles junto a los mapas de OpenCV
+# Las claves se usan como nombre del mapa (en mayúsculas) en los menús y en ImagenPseudocolor
+paletas_personalizadas = {
+    "PASTEL": colores_pastel,
+    "TIERRA": colores_tierra,
+    "PASTEL_PERSONALIZADO": colores_pastel_personalizados,
+}
+
+# Archivos de paletas (JSON o TOML) y paquete de tablas precompiladas por compilador_paletas.py
+# El paquete se mapea en memoria al importar registro_mapas, junto a mapas_color y paletas_personalizadas
+carpeta_paletas = os.path.join(script_dir, 'resources/paletas')
+carpeta_paletas_compiladas = os.path.join(script_dir, 'resources/paletas/compiladas')
+
+# Presupuesto de memoria (en MB) de la caché compartida de imágenes decodificadas (cache_imagenes.py)
+limite_cache_imagenes_mb = 512
+
+# Caché en disco de resultados de pseudocolor direccionada por contenido (cache_resultados.py)
+carpeta_cache_resultados = os.path.join(script_dir, 'resources/cache')
+limite_cache_resultados_mb = 1024
+
+# Hilos para colorear una sola imagen por bandas horizontales (coloreado_paralelo.py)
+hilos_coloreado = os.cpu_count() or 1
+# Píxeles mínimos por banda: las imágenes pequeñas se colorean en un solo hilo, sin costo de coordinación
+pixeles_minimos_banda = 1 << 20
@@ -1,13 +1,136 @@
+import os
 import sys
 import cv2
+import datetime
+import traceback
 import numpy as np
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QFileDialog,
-    QVBoxLayout, QWidget, QComboBox
+    QVBoxLayout, QHBoxLayout, QWidget, QComboBox, QLabel, QProgressBar, QCheckBox
 )
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from config import script_dir # Importar la carpeta base desde config.py
+from config import paletas_personalizadas # Importar el registro de paletas personalizadas desde config.py
+from cache_imagenes import leer_color, leer_gris # Importar la lectura de imágenes a través de la caché compartida
+from comparacion_mapas import crear_mosaico # Importar el motor vectorizado de comparación de mapas
+from imagen_pseudocolor import ImagenPseudocolor # Importar la clase ImagenPseudocolor
+from piramide_previsualizacion import PiramidePrevisualizacion # Importar la pirámide de previsualización
+from registro_mapas import nombres_mapas, paletas_compiladas # Importar el registro de mapas de color
+from realce_contraste import METODOS_REALCE, realzar # Importar el realce de contraste previo al pseudocolor
+import instrumentacion # Importar la instrumentación de etapas (tramos, contadores y perfilado)
+from instrumentacion import tramo # Importar los tramos de tiempo de la instrumentación
+
+
+class TareaCancelada(Exception):
+    """
+    Se lanza dentro de una tarea en segundo plano cuando el usuario solicita cancelarla.
+    """
+
+
+class WorkerSignals(QObject):
+    """
+    Señales que emite una tarea en segundo plano hacia el hilo principal de Qt.
+    """
+    progress = pyqtSignal(int)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    finished = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """
+    Ejecuta una función en el QThreadPool sin bloquear la interfaz.
+    La función recibe como argumentos nombrados `progreso(porcentaje)` para reportar avance
+    y `verificar()`, que lanza TareaCancelada si se pidió cancelar la tarea.
+    """
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self.cancelado = False
+
+    def cancel(self):
+        self.cancelado = True
+
+    def _verificar(self):
+        if self.cancelado:
+            raise TareaCancelada()
+
+    @pyqtSlot()
+    def run(self):
+        try:
+            resultado = self.fn(*self.args, progreso=self.signals.progress.emit,
+                                verificar=self._verificar, **self.kwargs)
+        except TareaCancelada:
+            pass
+        except Exception:
+            self.signals.error.emit(traceback.format_exc())
+        else:
+            if not self.cancelado:
+                self.signals.result.emit(resultado)
+        finally:
+            self.signals.finished.emit()
+
+
+# --------- TAREAS EN SEGUNDO PLANO (no tocan widgets de Qt) ---------
+def _ruta_salida(prefijo):
+    """
+    Ruta en resources/pseudocolor con la fecha y hora en el nombre para evitar sobreescrituras.
+    """
+    ruta_carpeta = os.path.join(script_dir, 'resources/pseudocolor')
+    os.makedirs(ruta_carpeta, exist_ok=True)
+    nombre_archivo = f"{prefijo}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+    return os.path.join(ruta_carpeta, nombre_archivo)
+
+
+def paneles_previsualizacion(piramide, nombre, ancho, alto):
+    """
+    Paneles (escala de grises, pseudocolor) del nivel de la pirámide que corresponde al tamaño del canvas.
+    """
+    gris, previsualizacion = piramide.colorear(nombre, ancho, alto)
+    return [('Imagen en escala de grises', gris), (f'Pseudocolor: {nombre.upper()}', previsualizacion)]
+
+
+def tarea_previsualizar(piramide, nombre, ancho, alto, progreso=None, verificar=None):
+    """
+    Colorea solo el nivel de la pirámide que se va a mostrar; no guarda nada.
+    """
+    paneles = paneles_previsualizacion(piramide, nombre, ancho, alto)
+    progreso(100)
+    return paneles, None
+
+
+def tarea_colorear(imagen_gris, nombre, piramide, ancho, alto, realce=None, progreso=None, verificar=None):
+    """
+    Aplica el mapa de color a resolución completa (con el realce de contraste indicado) y guarda el resultado.
+    En el canvas se muestra la previsualización del nivel adecuado de la pirámide.
+    """
+    resultado = ImagenPseudocolor.aplicar_pseudocolor(imagen_gris, nombre, realce=realce)
+    progreso(50)
+    verificar()
+    ruta = resultado.guardar(datetime.datetime.now().strftime('%Y%m%d_%H%M%S'))
+    progreso(100)
+    return paneles_previsualizacion(piramide, nombre, ancho, alto), ruta
+
+
+def tarea_mosaico(imagen_gris, nombres, prefijo, n_cols=5, realce=None, progreso=None, verificar=None):
+    """
+    Construye el mosaico de comparación con los mapas indicados, lo guarda y lo retorna como único panel.
+    """
+    mosaico = crear_mosaico(imagen_gris, nombres, n_cols=n_cols, realce=realce)
+    progreso(70)
+    verificar()
+    ruta = _ruta_salida(prefijo)
+    if not cv2.imwrite(ruta, cv2.cvtColor(mosaico, cv2.COLOR_RGB2BGR)):
+        raise OSError(f"No se pudo escribir la imagen en {ruta}")
+    progreso(100)
+    return [(None, mosaico)], ruta
+
 
 class Practica1GUI(QMainWindow):
     def __init__(self):
@@ -24,13 +147,28 @@ class Practica1GUI(QMainWindow):
         self.btn_select_image.clicked.connect(self.select_image)
         self.layout.addWidget(self.btn_select_image)
 
+        # Selector de mapa de color (OpenCV y personalizados) con vista previa inmediata
+        fila_mapas = QHBoxLayout()
+        fila_mapas.addWidget(QLabel("Mapa de color:"))
+        self.combo_colormap = QComboBox()
+        self.combo_colormap.addItems(nombres_mapas())
+        self.combo_colormap.currentTextChanged.connect(self.preview_colormap)
+        fila_mapas.addWidget(self.combo_colormap, stretch=1)
+        # Realce de contraste previo al mapa de color (se aplica también a la comparación y al guardado)
+        fila_mapas.addWidget(QLabel("Realce:"))
+        self.combo_realce = QComboBox()
+        self.combo_realce.addItems(["Ninguno"] + list(METODOS_REALCE))
+        self.combo_realce.currentTextChanged.connect(self.change_enhancement)
+        fila_mapas.addWidget(self.combo_realce)
+        self.layout.addLayout(fila_mapas)
+
         # Botón para aplicar mapa de color
         self.btn_apply_colormap = QPushButton("2. Aplicar un Mapa de Color a la Imagen en Escala de Grises")
         self.btn_apply_colormap.clicked.connect(self.apply_colormap_menu)
         self.layout.addWidget(self.btn_apply_colormap)
 
         # Botón para comparación de mapas
-        self.btn_compare_colormaps = QPushButton("3. Comparación Visual de Mapas de Color Disponibles en OpenCV")
+        self.btn_compare_colormaps = QPushButton("3. Comparación Visual de Mapas de Color Disponibles")
         self.btn_compare_colormaps.clicked.connect(self.compare_colormaps)
         self.layout.addWidget(self.btn_compare_colormaps)
 
@@ -44,6 +182,25 @@ class Practica1GUI(QMainWindow):
         self.btn_exit.clicked.connect(self.close)
         self.layout.addWidget(self.btn_exit)
 
+        # Progreso y cancelación de la tarea en segundo plano
+        fila_progreso = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        fila_progreso.addWidget(self.progress_bar, stretch=1)
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.clicked.connect(self.cancel_task)
+        fila_progreso.addWidget(self.btn_cancel)
+        # Medición de las etapas; al desmarcarla se exportan las estadísticas y la traza en resources/instrumentacion
+        self.check_instrumentar = QCheckBox("Instrumentar")
+        self.check_instrumentar.setChecked(instrumentacion.activo())
+        self.check_instrumentar.toggled.connect(self.toggle_instrumentation)
+        fila_progreso.addWidget(self.check_instrumentar)
+        self.layout.addLayout(fila_progreso)
+
+        self.status_label = QLabel("")
+        self.layout.addWidget(self.status_label)
+
         # Figura de matplotlib
         self.figure = Figure()
         self.canvas = FigureCanvas(self.figure)
@@ -52,58 +209,180 @@ class Practica1GUI(QMainWindow):
         self.image = None
         self.img_rgb = None
         self.imagen_path = None
+        self.imagen_gris = None
+        self.piramide = None
+        self.realce = None
+
+        # Pool de hilos para colorear, comparar y guardar sin bloquear el ciclo de eventos
+        self.thread_pool = QThreadPool.globalInstance()
+        self.current_worker = None
+        self._imagen_axes = None
 
     def select_image(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Seleccionar imagen", "", "Images (*.png *.jpg *.jpeg *.bmp)")
         if file_path:
-            self.imagen_path = file_path
-            self.image = cv2.imread(file_path)
-            if self.image is None:
+            # El estado solo se reemplaza si la nueva imagen se cargó; si no, se conserva la anterior completa
+            imagen = leer_color(file_path)
+            if imagen is None:
                 print("Error al cargar la imagen.")
+                self.status_label.setText(f"Error al cargar la imagen: {file_path}")
                 return
-            self.img_rgb = cv2.cvtColor(self.image, cv2.COLOR_BGR2RGB)
+            self.imagen_path = file_path
+            self.image = imagen
+            self.imagen_gris = leer_gris(file_path)
+            self.piramide = None
+            self.img_rgb = self.image[..., ::-1]  # vista RGB sin copia
             self.show_image()
 
     def show_image(self):
+        self.render_panels([("Imagen Original", self.img_rgb)])
+
+    def render_panels(self, paneles):
+        """
+        Dibuja una lista de paneles (título, imagen) en el canvas integrado.
+        Si la vista tiene dos paneles (original y pseudocolor) y el segundo es del mismo tamaño que el dibujado
+        antes, solo se actualizan los datos y el título del segundo panel.
+        """
+        if (len(paneles) == 2 and self._imagen_axes is not None
+                and self._imagen_axes.get_array().shape == paneles[1][1].shape):
+            titulo, imagen = paneles[1]
+            self._imagen_axes.set_data(imagen)
+            self._imagen_axes.axes.set_title(titulo)
+            self.canvas.draw_idle()
+            return
+
         self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        ax.imshow(self.img_rgb)
-        ax.set_title("Imagen Original")
-        ax.axis("off")
-        self.canvas.draw()
+        self._imagen_axes = None
+        for i, (titulo, imagen) in enumerate(paneles, start=1):
+            ax = self.figure.add_subplot(1, len(paneles), i)
+            artista = ax.imshow(imagen, cmap='gray' if imagen.ndim == 2 else None)
+            if titulo:
+                ax.set_title(titulo)
+            ax.axis("off")
+            if len(paneles) == 2 and i == 2:
+                self._imagen_axes = artista
+        with tramo("figura.tight_layout"):
+            self.figure.tight_layout()
+        self.canvas.draw_idle()
 
-    def apply_colormap_menu(self):
+    def toggle_instrumentation(self, activa):
+        """
+        Activa la instrumentación o, al desactivarla, exporta lo medido y muestra las rutas de los archivos.
+        """
+        if activa:
+            instrumentacion.reiniciar()
+            instrumentacion.activar()
+            self.status_label.setText("Instrumentación activada.")
+            return
+        instrumentacion.desactivar()
+        ruta_json, ruta_traza = instrumentacion.exportar(instrumentacion.ruta_por_defecto("gui"))
+        print(instrumentacion.resumen())
+        self.status_label.setText(f"Instrumentación guardada en: {ruta_json} y {ruta_traza}")
+
+    # --------- GESTIÓN DE TAREAS EN SEGUNDO PLANO ---------
+    def start_task(self, fn, *args, **kwargs):
+        """
+        Lanza la función en el QThreadPool, cancelando la tarea anterior si sigue en curso.
+        """
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+        worker = Worker(fn, *args, **kwargs)
+        worker.signals.progress.connect(self.progress_bar.setValue)
+        worker.signals.result.connect(lambda resultado, w=worker: self.on_task_result(w, resultado))
+        worker.signals.error.connect(self.on_task_error)
+        worker.signals.finished.connect(lambda w=worker: self.on_task_finished(w))
+        self.current_worker = worker
+        self.progress_bar.setValue(0)
+        self.btn_cancel.setEnabled(True)
+        self.thread_pool.start(worker)
+
+    def cancel_task(self):
+        if self.current_worker is not None:
+            self.current_worker.cancel()
+            self.status_label.setText("Tarea cancelada.")
+
+    def on_task_result(self, worker, resultado):
+        # Ignorar resultados de tareas que ya fueron reemplazadas por otra más reciente
+        if worker is not self.current_worker:
+            return
+        paneles, ruta = resultado
+        self.render_panels(paneles)
+        self.status_label.setText(f"Imagen guardada en: {ruta}" if ruta else "")
+
+    def on_task_error(self, mensaje):
+        print(mensaje)
+        self.status_label.setText("Error: " + mensaje.strip().splitlines()[-1])
+
+    def on_task_finished(self, worker):
+        if worker is self.current_worker:
+            self.current_worker = None
+            self.btn_cancel.setEnabled(False)
+
+    def current_gray(self):
         if self.imagen_path is None:
             print("No hay imagen seleccionada.")
+            return None
+        if self.imagen_gris is None:
+            self.imagen_gris = leer_gris(self.imagen_path)
+            if self.imagen_gris is None:
+                print("No se pudo cargar la imagen.")
+                return None
+        if self.piramide is None:
+            # La pirámide se construye una sola vez por imagen cargada y realce seleccionado
+            base = self.imagen_gris if self.realce is None else realzar(self.imagen_gris, self.realce)
+            self.piramide = PiramidePrevisualizacion(base)
+            # El panel en escala de grises cambia con la pirámide: el siguiente dibujo debe ser completo
+            self._imagen_axes = None
+        return self.imagen_gris
+
+    def canvas_size(self):
+        # Tamaño de cada panel en píxeles físicos (la vista muestra dos paneles lado a lado)
+        escala = self.canvas.devicePixelRatioF()
+        return int(self.canvas.width() * escala / 2), int(self.canvas.height() * escala)
+
+    # --------- ACCIONES DEL MENÚ ---------
+    def preview_colormap(self, nombre):
+        if self.imagen_path is None:
+            return
+        if self.current_gray() is None:
+            return
+        ancho, alto = self.canvas_size()
+        if self.piramide.en_cache(nombre, ancho, alto):
+            # Mapa ya visto: se muestra de inmediato, sin pasar por el pool de hilos
+            if self.current_worker is not None:
+                self.current_worker.cancel()
+            self.render_panels(paneles_previsualizacion(self.piramide, nombre, ancho, alto))
             return
-        imagen_gris = cv2.imread(self.imagen_path, cv2.IMREAD_GRAYSCALE)
+        self.start_task(tarea_previsualizar, self.piramide, nombre, ancho, alto)
+
+    def change_enhancement(self, texto):
+        self.realce = None if texto == "Ninguno" else texto
+        # La pirámide de la imagen realzada se reconstruye con el siguiente uso
+        self.piramide = None
+        self.preview_colormap(self.combo_colormap.currentText())
+
+    def apply_colormap_menu(self):
+        imagen_gris = self.current_gray()
         if imagen_gris is None:
-            print("No se pudo cargar la imagen.")
             return
-        from practica_1 import menu_mapas_color
-        menu_mapas_color(imagen_gris)
+        ancho, alto = self.canvas_size()
+        self.start_task(tarea_colorear, imagen_gris, self.combo_colormap.currentText(), self.piramide, ancho, alto,
+                        realce=self.realce)
 
     def compare_colormaps(self):
-        if self.imagen_path is None:
-            print("No hay imagen seleccionada.")
-            return
-        imagen_gris = cv2.imread(self.imagen_path, cv2.IMREAD_GRAYSCALE)
+        imagen_gris = self.current_gray()
         if imagen_gris is None:
-            print("No se pudo cargar la imagen.")
             return
-        from practica_1 import comparar_mapas_color
-        comparar_mapas_color(imagen_gris)
+        self.start_task(tarea_mosaico, imagen_gris, nombres_mapas(), "comparacion_mapas_color",
+                        realce=self.realce)
 
     def customize_colormap(self):
-        if self.imagen_path is None:
-            print("No hay imagen seleccionada.")
-            return
-        imagen_gris = cv2.imread(self.imagen_path, cv2.IMREAD_GRAYSCALE)
+        imagen_gris = self.current_gray()
         if imagen_gris is None:
-            print("No se pudo cargar la imagen.")
             return
-        from practica_1 import mostrar_personalizacion_mapas
-        mostrar_personalizacion_mapas(imagen_gris)
+        # Paletas de config.py y paletas compiladas desde archivos (compilador_paletas.py)
+        self.start_task(tarea_mosaico, imagen_gris, list(paletas_personalizadas.keys()) + list(paletas_compiladas),
+                        "mapas_color_personalizados", n_cols=2, realce=self.realce)
 
 
 if __name__ == "__main__":
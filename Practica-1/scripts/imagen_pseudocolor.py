@@ -5,89 +5,224 @@
 import os
 import cv2
 import numpy as np
-import matplotlib.pyplot as plt
 
-from config import mapas_color # Importar el diccionario de mapas de color desde config.py
 from config import script_dir  # Importar la variable script_dir desde config.py
+from registro_mapas import aplicar_mapa, es_mapa_valido, nombres_mapas # Importar el registro de mapas de color
+from alta_profundidad import aplicar_mapa_alta_profundidad # Importar el pseudocolor para 16 bits y flotantes
+from realce_contraste import LIMITE_CLAHE, TESELAS_CLAHE, aplicar_mapa_realzado # Importar el realce de contraste
+from instrumentacion import tramo # Importar los tramos de tiempo de la instrumentación
 
 class ImagenPseudocolor:
     """
     Clase para aplicar y almacenar el resultado de un mapa de color (pseudocolor) a una imagen en escala de grises.
     Atributos: 
         - nombre: str → identificador del mapa de color aplicado
-        - imagen: np.ndarray → imagen pseudocoloreada
+        - imagen: np.ndarray → imagen pseudocoloreada (BGR)
     """
-    def __init__(self, imagen_gris: np.ndarray, nombre: str) -> None:
+    # Sin __dict__ por instancia: solo se guardan el nombre y la referencia a la imagen
+    __slots__ = ("nombre", "imagen")
+
+    def __init__(self, imagen_gris: np.ndarray, nombre: str, normalizacion: str = None, ventana: tuple = None,
+                 rango_percentiles: tuple = (1.0, 99.0), dst: np.ndarray = None, realce: str = None,
+                 teselas: tuple = TESELAS_CLAHE, limite_clahe: float = LIMITE_CLAHE, hilos: int = None) -> None:
         """
         Constructor que aplica el mapa de color indicado a la imagen en escala de grises.
-        imagen_gris: np.ndarray → imagen en escala de grises
+        imagen_gris: np.ndarray → imagen en escala de grises (uint8, uint16 o flotante)
         nombre: str → identificador del mapa de color a aplicar
+        normalizacion: str → None (directo en 8 bits), "rango", "ventana" o "percentil";
+                             las imágenes de más de 8 bits usan "rango" si no se indica
+        ventana: tuple → (centro, ancho) para la normalización "ventana"
+        rango_percentiles: tuple → (p_bajo, p_alto) para la normalización "percentil" y el realce "estirar"
+        dst: np.ndarray → búfer opcional H x W x 3 (uint8) donde se escribe el resultado, en lugar de asignar
+                          uno nuevo; ValueError si su forma no coincide con la imagen
+        realce: str → None, "ecualizar", "clahe" o "estirar": realce de contraste previo (solo imágenes de 8 bits)
+        teselas: tuple → (filas, columnas) de la cuadrícula de CLAHE
+        limite_clahe: float → límite de recorte del histograma de CLAHE
+        hilos: int → hilos para colorear por bandas horizontales; None usa hilos_coloreado de config.py
+        """
+        self.imagen: np.ndarray = None
+        self.aplicar(imagen_gris, nombre, normalizacion, ventana, rango_percentiles, realce, teselas, limite_clahe,
+                     hilos, dst=dst)
+
+    def aplicar(self, imagen_gris: np.ndarray, nombre: str = None, normalizacion: str = None, ventana: tuple = None,
+                rango_percentiles: tuple = (1.0, 99.0), realce: str = None, teselas: tuple = TESELAS_CLAHE,
+                limite_clahe: float = LIMITE_CLAHE, hilos: int = None, dst: np.ndarray = None) -> "ImagenPseudocolor":
+        """
+        Vuelve a colorear reutilizando el búfer de self.imagen si la forma coincide
+        (por ejemplo, cuadros sucesivos de un video o varios mapas sobre la misma imagen).
+        Si nombre es None se conserva el mapa actual. Retorna la misma instancia.
+        dst: np.ndarray → búfer H x W x 3 (uint8) donde escribir el resultado; a diferencia del búfer reutilizado,
+                          si su forma no coincide con la imagen se lanza ValueError
         """
         # Convertir el nombre a mayúsculas para asegurar la coincidencia con las claves del diccionario
-        self.nombre: str = nombre.upper()
+        nombre = self.nombre if nombre is None else nombre.upper()
 
         # Verificar que el nombre del mapa de color sea válido antes de aplicar el colormap
-        if self.nombre not in mapas_color:
-            raise ValueError(f"Opción '{self.nombre}' no válida. Opciones disponibles: {list(mapas_color.keys())}")
-        
-        # Aplicar el mapa de color a la imagen en escala de grises utilizando OpenCV
-        self.imagen: np.ndarray = cv2.applyColorMap(imagen_gris, mapas_color[self.nombre])
+        if not es_mapa_valido(nombre):
+            raise ValueError(f"Opción '{nombre}' no válida. Opciones disponibles: {nombres_mapas()}")
+        self.nombre: str = nombre
+
+        forma = imagen_gris.shape[:2] + (3,)
+        if dst is not None and dst.shape != forma:
+            raise ValueError(f"El búfer de salida debe tener forma {forma}; se recibió {dst.shape}.")
+        # Sin búfer explícito, reutilizar el actual solo si tiene la forma de la nueva imagen
+        if dst is None and self.imagen is not None and self.imagen.shape == forma:
+            dst = self.imagen
+
+        if realce is not None:
+            if normalizacion is not None:
+                raise ValueError("El realce de contraste y la normalización no se pueden combinar.")
+            # Ecualización o estiramiento fusionados con la tabla de colores; CLAHE se aplica antes de colorear
+            with tramo("colorear.realce"):
+                self.imagen = aplicar_mapa_realzado(imagen_gris, self.nombre, realce, teselas, limite_clahe,
+                                                    rango_percentiles, dst=dst, hilos=hilos)
+        elif normalizacion is None and imagen_gris.dtype == np.uint8:
+            # Aplicar el mapa de color (de OpenCV o personalizado) a la imagen en escala de grises
+            with tramo("colorear.applyColorMap"):
+                self.imagen = aplicar_mapa(imagen_gris, self.nombre, dst=dst, hilos=hilos)
+        else:
+            # 16 bits, flotantes o normalización explícita: tabla de búsqueda extendida sin pasar por 8 bits
+            with tramo("colorear.alta_profundidad"):
+                self.imagen = aplicar_mapa_alta_profundidad(
+                    imagen_gris, self.nombre, metodo=normalizacion or "rango", ventana=ventana,
+                    rango_percentiles=rango_percentiles, dst=dst, hilos=hilos)
+        return self
+
+    @property
+    def imagen_rgb(self) -> np.ndarray:
+        """
+        Vista RGB de la imagen (canales invertidos con [..., ::-1]), sin copiar los píxeles.
+        """
+        return self.imagen[..., ::-1]
 
     @classmethod
-    def aplicar_pseudocolor(cls, imagen_gris: np.ndarray, opcion: str):
+    def aplicar_pseudocolor(cls, imagen_gris: np.ndarray, opcion: str, **normalizacion):
         """
         Método de clase para crear un objeto ImagenPseudocolor aplicando el colormap deseado.
         """
         # Retorna una instancia de la clase aplicando el mapa de color seleccionado
-        return cls(imagen_gris, opcion)
+        return cls(imagen_gris, opcion, **normalizacion)
 
     def mostrar(self, imagen_gris: np.ndarray = None) -> None:
         """
         Visualiza la imagen pseudocolor sola o junto con la imagen en escala de grises si se proporciona.
         Si imagen_gris es None, solo muestra la pseudocolor.
         """
-        if imagen_gris is not None:
-            fig, axs = plt.subplots(1, 2, figsize=(10, 5))
-            axs[0].imshow(imagen_gris, cmap='gray')
-            axs[0].set_title('Imagen en escala de grises')
-            axs[0].axis('off')
-            axs[1].imshow(cv2.cvtColor(self.imagen, cv2.COLOR_BGR2RGB))
-            axs[1].set_title(f'Pseudocolor: {self.nombre}')
-            axs[1].axis('off')
-        else:
-            fig, ax = plt.subplots(figsize=(5, 5))
-            ax.imshow(cv2.cvtColor(self.imagen, cv2.COLOR_BGR2RGB))
-            ax.set_title(f'Pseudocolor: {self.nombre}')
-            ax.axis('off')
-        plt.tight_layout()
-        plt.show()
+        plt = self._construir_figura(imagen_gris)[0]
+        with tramo("mostrar.show"):
+            plt.show()
+
+    def _construir_figura(self, imagen_gris: np.ndarray = None) -> tuple:
+        """
+        Construye la figura de matplotlib con la pseudocolor (y la imagen en escala de grises si se proporciona).
+        Retorna una tupla (pyplot, figura).
+        """
+        # matplotlib solo se importa cuando realmente se construye una figura
+        with tramo("importar.matplotlib"):
+            import matplotlib.pyplot as plt
+
+        with tramo("figura.construir"):
+            if imagen_gris is not None:
+                fig, axs = plt.subplots(1, 2, figsize=(10, 5))
+                axs[0].imshow(imagen_gris, cmap='gray')
+                axs[0].set_title('Imagen en escala de grises')
+                axs[0].axis('off')
+                axs[1].imshow(self.imagen_rgb)
+                axs[1].set_title(f'Pseudocolor: {self.nombre}')
+                axs[1].axis('off')
+            else:
+                fig, ax = plt.subplots(figsize=(5, 5))
+                ax.imshow(self.imagen_rgb)
+                ax.set_title(f'Pseudocolor: {self.nombre}')
+                ax.axis('off')
+        with tramo("figura.tight_layout"):
+            plt.tight_layout()
+        return plt, fig
     
-    def guardar(self, ruta_base: str = "resultado", imagen_gris: np.ndarray = None) -> str:
+    def codificar(self, formato: str = "png", calidad: int = None) -> bytes:
         """
-        Guarda la imagen pseudocolor sola o junto con la imagen en escala de grises si se proporciona.
-        Si imagen_gris es None, solo guarda la pseudocolor.
+        Codifica la imagen pseudocolor en memoria (resolución nativa) con cv2.imencode.
+        formato: str → "png", "jpg"/"jpeg" o "webp"
+        calidad: int → nivel de compresión PNG (0-9) o calidad JPEG/WebP (0-100); None usa el valor por defecto
+        Retorna los bytes del archivo codificado.
+        """
+        extension, parametros = parametros_codificacion(formato, calidad)
+        with tramo("codificar.imencode"):
+            ok, buffer = cv2.imencode(extension, self.imagen, parametros)
+        if not ok:
+            raise ValueError(f"No se pudo codificar la imagen en formato '{formato}'.")
+        return buffer.tobytes()
+
+    def guardar(self, ruta_base: str = "resultado", imagen_gris: np.ndarray = None, formato: str = "png",
+                calidad: int = None, figura: bool = None, carpeta: str = None) -> str:
+        """
+        Guarda la imagen pseudocolor y retorna la ruta completa del archivo guardado.
         El archivo se nombra automáticamente con el colormap seleccionado.
-        Retorna la ruta completa del archivo guardado.
-        """
-        if imagen_gris is not None:
-            fig, axs = plt.subplots(1, 2, figsize=(10, 5))
-            axs[0].imshow(imagen_gris, cmap='gray')
-            axs[0].set_title('Imagen en escala de grises')
-            axs[0].axis('off')
-            axs[1].imshow(cv2.cvtColor(self.imagen, cv2.COLOR_BGR2RGB))
-            axs[1].set_title(f'Pseudocolor: {self.nombre}')
-            axs[1].axis('off')
-        else:
-            fig, ax = plt.subplots(figsize=(5, 5))
-            ax.imshow(cv2.cvtColor(self.imagen, cv2.COLOR_BGR2RGB))
-            ax.set_title(f'Pseudocolor: {self.nombre}')
-            ax.axis('off')
-        plt.tight_layout()
-
-        nombre_imagen = f"{ruta_base}_{self.nombre}.png"
-        ruta_carpeta = os.path.join(script_dir, 'resources/pseudocolor')
+        Modos:
+            - directo (por defecto sin imagen_gris): escribe los píxeles con cv2.imwrite a resolución nativa,
+              con el formato y la calidad indicados, sin construir ninguna figura.
+            - figura (por defecto con imagen_gris): construye la figura de matplotlib con la pseudocolor,
+              junto a la imagen en escala de grises si se proporciona.
+        formato: str → "png", "jpg"/"jpeg" o "webp"
+        calidad: int → nivel de compresión PNG (0-9) o calidad JPEG/WebP (0-100)
+        figura: bool → fuerza el modo figura (True) o el modo directo (False)
+        carpeta: str → carpeta de destino; por defecto resources/pseudocolor
+        """
+        extension, _ = parametros_codificacion(formato, calidad)
+        ruta_carpeta = carpeta if carpeta is not None else os.path.join(script_dir, 'resources/pseudocolor')
         os.makedirs(ruta_carpeta, exist_ok=True)
-        ruta_imagen = os.path.join(ruta_carpeta, nombre_imagen)
-        fig.savefig(ruta_imagen, bbox_inches='tight', pad_inches=0.05)
+        ruta_imagen = os.path.join(ruta_carpeta, f"{ruta_base}_{self.nombre}{extension}")
+        return self.guardar_en(ruta_imagen, imagen_gris, calidad, figura)
+
+    def guardar_en(self, ruta_imagen: str, imagen_gris: np.ndarray = None, calidad: int = None,
+                   figura: bool = None) -> str:
+        """
+        Igual que guardar, pero escribe exactamente en ruta_imagen; el formato se toma de su extensión.
+        Retorna ruta_imagen.
+        """
+        if figura is None:
+            figura = imagen_gris is not None
+        extension, parametros = parametros_codificacion(os.path.splitext(ruta_imagen)[1] or "png", calidad)
+
+        if not figura:
+            # Escribir directamente el arreglo, sin pasar por matplotlib
+            with tramo("guardar.imwrite"):
+                escrito = cv2.imwrite(ruta_imagen, self.imagen, parametros)
+            if not escrito:
+                raise OSError(f"No se pudo escribir la imagen en {ruta_imagen}")
+            return ruta_imagen
+
+        plt, fig = self._construir_figura(imagen_gris)
+
+        # matplotlib no acepta parámetros de compresión de OpenCV; solo se usa la calidad en JPEG
+        opciones = {"pil_kwargs": {"quality": calidad}} if calidad is not None and extension == ".jpg" else {}
+        with tramo("guardar.savefig"):
+            fig.savefig(ruta_imagen, bbox_inches='tight', pad_inches=0.05, **opciones)
         plt.close(fig)
         return ruta_imagen
+
+
+def parametros_codificacion(formato: str = "png", calidad: int = None) -> tuple:
+    """
+    Traduce un formato de salida y una calidad a la extensión y los parámetros de cv2.imwrite / cv2.imencode.
+    formato: str → "png", "jpg"/"jpeg" o "webp"
+    calidad: int → nivel de compresión PNG (0-9) o calidad JPEG/WebP (0-100; en WebP, más de 100 es sin pérdida)
+    Retorna una tupla (extension, parametros).
+    """
+    formato = formato.lower().lstrip(".")
+    if formato == "png":
+        nivel = 3 if calidad is None else calidad
+        if not 0 <= nivel <= 9:
+            raise ValueError("El nivel de compresión PNG debe estar entre 0 y 9.")
+        return ".png", [cv2.IMWRITE_PNG_COMPRESSION, int(nivel)]
+    if formato in ("jpg", "jpeg"):
+        nivel = 95 if calidad is None else calidad
+        if not 0 <= nivel <= 100:
+            raise ValueError("La calidad JPEG debe estar entre 0 y 100.")
+        return ".jpg", [cv2.IMWRITE_JPEG_QUALITY, int(nivel)]
+    if formato == "webp":
+        nivel = 95 if calidad is None else calidad
+        if nivel < 1:
+            raise ValueError("La calidad WebP debe ser mayor o igual a 1.")
+        return ".webp", [cv2.IMWRITE_WEBP_QUALITY, int(nivel)]
+    raise ValueError(f"Formato '{formato}' no soportado. Opciones disponibles: png, jpg, webp")
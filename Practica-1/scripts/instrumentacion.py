@@ -0,0 +1,360 @@
+# --------- INSTRUMENTACIÓN DE LAS ETAPAS CRÍTICAS (TRAMOS, CONTADORES Y PERFILADO) ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Tramos de tiempo y contadores alrededor de cada etapa (carga, coloreado, figura, guardado...).
+# Desactivada, cada tramo cuesta una consulta a una variable global y un contexto nulo compartido.
+# Activada, registra cada tramo (para exportarlo en formato Chrome trace, visible en chrome://tracing o Perfetto)
+# y acumula estadísticas por etapa (exportables en JSON). El modo "perfil" añade cProfile y tracemalloc.
+#
+# Se activa con:
+#   - la variable de entorno PSEUDOCOLOR_INSTRUMENTACION=tramos|perfil (al salir se exportan los resultados en
+#     PSEUDOCOLOR_INSTRUMENTACION_SALIDA, por defecto resources/instrumentacion/instrumentacion_<pid>)
+#   - cli_pseudocolor.py --instrumentar RUTA_BASE [--perfilar]
+#   - la casilla "Instrumentar" de gui_practica_1.py
+#   - activar() / desactivar() desde el código
+
+import os
+import json
+import time
+import atexit
+import pstats
+import cProfile
+import datetime
+import threading
+import contextlib
+import tracemalloc
+import multiprocessing
+
+from config import script_dir # Importar la carpeta base desde config.py
+
+VARIABLE_ENTORNO = "PSEUDOCOLOR_INSTRUMENTACION"
+VARIABLE_SALIDA = "PSEUDOCOLOR_INSTRUMENTACION_SALIDA"
+MODOS = ("tramos", "perfil")
+
+# Máximo de tramos individuales que se conservan para la traza (las estadísticas por etapa no tienen límite)
+MAX_EVENTOS = 200_000
+# Funciones del perfil y líneas de tracemalloc que se incluyen en el reporte
+MAX_FUNCIONES_PERFIL = 30
+MAX_LINEAS_MEMORIA = 15
+
+_NULO = contextlib.nullcontext()
+
+
+class _Estado:
+    """
+    Estado global de la instrumentación (un solo objeto para que la consulta en el camino rápido sea mínima).
+    """
+    def __init__(self) -> None:
+        self.activo: bool = False
+        self.perfil = None
+        self.candado = threading.Lock()
+        self.reiniciar()
+
+    def reiniciar(self) -> None:
+        # nombre -> [llamadas, total_ns, min_ns, max_ns]
+        self.etapas: dict = {}
+        self.contadores: dict = {}
+        # (nombre, inicio_ns, duracion_ns, pid, tid, memoria_bytes); inicio en perf_counter_ns, que en Linux
+        # es un reloj monótono común a todos los procesos, así que los tramos de los procesos del pool se alinean
+        self.eventos: list = []
+        self.descartados: int = 0
+        # Estadísticas de perfil recibidas de otros procesos (pstats.Stats) y picos de memoria
+        self.perfil_importado = None
+        self.pico_memoria_importado: int = 0
+
+
+_estado = _Estado()
+
+
+def activo() -> bool:
+    return _estado.activo
+
+
+def activar(perfil: bool = False) -> None:
+    """
+    Activa los tramos y contadores; con perfil=True también cProfile (hilo actual) y tracemalloc.
+    """
+    if perfil and _estado.perfil is None:
+        tracemalloc.start()
+        _estado.perfil = cProfile.Profile()
+        _estado.perfil.enable()
+    _estado.activo = True
+
+
+def desactivar() -> None:
+    """
+    Desactiva la instrumentación (los datos recolectados se conservan hasta reiniciar()).
+    """
+    _estado.activo = False
+    if _estado.perfil is not None:
+        _estado.perfil.disable()
+
+
+def reiniciar() -> None:
+    """
+    Descarta los tramos, contadores y perfiles recolectados.
+    """
+    with _estado.candado:
+        _estado.reiniciar()
+    if _estado.perfil is not None:
+        _estado.perfil.disable()
+        _estado.perfil = cProfile.Profile()
+        if _estado.activo:
+            _estado.perfil.enable()
+        tracemalloc.clear_traces()
+
+
+class _Tramo:
+    __slots__ = ("nombre", "inicio", "memoria")
+
+    def __init__(self, nombre: str) -> None:
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.memoria = tracemalloc.get_traced_memory()[0] if _estado.perfil is not None else None
+        self.inicio = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        fin = time.perf_counter_ns()
+        duracion = fin - self.inicio
+        memoria = tracemalloc.get_traced_memory()[0] - self.memoria if self.memoria is not None else None
+        with _estado.candado:
+            etapa = _estado.etapas.get(self.nombre)
+            if etapa is None:
+                _estado.etapas[self.nombre] = [1, duracion, duracion, duracion]
+            else:
+                etapa[0] += 1
+                etapa[1] += duracion
+                etapa[2] = min(etapa[2], duracion)
+                etapa[3] = max(etapa[3], duracion)
+            if len(_estado.eventos) < MAX_EVENTOS:
+                _estado.eventos.append((self.nombre, self.inicio, duracion, os.getpid(), threading.get_ident(),
+                                        memoria))
+            else:
+                _estado.descartados += 1
+        return False
+
+
+def tramo(nombre: str):
+    """
+    Contexto que mide la etapa indicada: `with tramo("guardar.savefig"): ...`
+    Si la instrumentación está desactivada retorna un contexto nulo compartido.
+    """
+    return _Tramo(nombre) if _estado.activo else _NULO
+
+
+def contar(nombre: str, cantidad: int = 1) -> None:
+    """
+    Incrementa un contador (por ejemplo, aciertos de caché); no hace nada si la instrumentación está desactivada.
+    """
+    if _estado.activo:
+        with _estado.candado:
+            _estado.contadores[nombre] = _estado.contadores.get(nombre, 0) + cantidad
+
+
+# --------- INTERCAMBIO ENTRE PROCESOS ---------
+class _PerfilImportado:
+    """
+    Adaptador para cargar en pstats.Stats las estadísticas de cProfile recibidas de otro proceso.
+    """
+    def __init__(self, stats: dict) -> None:
+        self.stats = stats
+
+    def create_stats(self) -> None:
+        pass
+
+
+def extraer() -> dict:
+    """
+    Retorna (y descarta) los datos recolectados en este proceso en una estructura serializable,
+    para enviarlos al proceso principal desde un proceso del pool.
+    """
+    perfil = None
+    if _estado.perfil is not None:
+        _estado.perfil.create_stats()
+        perfil = _estado.perfil.stats
+    with _estado.candado:
+        datos = {"etapas": _estado.etapas, "contadores": _estado.contadores, "eventos": _estado.eventos,
+                 "descartados": _estado.descartados, "perfil": perfil,
+                 "pico_memoria": tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0}
+    reiniciar()
+    return datos
+
+
+def incorporar(datos: dict) -> None:
+    """
+    Agrega al proceso actual los datos extraídos en otro proceso con extraer().
+    """
+    with _estado.candado:
+        for nombre, (llamadas, total, minimo, maximo) in datos["etapas"].items():
+            etapa = _estado.etapas.get(nombre)
+            if etapa is None:
+                _estado.etapas[nombre] = [llamadas, total, minimo, maximo]
+            else:
+                etapa[0] += llamadas
+                etapa[1] += total
+                etapa[2] = min(etapa[2], minimo)
+                etapa[3] = max(etapa[3], maximo)
+        for nombre, cantidad in datos["contadores"].items():
+            _estado.contadores[nombre] = _estado.contadores.get(nombre, 0) + cantidad
+        espacio = MAX_EVENTOS - len(_estado.eventos)
+        _estado.eventos.extend(datos["eventos"][:espacio])
+        _estado.descartados += datos["descartados"] + max(0, len(datos["eventos"]) - espacio)
+        _estado.pico_memoria_importado = max(_estado.pico_memoria_importado, datos["pico_memoria"])
+        if datos["perfil"]:
+            perfil = _PerfilImportado(datos["perfil"])
+            if _estado.perfil_importado is None:
+                _estado.perfil_importado = pstats.Stats(perfil)
+            else:
+                _estado.perfil_importado.add(perfil)
+
+
+# --------- REPORTES ---------
+def _estadisticas_perfil() -> list:
+    fuentes = []
+    if _estado.perfil is not None:
+        # create_stats() detiene el perfilador; se reanuda si la instrumentación sigue activa
+        _estado.perfil.create_stats()
+        fuentes.append(_PerfilImportado(_estado.perfil.stats))
+        if _estado.activo:
+            _estado.perfil.enable()
+    if _estado.perfil_importado is not None:
+        fuentes.append(_estado.perfil_importado)
+    if not fuentes or not any(getattr(f, "stats", None) for f in fuentes):
+        return []
+    estadisticas = pstats.Stats(*fuentes)
+    filas = []
+    for (archivo, linea, funcion), (_, llamadas, total, acumulado, _) in estadisticas.stats.items():
+        filas.append({"funcion": f"{os.path.basename(archivo)}:{linea}({funcion})", "llamadas": llamadas,
+                      "tiempo_propio_ms": total * 1000, "tiempo_acumulado_ms": acumulado * 1000})
+    filas.sort(key=lambda fila: fila["tiempo_acumulado_ms"], reverse=True)
+    return filas[:MAX_FUNCIONES_PERFIL]
+
+
+def _estadisticas_memoria() -> dict:
+    memoria = {"pico_kb": _estado.pico_memoria_importado / 1024}
+    if tracemalloc.is_tracing():
+        actual, pico = tracemalloc.get_traced_memory()
+        memoria["pico_kb"] = max(pico, _estado.pico_memoria_importado) / 1024
+        memoria["actual_kb"] = actual / 1024
+        memoria["principales"] = [
+            {"linea": str(estadistica.traceback[0]), "kb": estadistica.size / 1024, "bloques": estadistica.count}
+            for estadistica in tracemalloc.take_snapshot().statistics("lineno")[:MAX_LINEAS_MEMORIA]]
+    return memoria
+
+
+def estadisticas() -> dict:
+    """
+    Retorna las estadísticas por etapa (llamadas, total, media, mínimo, máximo y p95 en ms), los contadores
+    y, en modo perfil, las funciones más costosas según cProfile y el uso de memoria según tracemalloc.
+    """
+    with _estado.candado:
+        etapas = {nombre: list(valores) for nombre, valores in _estado.etapas.items()}
+        contadores = dict(_estado.contadores)
+        duraciones = {}
+        for nombre, _, duracion, _, _, _ in _estado.eventos:
+            duraciones.setdefault(nombre, []).append(duracion)
+        descartados = _estado.descartados
+
+    tramos = {}
+    for nombre, (llamadas, total, minimo, maximo) in sorted(etapas.items(), key=lambda par: -par[1][1]):
+        muestras = sorted(duraciones.get(nombre, []))
+        tramos[nombre] = {
+            "llamadas": llamadas,
+            "total_ms": total / 1e6,
+            "media_ms": total / llamadas / 1e6,
+            "min_ms": minimo / 1e6,
+            "max_ms": maximo / 1e6,
+            "p95_ms": muestras[min(len(muestras) - 1, int(0.95 * len(muestras)))] / 1e6 if muestras else None,
+        }
+    reporte = {"fecha": datetime.datetime.now().isoformat(timespec="seconds"), "pid": os.getpid(),
+               "tramos": tramos, "contadores": contadores, "tramos_descartados": descartados}
+    if _estado.perfil is not None or _estado.perfil_importado is not None or _estado.pico_memoria_importado:
+        reporte["perfil"] = _estadisticas_perfil()
+        reporte["memoria"] = _estadisticas_memoria()
+    return reporte
+
+
+def exportar_json(ruta: str) -> str:
+    """
+    Guarda estadisticas() en un archivo JSON y retorna la ruta.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(estadisticas(), archivo, indent=2, ensure_ascii=False)
+    return ruta
+
+
+def exportar_chrome(ruta: str) -> str:
+    """
+    Guarda los tramos en el formato Chrome trace (eventos completos "X" y contadores "C") y retorna la ruta.
+    """
+    with _estado.candado:
+        eventos = list(_estado.eventos)
+        contadores = dict(_estado.contadores)
+    traza = []
+    origen = min((inicio for _, inicio, _, _, _, _ in eventos), default=0)
+    for nombre, inicio, duracion, pid, tid, memoria in eventos:
+        evento = {"name": nombre, "cat": nombre.split(".")[0], "ph": "X", "ts": (inicio - origen) / 1000,
+                  "dur": duracion / 1000, "pid": pid, "tid": tid}
+        if memoria is not None:
+            evento["args"] = {"memoria_kb": memoria / 1024}
+        traza.append(evento)
+    fin = max((inicio + duracion - origen for _, inicio, duracion, _, _, _ in eventos), default=0) / 1000
+    for nombre, cantidad in contadores.items():
+        traza.append({"name": nombre, "ph": "C", "ts": fin, "pid": os.getpid(), "args": {"valor": cantidad}})
+    os.makedirs(os.path.dirname(os.path.abspath(ruta)), exist_ok=True)
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump({"traceEvents": traza, "displayTimeUnit": "ms"}, archivo)
+    return ruta
+
+
+def exportar(ruta_base: str) -> tuple:
+    """
+    Exporta las estadísticas (<ruta_base>.json) y la traza (<ruta_base>.trace.json). Retorna ambas rutas.
+    """
+    return exportar_json(ruta_base + ".json"), exportar_chrome(ruta_base + ".trace.json")
+
+
+def resumen() -> str:
+    """
+    Tabla de texto con las etapas ordenadas por tiempo total.
+    """
+    reporte = estadisticas()
+    lineas = [f"{'Etapa':36s} {'Llamadas':>8s} {'Total ms':>10s} {'Media ms':>9s} {'p95 ms':>9s}"]
+    for nombre, etapa in reporte["tramos"].items():
+        p95 = f"{etapa['p95_ms']:9.2f}" if etapa["p95_ms"] is not None else f"{'-':>9s}"
+        lineas.append(f"{nombre:36s} {etapa['llamadas']:8d} {etapa['total_ms']:10.2f} {etapa['media_ms']:9.2f} {p95}")
+    for nombre, cantidad in reporte["contadores"].items():
+        lineas.append(f"{nombre:36s} {cantidad:8d}")
+    return "\n".join(lineas)
+
+
+def ruta_por_defecto(prefijo: str = "instrumentacion") -> str:
+    """
+    Ruta base en resources/instrumentacion con la fecha y hora (sin extensión).
+    """
+    return os.path.join(script_dir, "resources/instrumentacion",
+                        f"{prefijo}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}")
+
+
+def _activar_desde_entorno() -> None:
+    modo = os.environ.get(VARIABLE_ENTORNO, "").strip().lower()
+    if modo in ("", "0", "no"):
+        return
+    activar(perfil=modo == "perfil")
+    # Los procesos del pool heredan la variable, pero sus datos se envían al proceso principal con extraer()
+    if multiprocessing.parent_process() is not None:
+        return
+    ruta_base = os.environ.get(VARIABLE_SALIDA) or ruta_por_defecto()
+
+    def exportar_al_salir():
+        if _estado.etapas or _estado.contadores:
+            rutas = exportar(ruta_base)
+            print(f"Instrumentación guardada en: {rutas[0]} y {rutas[1]}")
+    atexit.register(exportar_al_salir)
+
+
+_activar_desde_entorno()
@@ -0,0 +1,61 @@
+# --------- PIRÁMIDE DE PREVISUALIZACIÓN PARA CAMBIOS INTERACTIVOS DE MAPA ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import threading
+
+import cv2
+import numpy as np
+
+from registro_mapas import obtener_lut_rgb # Importar las tablas RGB del registro de mapas de color
+
+# Lado mínimo del nivel más pequeño de la pirámide (en píxeles)
+LADO_MINIMO = 256
+
+
+class PiramidePrevisualizacion:
+    """
+    Pirámide de versiones reducidas (cv2.pyrDown) de una imagen en escala de grises, construida una sola vez.
+    Permite colorear únicamente el nivel que corresponde al tamaño de la vista y conserva en caché
+    cada previsualización (mapa, nivel), de modo que regresar a un mapa ya visto no cuesta nada.
+    Atributos:
+        - niveles: list → imágenes en escala de grises, del nivel 0 (resolución completa) al más pequeño
+    """
+    def __init__(self, imagen_gris: np.ndarray, lado_minimo: int = LADO_MINIMO) -> None:
+        self.niveles: list = [imagen_gris]
+        while max(self.niveles[-1].shape[:2]) // 2 >= lado_minimo:
+            self.niveles.append(cv2.pyrDown(self.niveles[-1]))
+        self._cache: dict = {}
+        self._candado = threading.Lock()
+
+    def nivel_para(self, ancho: int, alto: int) -> int:
+        """
+        Retorna el índice del nivel más pequeño que sigue cubriendo una vista de ancho x alto píxeles.
+        """
+        for indice in range(len(self.niveles) - 1, -1, -1):
+            alto_nivel, ancho_nivel = self.niveles[indice].shape[:2]
+            if ancho_nivel >= ancho or alto_nivel >= alto:
+                return indice
+        return 0
+
+    def en_cache(self, nombre: str, ancho: int, alto: int) -> bool:
+        """
+        Indica si la previsualización del mapa para ese tamaño de vista ya fue calculada.
+        """
+        return (nombre.upper(), self.nivel_para(ancho, alto)) in self._cache
+
+    def colorear(self, nombre: str, ancho: int, alto: int) -> tuple:
+        """
+        Colorea (o toma de la caché) el nivel adecuado para la vista con el mapa indicado.
+        Retorna una tupla (imagen_gris_del_nivel, previsualizacion_rgb).
+        """
+        indice = self.nivel_para(ancho, alto)
+        clave = (nombre.upper(), indice)
+        with self._candado:
+            previsualizacion = self._cache.get(clave)
+        if previsualizacion is None:
+            # Las tablas RGB evitan la conversión BGR → RGB antes de mostrar con matplotlib
+            previsualizacion = np.take(obtener_lut_rgb(nombre), self.niveles[indice], axis=0)
+            with self._candado:
+                self._cache[clave] = previsualizacion
+        return self.niveles[indice], previsualizacion
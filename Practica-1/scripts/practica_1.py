@@ -7,72 +7,88 @@ import os
 import cv2
 import datetime
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.colors import LinearSegmentedColormap
 
 # Importar elementos locales
 from imagen_pseudocolor import ImagenPseudocolor  # Importar la clase ImagenPseudocolor
-from config import mapas_color # Importar el diccionario de mapas de color desde config.py
 from config import script_dir  # Importar la variable script_dir desde config.py
-from config import colores_pastel, colores_tierra, colores_pastel_personalizados # Importar las listas de colores personalizados desde config.py
+from registro_mapas import nombres_mapas # Importar el registro de mapas de color (OpenCV, personalizados y compilados)
+from comparacion_mapas import crear_mosaico # Importar el motor vectorizado de comparación de mapas
+from cache_imagenes import leer_gris, leer_gris_profundo # Importar la lectura de imágenes a través de la caché compartida
+from cache_resultados import clave_resultado, copiar_resultado, huella_imagen # Caché en disco de resultados
+from cache_resultados import obtener_cache_resultados # Importar la caché de resultados compartida
+from instrumentacion import tramo # Importar los tramos de tiempo de la instrumentación
 
 
 # --------- VARIABLES GLOBALES ---------
 imagen_path = os.path.join(script_dir, 'resources\\input\\rostro_humano.jpg')
 
 # --------- FUNCIONES DE PROCESAMIENTO DE IMAGENES ---------
+def ruta_resultado(nombre_archivo):
+    """
+    Ruta en resources/pseudocolor para un archivo de resultado (crea la carpeta si no existe).
+    """
+    ruta_carpeta = os.path.join(script_dir, 'resources/pseudocolor')
+    os.makedirs(ruta_carpeta, exist_ok=True)
+    return os.path.join(ruta_carpeta, nombre_archivo)
+
+
 def comparar_mapas_color(imagen_gris):
     """
     Muestra la imagen en escala de grises y todas las versiones pseudocoloreadas disponibles.
-    Organizando la cuadrícula de manera dinámica según la cantidad de paletas de OpenCV detectadas.
+    Organizando la cuadrícula de manera dinámica según la cantidad de mapas registrados (OpenCV, personalizados
+    y paletas compiladas).
     """
 
-    print("Creando imagenes con pseudocolor con todos los mapas de color disponibles en OpenCV...")
+    print("Creando imagenes con pseudocolor con todos los mapas de color disponibles...")
     
-    # Obtener la lista de nombres de colormaps disponibles
-    nombres_colormaps = list(mapas_color.keys())
-    n_colormaps = len(nombres_colormaps)
-    total_imgs = n_colormaps + 1  # +1 para la imagen en escala de grises
-
-    # Calcular filas y columnas para la cuadrícula
-    n_cols = min(5, total_imgs)  # máximo 5 columnas para mejor visualización
-    n_rows = int(np.ceil(total_imgs / n_cols))
-
-    # Crear la figura y los ejes para la cuadrícula
-    fig, axs = plt.subplots(n_rows, n_cols, figsize=(5*n_cols, 5*n_rows))
-    axs = np.array(axs).reshape(-1)  # aplanar para indexar fácilmente
-
-    # Imagen en escala de grises en la primera posición
-    axs[0].imshow(imagen_gris, cmap='gray')
-    axs[0].set_title('Escala de grises')
-    axs[0].axis('off')
-
-    # Agregar cada pseudocolor en la cuadrícula y el título correspondiente
-    for idx, nombre in enumerate(nombres_colormaps):
-        pseudocolor = ImagenPseudocolor.aplicar_pseudocolor(imagen_gris, nombre)
-        axs[idx+1].imshow(cv2.cvtColor(pseudocolor.imagen, cv2.COLOR_BGR2RGB))
-        axs[idx+1].set_title(nombre)
-        axs[idx+1].axis('off')
-
-    # Desactivar ejes sobrantes si hay
-    for ax in axs[total_imgs:]:
-        ax.axis('off')
-
-    # Ajustar el layout para evitar recortes y superposiciones
-    plt.tight_layout(rect=[0, 0, 1, 1])
-    plt.subplots_adjust(bottom=0.03, top=0.97, left=0.03, right=0.97, hspace=0.25, wspace=0.15)
+    # Si la misma imagen ya se comparó con los mismos mapas, el mosaico se toma de la caché en disco
+    nombres = nombres_mapas()
+    with tramo("cache.huella"):
+        clave = clave_resultado(huella_imagen(imagen_gris), nombres, tipo="mosaico")
+    cache = obtener_cache_resultados()
+    mosaico = None
+
+    def generar(ruta_cache):
+        # Construir el mosaico con todos los mapas registrados en una sola operación vectorizada (comparacion_mapas)
+        nonlocal mosaico
+        with tramo("colorear.mosaico"):
+            mosaico = crear_mosaico(imagen_gris, nombres)
+        with tramo("guardar.cvtColor"):
+            bgr = cv2.cvtColor(mosaico, cv2.COLOR_RGB2BGR)
+        with tramo("guardar.imwrite"):
+            escrito = cv2.imwrite(ruta_cache, bgr)
+        if not escrito:
+            raise OSError(f"No se pudo escribir la imagen en {ruta_cache}")
+
+    ruta_cache, reutilizado = cache.obtener_o_generar(clave, ".png", generar)
+    if reutilizado:
+        with tramo("cargar.imread"):
+            bgr = cv2.imread(ruta_cache)
+        if bgr is None:
+            # Archivo de la caché dañado o ilegible: se descarta y el mosaico se genera de nuevo
+            cache.descartar(clave, ".png")
+            ruta_cache, reutilizado = cache.obtener_o_generar(clave, ".png", generar)
+        else:
+            mosaico = cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
 
-    # Guardar la figura antes de mostrarla, sin elementos extra
+    # Guardar el mosaico antes de mostrarlo
     # El nombre del archivo incluye la fecha y hora para evitar sobreescrituras
     nombre_archivo = f"comparacion_mapas_color_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-    ruta_carpeta = os.path.join(script_dir, 'resources/pseudocolor')
-    os.makedirs(ruta_carpeta, exist_ok=True)
-    ruta_imagen = os.path.join(ruta_carpeta, nombre_archivo)
-    # Guardar la figura con un pequeño margen para evitar recortes de títulos o bordes
-    fig.savefig(ruta_imagen, bbox_inches='tight', pad_inches=0.05)
-    print(f"Comparación guardada en: {ruta_imagen}")
-
-    plt.show()
+    ruta_imagen = copiar_resultado(ruta_cache, ruta_resultado(nombre_archivo))
+    print(f"Comparación {'recuperada de la caché y ' if reutilizado else ''}guardada en: {ruta_imagen}")
+
+    # Mostrar el mosaico (ya está en RGB) en una figura de 16 pulgadas de ancho
+    # matplotlib solo se importa cuando realmente se muestra una figura
+    with tramo("importar.matplotlib"):
+        import matplotlib.pyplot as plt
+    with tramo("figura.construir"):
+        fig, ax = plt.subplots(figsize=(16, 16 * mosaico.shape[0] / mosaico.shape[1]))
+        ax.imshow(mosaico)
+        ax.axis('off')
+    with tramo("figura.tight_layout"):
+        plt.tight_layout()
+    with tramo("mostrar.show"):
+        plt.show()
 
 
 def menu_mapas_color(imagen_gris):
@@ -81,22 +97,25 @@ def menu_mapas_color(imagen_gris):
     Muestra la imagen resultante y ofrece la opción de guardarla.
     """
     
+    # Incluir tanto los mapas de OpenCV como las paletas personalizadas registradas
+    nombres = nombres_mapas()
+
     while True:
         print("\n=== Menú de Mapas de Color Disponibles ===")
-        for i, nombre in enumerate(mapas_color.keys(), start=1):
+        for i, nombre in enumerate(nombres, start=1):
             print(f"{i}. {nombre}")
-        print(f"{len(mapas_color)+1}. Regresar al Menú Principal [Regresar, Salir]")
+        print(f"{len(nombres)+1}. Regresar al Menú Principal [Regresar, Salir]")
 
         opcion_usuario = input("Selecciona un mapa de color por nombre o número: ").strip()
 
         # Permitir selección por número además de por nombre
         if opcion_usuario.isdigit():
             indice = int(opcion_usuario) - 1
-            if indice == len(mapas_color):
+            if indice == len(nombres):
                 print("Regresando al Menú Principal...")
                 break
-            elif 0 <= indice < len(mapas_color):
-                opcion_usuario = list(mapas_color.keys())[indice]
+            elif 0 <= indice < len(nombres):
+                opcion_usuario = nombres[indice]
             else:
                 print("Número fuera de rango.")
                 continue
@@ -107,9 +126,13 @@ def menu_mapas_color(imagen_gris):
         try:
             resultado = ImagenPseudocolor.aplicar_pseudocolor(imagen_gris, opcion_usuario)
             resultado.mostrar(imagen_gris)
+            # La figura guardada se reutiliza de la caché si ya se generó con la misma imagen y el mismo mapa
+            clave = clave_resultado(huella_imagen(imagen_gris), [resultado.nombre], tipo="figura")
+            ruta_cache, reutilizado = obtener_cache_resultados().obtener_o_generar(
+                clave, ".png", lambda ruta: resultado.guardar_en(ruta, imagen_gris))
             image_name = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-            ruta_guardada = resultado.guardar(image_name, imagen_gris)
-            print(f"Imagen guardada en: {ruta_guardada}")
+            ruta_guardada = copiar_resultado(ruta_cache, ruta_resultado(f"{image_name}_{resultado.nombre}.png"))
+            print(f"Imagen {'recuperada de la caché y ' if reutilizado else ''}guardada en: {ruta_guardada}")
             pausa = input("Presiona Enter para continuar...")
         except ValueError as e:
             print("Error:", e)
@@ -126,12 +149,15 @@ def mostrar_personalizacion_mapas(imagen_gris):
     # Cada fila tiene valores de 0 a 255 en forma de gradiente
     # imagen_gris = np.tile(np.linspace(0, 255, 256), (100,1)).astype(np.uint8)
 
-    # Crear los mapas de color personalizados utilizando LinearSegmentedColormap
-    mapa_pastel = LinearSegmentedColormap.from_list("PastelMap", colores_pastel, N=256)
-    mapa_tierra = LinearSegmentedColormap.from_list("TierraMap", colores_tierra, N=256)
-    mapa_pastel_personalizado = LinearSegmentedColormap.from_list("PastelPersonalizadoMap", colores_pastel_personalizados, N=256)
+    # Aplicar los mapas de color personalizados con sus tablas de búsqueda precalculadas (registro_mapas)
+    # y visualizarlos con matplotlib a través de una vista RGB, sin copiar los píxeles
+    pastel = ImagenPseudocolor(imagen_gris, "PASTEL").imagen_rgb
+    tierra = ImagenPseudocolor(imagen_gris, "TIERRA").imagen_rgb
+    pastel_personalizado = ImagenPseudocolor(imagen_gris, "PASTEL_PERSONALIZADO").imagen_rgb
 
     # Visualizar la imagen original y la imagen con pseudocolor pastel y tierra
+    with tramo("importar.matplotlib"):
+        import matplotlib.pyplot as plt
     fig, axs = plt.subplots(2, 2, figsize=(10, 8))
     axs = np.array(axs).reshape(-1)
 
@@ -139,31 +165,39 @@ def mostrar_personalizacion_mapas(imagen_gris):
     axs[0].set_title('Imagen en escala de grises')
     axs[0].axis('off')
 
-    axs[1].imshow(imagen_gris, cmap=mapa_pastel)
+    axs[1].imshow(pastel)
     axs[1].set_title('Mapa de color pastel')
     axs[1].axis('off')
 
-    axs[2].imshow(imagen_gris, cmap=mapa_tierra)
+    axs[2].imshow(tierra)
     axs[2].set_title('Mapa de color tierra')
     axs[2].axis('off')
 
-    axs[3].imshow(imagen_gris, cmap=mapa_pastel_personalizado)
+    axs[3].imshow(pastel_personalizado)
     axs[3].set_title('Mapa de color pastel personalizado')
     axs[3].axis('off')
 
-    plt.tight_layout()
+    with tramo("figura.tight_layout"):
+        plt.tight_layout()
 
-    # Guardar la figura antes de mostrarla, sin elementos extra
+    # Guardar la figura antes de mostrarla, sin elementos extra; si ya existe en la caché no se vuelve a rasterizar
     # El nombre del archivo incluye la fecha y hora para evitar sobreescrituras
-    nombre_archivo = f"mapas_color_personalizados_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
-    ruta_carpeta = os.path.join(script_dir, 'resources/pseudocolor')
-    os.makedirs(ruta_carpeta, exist_ok=True)
-    ruta_imagen = os.path.join(ruta_carpeta, nombre_archivo)
+    clave = clave_resultado(huella_imagen(imagen_gris), ["PASTEL", "TIERRA", "PASTEL_PERSONALIZADO"],
+                            tipo="personalizados")
     # Guardar la figura con un pequeño margen para evitar recortes de títulos o bordes
-    fig.savefig(ruta_imagen, bbox_inches='tight', pad_inches=0.05)
-    print(f"Comparación guardada en: {ruta_imagen}")
+    ruta_cache, reutilizado = obtener_cache_resultados().obtener_o_generar(
+        clave, ".png", lambda ruta: _guardar_figura(fig, ruta))
+    nombre_archivo = f"mapas_color_personalizados_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+    ruta_imagen = copiar_resultado(ruta_cache, ruta_resultado(nombre_archivo))
+    print(f"Comparación {'recuperada de la caché y ' if reutilizado else ''}guardada en: {ruta_imagen}")
+
+    with tramo("mostrar.show"):
+        plt.show()
+
 
-    plt.show()
+def _guardar_figura(fig, ruta):
+    with tramo("guardar.savefig"):
+        fig.savefig(ruta, bbox_inches='tight', pad_inches=0.05)
 
 # --------- FUNCIONES DE PROCESAMIENTO DE IMAGENES ---------
 def seleccionar_imagen():
@@ -209,7 +243,7 @@ def menu_principal():
         print(f"Imagen actual: {imagen_path}")
         print("1. Seleccionar Imagen a Procesar")
         print("2. Aplicar un Mapa de Color a la Imagen en Escala de Grises")
-        print("3. Comparación Visual de Mapas de Color Disponibles en OpenCV")
+        print("3. Comparación Visual de Mapas de Color Disponibles")
         print("4. Personalización del Mapa de Color")
         print("5. Salir del Programa")
         opcion = input("Selecciona una Opción: ").strip()
@@ -217,17 +251,17 @@ def menu_principal():
         if opcion == "1":
             seleccionar_imagen()
         elif opcion == "2":
-            imagen_gris = cv2.imread(imagen_path, cv2.IMREAD_GRAYSCALE)
+            imagen_gris = leer_gris_profundo(imagen_path)  # 16 bits y flotantes se colorean sin reducir a 8 bits
             if imagen_gris is None:
                 raise FileNotFoundError("No se pudo cargar la imagen. Verifica la ruta y extensión.")
             menu_mapas_color(imagen_gris)
         elif opcion == "3":
-            imagen_gris = cv2.imread(imagen_path, cv2.IMREAD_GRAYSCALE)
+            imagen_gris = leer_gris(imagen_path)
             if imagen_gris is None:
                 raise FileNotFoundError("No se pudo cargar la imagen. Verifica la ruta y extensión.")
             comparar_mapas_color(imagen_gris)
         elif opcion == "4":
-            imagen_gris = cv2.imread(imagen_path, cv2.IMREAD_GRAYSCALE)
+            imagen_gris = leer_gris(imagen_path)
             if imagen_gris is None:
                 raise FileNotFoundError("No se pudo cargar la imagen. Verifica la ruta y extensión.")
             mostrar_personalizacion_mapas(imagen_gris)
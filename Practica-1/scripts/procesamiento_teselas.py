@@ -0,0 +1,159 @@
+# --------- PROCESAMIENTO POR TESELAS PARA IMÁGENES DE GRAN TAMAÑO ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Aplica un mapa de color a imágenes que no caben en memoria (ortomosaicos, escaneos de obleas, etc.).
+# La imagen en escala de grises se lee por teselas desde un archivo mapeado en memoria (.npy o crudo)
+# o desde un TIFF, y cada tesela se escribe en una salida también mapeada en memoria (.npy o crudo)
+# o en un TIFF por teselas. La memoria máxima depende del tamaño de la tesela, no del de la imagen.
+#
+# Ejemplo de uso:
+#   python procesamiento_teselas.py ortomosaico.npy ortomosaico_jet.npy -m JET -t 2048
+#   python procesamiento_teselas.py oblea.raw oblea_pastel.tif -m PASTEL --forma 40000 60000
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from registro_mapas import aplicar_mapa, es_mapa_valido, nombres_mapas # Importar el registro de mapas de color
+
+# Lado por defecto de cada tesela (en píxeles)
+LADO_TESELA = 2048
+
+EXTENSIONES_TIFF = (".tif", ".tiff")
+
+
+def _importar_tifffile():
+    """
+    Importa tifffile, que solo es necesario para leer o escribir archivos TIFF.
+    """
+    try:
+        import tifffile
+    except ImportError as e:
+        raise ImportError("Para leer o escribir TIFF por teselas instala tifffile: pip install tifffile") from e
+    return tifffile
+
+
+def abrir_entrada(ruta: str, forma: tuple = None):
+    """
+    Abre la imagen en escala de grises sin cargarla completa en memoria.
+    - .npy: se mapea en memoria con np.load(mmap_mode='r')
+    - .tif/.tiff: se mapea en memoria si no está comprimido; si lo está, se accede por teselas con zarr
+    - cualquier otra extensión: archivo crudo uint8 mapeado con np.memmap (requiere forma = (alto, ancho))
+    Retorna un objeto indexable con forma (alto, ancho) cuyas rebanadas se leen bajo demanda.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == ".npy":
+        imagen = np.load(ruta, mmap_mode='r')
+    elif extension in EXTENSIONES_TIFF:
+        tifffile = _importar_tifffile()
+        try:
+            imagen = tifffile.memmap(ruta, mode='r')
+        except ValueError:
+            # TIFF comprimido o por teselas: se lee cada región bajo demanda a través de zarr
+            try:
+                import zarr
+            except ImportError as e:
+                raise ImportError("Para leer TIFF comprimidos por teselas instala zarr: pip install zarr") from e
+            imagen = zarr.open(tifffile.imread(ruta, aszarr=True), mode='r')
+    else:
+        if forma is None:
+            raise ValueError("Para archivos crudos es necesario indicar la forma (alto, ancho).")
+        imagen = np.memmap(ruta, dtype=np.uint8, mode='r', shape=tuple(forma))
+
+    if len(imagen.shape) != 2 or imagen.dtype != np.uint8:
+        raise ValueError(f"Se esperaba una imagen en escala de grises de 8 bits, se obtuvo {imagen.shape} {imagen.dtype}.")
+    return imagen
+
+
+def iterar_teselas(alto: int, ancho: int, lado: int = LADO_TESELA):
+    """
+    Genera las regiones (y0, y1, x0, x1) que cubren la imagen, recorriéndola por filas de teselas.
+    """
+    for y0 in range(0, alto, lado):
+        for x0 in range(0, ancho, lado):
+            yield y0, min(y0 + lado, alto), x0, min(x0 + lado, ancho)
+
+
+def _teselas_tiff(entrada, nombre: str, lado: int):
+    """
+    Genera las teselas pseudocoloreadas (RGB) en el orden que espera tifffile, rellenando los bordes.
+    """
+    alto, ancho = entrada.shape
+    for y0, y1, x0, x1 in iterar_teselas(alto, ancho, lado):
+        tesela = np.zeros((lado, lado, 3), dtype=np.uint8)
+        color = aplicar_mapa(np.ascontiguousarray(entrada[y0:y1, x0:x1]), nombre)
+        tesela[:y1 - y0, :x1 - x0] = color[..., ::-1]
+        yield tesela
+
+
+def pseudocolorear_teselas(ruta_entrada: str, ruta_salida: str, nombre: str, lado: int = LADO_TESELA,
+                           forma: tuple = None) -> dict:
+    """
+    Aplica el mapa de color indicado a la imagen de ruta_entrada tesela por tesela y escribe el resultado en ruta_salida.
+    Formato de salida según la extensión:
+    - .npy: arreglo (alto, ancho, 3) BGR mapeado en memoria con np.lib.format.open_memmap
+    - .tif/.tiff: TIFF RGB por teselas escrito en streaming con tifffile (lado múltiplo de 16)
+    - otra extensión: archivo crudo (alto, ancho, 3) BGR uint8 mapeado con np.memmap
+    Retorna un diccionario con la forma, el número de teselas y el tiempo total en segundos.
+    """
+    nombre = nombre.upper()
+    if not es_mapa_valido(nombre):
+        raise ValueError(f"Opción '{nombre}' no válida. Opciones disponibles: {nombres_mapas()}")
+
+    inicio = time.perf_counter()
+    entrada = abrir_entrada(ruta_entrada, forma)
+    alto, ancho = entrada.shape
+    n_teselas = len(range(0, alto, lado)) * len(range(0, ancho, lado))
+    extension = os.path.splitext(ruta_salida)[1].lower()
+
+    if extension in EXTENSIONES_TIFF:
+        if lado % 16 != 0:
+            raise ValueError("En salidas TIFF el lado de la tesela debe ser múltiplo de 16.")
+        tifffile = _importar_tifffile()
+        tifffile.imwrite(ruta_salida, _teselas_tiff(entrada, nombre, lado), shape=(alto, ancho, 3),
+                         dtype=np.uint8, tile=(lado, lado), photometric='rgb', bigtiff=True)
+    else:
+        if extension == ".npy":
+            salida = np.lib.format.open_memmap(ruta_salida, mode='w+', dtype=np.uint8, shape=(alto, ancho, 3))
+        else:
+            salida = np.memmap(ruta_salida, dtype=np.uint8, mode='w+', shape=(alto, ancho, 3))
+        for y0, y1, x0, x1 in iterar_teselas(alto, ancho, lado):
+            # Solo la tesela actual se lee del disco y se colorea en memoria
+            salida[y0:y1, x0:x1] = aplicar_mapa(np.ascontiguousarray(entrada[y0:y1, x0:x1]), nombre)
+        salida.flush()
+        del salida
+
+    return {"forma": (alto, ancho), "teselas": n_teselas, "segundos": time.perf_counter() - inicio}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Aplica un mapa de color por teselas a imágenes de gran tamaño (.npy, crudo o TIFF).")
+    parser.add_argument("entrada", help="Imagen en escala de grises de 8 bits (.npy, .tif o archivo crudo).")
+    parser.add_argument("salida", help="Archivo de salida (.npy, .tif o archivo crudo BGR).")
+    parser.add_argument("-m", "--mapa", default="JET",
+                        help=f"Mapa de color a aplicar. Disponibles: {', '.join(nombres_mapas())}")
+    parser.add_argument("-t", "--tesela", type=int, default=LADO_TESELA, help="Lado de cada tesela en píxeles.")
+    parser.add_argument("--forma", type=int, nargs=2, metavar=("ALTO", "ANCHO"),
+                        help="Forma de la imagen cuando la entrada es un archivo crudo.")
+    args = parser.parse_args(argv)
+
+    try:
+        resumen = pseudocolorear_teselas(args.entrada, args.salida, args.mapa, args.tesela, args.forma)
+    except (ValueError, ImportError, OSError) as e:
+        print("Error:", e)
+        return 1
+
+    alto, ancho = resumen["forma"]
+    print(f"Imagen de {ancho}x{alto} procesada en {resumen['teselas']} tesela(s) "
+          f"en {resumen['segundos']:.2f} s ({alto * ancho / 1e6 / resumen['segundos']:.2f} MP/s)")
+    print(f"Resultado guardado en: {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# --------- REALCE DE CONTRASTE ANTES DEL PSEUDOCOLOR (ECUALIZACIÓN, CLAHE, ESTIRAMIENTO) ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Las imágenes de bajo contraste (por ejemplo, termografías) solo usan una franja angosta de cada mapa de color.
+# La ecualización global y el estiramiento por percentiles son una función de cada nivel de gris, así que se
+# componen con la tabla de colores en una sola tabla de 256 entradas: el costo por píxel sigue siendo una búsqueda.
+# CLAHE depende de la vecindad de cada píxel, por lo que se aplica primero y después se colorea normalmente.
+
+import cv2
+import numpy as np
+
+from registro_mapas import aplicar_mapa, aplicar_tabla, obtener_lut # Importar el registro de mapas de color
+from alta_profundidad import percentiles # Importar el cálculo de percentiles por histograma
+
+METODOS_REALCE = ("ecualizar", "clahe", "estirar")
+
+# Parámetros por defecto de CLAHE: cuadrícula de teselas (filas, columnas) y límite de recorte del histograma
+TESELAS_CLAHE = (8, 8)
+LIMITE_CLAHE = 2.0
+
+
+def _validar(imagen_gris: np.ndarray, metodo: str) -> None:
+    if metodo not in METODOS_REALCE:
+        raise ValueError(f"Opción '{metodo}' no válida. Opciones disponibles: {list(METODOS_REALCE)}")
+    if imagen_gris.dtype != np.uint8 or imagen_gris.ndim != 2:
+        raise ValueError("El realce de contraste requiere una imagen en escala de grises de 8 bits (H x W, uint8); "
+                         "para 16 bits o flotantes usa la normalización 'percentil'.")
+
+
+def tabla_realce(imagen_gris: np.ndarray, metodo: str, rango_percentiles: tuple = (1.0, 99.0)) -> np.ndarray:
+    """
+    Calcula la transformación global de niveles de gris (256 entradas, uint8) a partir del histograma.
+    metodo: str → "ecualizar" (misma fórmula que cv2.equalizeHist) o "estirar" (lineal entre dos percentiles)
+    rango_percentiles: tuple → (p_bajo, p_alto) para el método "estirar"
+    """
+    _validar(imagen_gris, metodo)
+    if metodo == "clahe":
+        raise ValueError("CLAHE es local y no se puede expresar como una tabla global; usa realzar().")
+
+    niveles = np.arange(256, dtype=np.float64)
+    if metodo == "ecualizar":
+        acumulado = np.cumsum(np.bincount(imagen_gris.ravel(), minlength=256))
+        minimo = acumulado[np.flatnonzero(acumulado)[0]]
+        total = acumulado[-1]
+        if total == minimo:
+            # Imagen de un solo nivel: no hay nada que ecualizar
+            return niveles.astype(np.uint8)
+        tabla = (acumulado - minimo) * 255.0 / (total - minimo)
+    else:
+        bajo, alto = percentiles(imagen_gris, *rango_percentiles)
+        if alto <= bajo:
+            return niveles.astype(np.uint8)
+        tabla = (niveles - bajo) * 255.0 / (alto - bajo)
+    return np.clip(np.rint(tabla), 0, 255).astype(np.uint8)
+
+
+def realzar(imagen_gris: np.ndarray, metodo: str, teselas: tuple = TESELAS_CLAHE, limite: float = LIMITE_CLAHE,
+            rango_percentiles: tuple = (1.0, 99.0)) -> np.ndarray:
+    """
+    Retorna la imagen en escala de grises realzada con el método indicado (útil para mostrarla o reducirla).
+    teselas: tuple → (filas, columnas) de la cuadrícula de CLAHE
+    limite: float → límite de recorte del histograma de CLAHE
+    """
+    _validar(imagen_gris, metodo)
+    if metodo == "clahe":
+        return cv2.createCLAHE(clipLimit=limite, tileGridSize=(int(teselas[1]), int(teselas[0]))).apply(imagen_gris)
+    return cv2.LUT(imagen_gris, tabla_realce(imagen_gris, metodo, rango_percentiles))
+
+
+def componer_lut(lut: np.ndarray, tabla: np.ndarray, eje: int = 0) -> np.ndarray:
+    """
+    Compone una tabla de niveles de gris (256) con una tabla de colores: lut[tabla[g]] para cada nivel g.
+    lut: np.ndarray → tabla de colores de 256 entradas en el eje indicado (256x1x3 BGR, 256x3 o K x 256 x 3)
+    """
+    return np.ascontiguousarray(np.take(lut, tabla, axis=eje))
+
+
+def aplicar_mapa_realzado(imagen_gris: np.ndarray, nombre: str, metodo: str, teselas: tuple = TESELAS_CLAHE,
+                          limite: float = LIMITE_CLAHE, rango_percentiles: tuple = (1.0, 99.0),
+                          dst: np.ndarray = None, hilos: int = None) -> np.ndarray:
+    """
+    Realza el contraste y aplica el mapa de color indicado.
+    "ecualizar" y "estirar" se fusionan con la tabla de colores (una sola búsqueda por píxel);
+    "clahe" se aplica primero y después se colorea la imagen realzada.
+    dst: np.ndarray → búfer opcional H x W x 3 (uint8, contiguo) donde escribir el resultado
+    hilos: int → hilos para colorear por bandas; None usa hilos_coloreado de config.py
+    Retorna la imagen pseudocoloreada en BGR.
+    """
+    _validar(imagen_gris, metodo)
+    if metodo == "clahe":
+        return aplicar_mapa(realzar(imagen_gris, metodo, teselas, limite), nombre, dst=dst, hilos=hilos)
+    tabla = tabla_realce(imagen_gris, metodo, rango_percentiles)
+    return aplicar_tabla(imagen_gris, componer_lut(obtener_lut(nombre), tabla), dst=dst, hilos=hilos)
@@ -0,0 +1,244 @@
+# --------- REGISTRO DE MAPAS DE COLOR (TABLAS DE BÚSQUEDA) ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import os
+import json
+
+import cv2
+import numpy as np
+
+from config import mapas_color # Importar el diccionario de mapas de color desde config.py
+from config import paletas_personalizadas # Importar el registro de paletas personalizadas desde config.py
+from config import carpeta_paletas_compiladas # Importar la carpeta del paquete de paletas compiladas
+from coloreado_paralelo import en_bandas # Importar el coloreado por bandas en paralelo
+
+# Número de entradas de una tabla de búsqueda para imágenes de 8 bits
+N_ENTRADAS = 256
+
+# Caché de tablas de búsqueda ya calculadas (nombre -> LUT BGR de 256x1x3 uint8; (nombre, n) -> LUT de n x 3)
+_cache_luts = {}
+
+# Caché de tablas de búsqueda en orden RGB (nombre -> LUT RGB de 256x3 uint8)
+_cache_luts_rgb = {}
+
+# Paquete de paletas compiladas por compilador_paletas.py: tablas BGR de K x 256 x 1 x 3 (uint8) e índice de nombres.
+# Cada compilación escribe un paquete con nombre propio (paletas-<hash>.npy) y el índice apunta a él, de modo que
+# reemplazar el índice cambia nombres y tablas a la vez
+PREFIJO_PAQUETE = "paletas-"
+ARCHIVO_INDICE = "paletas.json"
+VERSION_PAQUETE = 2
+
+# Paletas compiladas (nombre -> posición en el paquete mapeado en memoria)
+paletas_compiladas = {}
+_paquete_compilado = None
+
+
+def crear_lut(colores, n: int = N_ENTRADAS) -> np.ndarray:
+    """
+    Convierte una lista de colores RGB normalizados (valores entre 0 y 1) en una tabla de búsqueda.
+    Los colores se distribuyen de manera uniforme y se interpolan linealmente,
+    igual que LinearSegmentedColormap.from_list.
+    Retorna un arreglo uint8 de n x 1 x 3 en orden BGR, listo para cv2.applyColorMap o cv2.LUT.
+    """
+    colores = np.asarray(colores, dtype=np.float64)
+    if colores.ndim != 2 or colores.shape[1] != 3 or len(colores) < 2:
+        raise ValueError("La paleta debe contener al menos dos colores RGB (r, g, b).")
+    if colores.min() < 0.0 or colores.max() > 1.0:
+        raise ValueError("Los colores de la paleta deben estar normalizados entre 0 y 1.")
+
+    # Posición de cada color de control y de cada entrada de la tabla
+    posiciones = np.linspace(0.0, 1.0, len(colores))
+    muestras = np.linspace(0.0, 1.0, n)
+
+    # Interpolar cada canal (R, G, B) y escalar a 0-255
+    rgb = np.stack([np.interp(muestras, posiciones, colores[:, c]) for c in range(3)], axis=-1)
+    rgb = np.clip(np.rint(rgb * 255.0), 0, 255).astype(np.uint8)
+
+    # OpenCV trabaja en BGR, por lo que se invierte el orden de los canales
+    return np.ascontiguousarray(rgb[:, ::-1]).reshape(n, 1, 3)
+
+
+def registrar_paleta(nombre: str, colores) -> None:
+    """
+    Registra (o reemplaza) una paleta personalizada para que esté disponible como mapa de color.
+    """
+    nombre = nombre.upper()
+    if nombre in mapas_color:
+        raise ValueError(f"El nombre '{nombre}' ya corresponde a un mapa de color de OpenCV.")
+    # Validar la paleta antes de registrarla y guardar su tabla en la caché
+    lut = crear_lut(colores)
+    lut.setflags(write=False)
+    paletas_personalizadas[nombre] = list(colores)
+    # Descartar las tablas derivadas de una versión anterior de la paleta
+    for clave in [c for c in _cache_luts if isinstance(c, tuple) and c[0] == nombre]:
+        del _cache_luts[clave]
+    _cache_luts[nombre] = lut
+    _cache_luts_rgb.pop(nombre, None)
+
+
+def cargar_paletas_compiladas(carpeta: str = carpeta_paletas_compiladas) -> int:
+    """
+    Mapea en memoria el paquete de paletas compiladas de la carpeta indicada y registra sus nombres.
+    Solo se leen el índice JSON y la cabecera del .npy; cada tabla se lee del disco la primera vez que se usa,
+    por lo que el costo de arranque no depende del número de paletas.
+    Retorna el número de paletas cargadas (0 si la carpeta no tiene un paquete válido).
+    """
+    global _paquete_compilado
+    # Una compilación simultánea puede borrar el paquete entre la lectura del índice y la del paquete:
+    # en ese caso se vuelve a leer el índice, que ya apunta al paquete nuevo
+    for intento in range(2):
+        try:
+            with open(os.path.join(carpeta, ARCHIVO_INDICE), encoding="utf-8") as archivo:
+                indice = json.load(archivo)
+            archivo_paquete = os.path.basename(str(indice.get("paquete", "")))
+            paquete = np.load(os.path.join(carpeta, archivo_paquete), mmap_mode="r")
+            break
+        except FileNotFoundError:
+            if intento == 1:
+                return 0
+        except (OSError, ValueError, AttributeError):
+            return 0
+    nombres = [paleta["nombre"] for paleta in indice.get("paletas", [])]
+    if indice.get("version") != VERSION_PAQUETE or paquete.shape != (len(nombres), N_ENTRADAS, 1, 3):
+        print(f"Advertencia: el paquete de paletas de {carpeta} no es válido; vuelve a compilarlo con "
+              f"compilador_paletas.py")
+        return 0
+
+    # Descartar las tablas de un paquete anterior
+    for nombre in paletas_compiladas:
+        _cache_luts.pop(nombre, None)
+        _cache_luts_rgb.pop(nombre, None)
+        for clave in [c for c in _cache_luts if isinstance(c, tuple) and c[0] == nombre]:
+            del _cache_luts[clave]
+    paletas_compiladas.clear()
+    paletas_compiladas.update((nombre, i) for i, nombre in enumerate(nombres))
+    _paquete_compilado = paquete
+    return len(nombres)
+
+
+def nombres_mapas() -> list:
+    """
+    Retorna la lista de nombres de todos los mapas disponibles: primero los de OpenCV, después los personalizados
+    de config.py y al final las paletas compiladas.
+    """
+    personalizadas = [n for n in paletas_personalizadas if n not in mapas_color]
+    compiladas = [n for n in paletas_compiladas if n not in mapas_color and n not in paletas_personalizadas]
+    return list(mapas_color.keys()) + personalizadas + compiladas
+
+
+def es_mapa_valido(nombre: str) -> bool:
+    """
+    Indica si el nombre corresponde a un mapa de OpenCV, a una paleta personalizada registrada o a una compilada.
+    """
+    nombre = nombre.upper()
+    return nombre in mapas_color or nombre in paletas_personalizadas or nombre in paletas_compiladas
+
+
+def obtener_lut(nombre: str) -> np.ndarray:
+    """
+    Retorna la tabla de búsqueda BGR de 256x1x3 (uint8) del mapa indicado.
+    Las tablas se calculan una sola vez y se conservan en caché.
+    """
+    nombre = nombre.upper()
+    lut = _cache_luts.get(nombre)
+    if lut is not None:
+        return lut
+
+    if nombre in mapas_color:
+        # Para los mapas de OpenCV se obtiene la tabla aplicando el mapa a una rampa de 0 a 255
+        rampa = np.arange(N_ENTRADAS, dtype=np.uint8).reshape(N_ENTRADAS, 1)
+        lut = cv2.applyColorMap(rampa, mapas_color[nombre]).reshape(N_ENTRADAS, 1, 3)
+    elif nombre in paletas_personalizadas:
+        lut = crear_lut(paletas_personalizadas[nombre])
+    elif nombre in paletas_compiladas:
+        # Vista (sin copia) de la tabla dentro del paquete mapeado en memoria
+        lut = np.asarray(_paquete_compilado[paletas_compiladas[nombre]])
+    else:
+        raise ValueError(f"Opción '{nombre}' no válida. Opciones disponibles: {nombres_mapas()}")
+
+    # Las tablas en caché son de solo lectura para evitar modificaciones accidentales
+    lut.setflags(write=False)
+    _cache_luts[nombre] = lut
+    return lut
+
+
+def obtener_lut_rgb(nombre: str) -> np.ndarray:
+    """
+    Retorna la tabla de búsqueda del mapa indicado en orden RGB, con forma 256x3 (uint8).
+    Se guarda en caché para que la visualización con matplotlib no requiera convertir BGR a RGB.
+    """
+    nombre = nombre.upper()
+    lut = _cache_luts_rgb.get(nombre)
+    if lut is None:
+        lut = np.ascontiguousarray(obtener_lut(nombre).reshape(N_ENTRADAS, 3)[:, ::-1])
+        lut.setflags(write=False)
+        _cache_luts_rgb[nombre] = lut
+    return lut
+
+
+def obtener_lut_extendida(nombre: str, n: int) -> np.ndarray:
+    """
+    Retorna una tabla de búsqueda BGR de n x 3 (uint8) para imágenes de más de 8 bits (por ejemplo 4096 o 65536).
+    Las paletas personalizadas se interpolan directamente desde sus colores de control; los mapas de OpenCV
+    y las paletas compiladas se interpolan linealmente a partir de su tabla de 256 entradas.
+    """
+    nombre = nombre.upper()
+    clave = (nombre, n)
+    lut = _cache_luts.get(clave)
+    if lut is not None:
+        return lut
+
+    if nombre in paletas_personalizadas and nombre not in mapas_color:
+        lut = crear_lut(paletas_personalizadas[nombre], n).reshape(n, 3)
+    else:
+        base = obtener_lut(nombre).reshape(N_ENTRADAS, 3).astype(np.float32)
+        muestras = np.linspace(0, N_ENTRADAS - 1, n)
+        lut = np.stack([np.interp(muestras, np.arange(N_ENTRADAS), base[:, c]) for c in range(3)], axis=-1)
+        lut = np.clip(np.rint(lut), 0, 255).astype(np.uint8)
+
+    lut.setflags(write=False)
+    _cache_luts[clave] = lut
+    return lut
+
+
+def apilar_luts_rgb(nombres: list = None) -> np.ndarray:
+    """
+    Apila las tablas RGB de los mapas indicados (por defecto, todos los registrados) en un arreglo de K x 256 x 3.
+    """
+    if nombres is None:
+        nombres = nombres_mapas()
+    return np.stack([obtener_lut_rgb(nombre) for nombre in nombres])
+
+
+def aplicar_mapa(imagen_gris: np.ndarray, nombre: str, dst: np.ndarray = None, hilos: int = None) -> np.ndarray:
+    """
+    Aplica el mapa de color indicado a una imagen en escala de grises de 8 bits.
+    Los mapas de OpenCV se aplican con su identificador y las paletas personalizadas con su tabla precalculada,
+    de modo que ambos tienen el mismo costo: una búsqueda en tabla por píxel.
+    dst: np.ndarray → búfer opcional H x W x 3 (uint8, contiguo) donde escribir el resultado sin asignar memoria
+    hilos: int → hilos para colorear por bandas las imágenes grandes; None usa hilos_coloreado de config.py
+    Retorna la imagen pseudocoloreada en BGR.
+    """
+    nombre = nombre.upper()
+    mapa = mapas_color[nombre] if nombre in mapas_color else obtener_lut(nombre)
+    return aplicar_tabla(imagen_gris, mapa, dst, hilos)
+
+
+def aplicar_tabla(imagen_gris: np.ndarray, mapa, dst: np.ndarray = None, hilos: int = None) -> np.ndarray:
+    """
+    Aplica con cv2.applyColorMap un identificador de OpenCV o una tabla BGR de 256x1x3 (uint8),
+    por ejemplo una tabla compuesta con otra transformación de los niveles de gris.
+    dst: np.ndarray → búfer opcional H x W x 3 (uint8, contiguo) donde escribir el resultado sin asignar memoria
+    hilos: int → hilos para colorear por bandas las imágenes grandes; None usa hilos_coloreado de config.py
+    """
+    if dst is None:
+        dst = np.empty(imagen_gris.shape[:2] + (3,), dtype=np.uint8)
+    elif dst.shape != imagen_gris.shape[:2] + (3,) or dst.dtype != np.uint8 or not dst.flags.c_contiguous:
+        raise ValueError(f"El búfer de salida debe ser uint8 contiguo con forma {imagen_gris.shape[:2] + (3,)}.")
+    # Cada banda escribe en su propia porción de dst
+    return en_bandas(lambda entrada, salida: cv2.applyColorMap(entrada, mapa, dst=salida), imagen_gris, dst, hilos)
+
+
+# Las paletas compiladas quedan disponibles en cuanto se importa el registro
+cargar_paletas_compiladas()
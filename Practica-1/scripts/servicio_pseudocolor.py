@@ -0,0 +1,438 @@
+# --------- SERVICIO HTTP LOCAL DE PSEUDOCOLOR ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Servidor HTTP/1.1 mínimo sobre asyncio (solo biblioteca estándar) que expone ImagenPseudocolor y las paletas
+# personalizadas de config.py a otras herramientas:
+#   POST /pseudocolor?mapa=JET[&formato=png][&calidad=3][&realce=clahe]
+#        cuerpo: bytes del archivo de imagen (png, jpg, tiff...), sin multipart
+#   GET  /mapas      → lista JSON de mapas disponibles
+#   GET  /metrics    → métricas en formato de texto de Prometheus (latencias, profundidad de la cola, lotes)
+#   GET  /salud      → "ok"
+# El trabajo de CPU (decodificar, colorear, codificar) se hace en un pool de procesos. Las solicitudes concurrentes
+# con el mismo mapa y las mismas opciones se agrupan en micro-lotes (una sola tarea del pool por lote), y las
+# solicitudes que exceden el límite de pendientes se rechazan de inmediato con 503.
+#
+# Ejemplo de uso:
+#   python servicio_pseudocolor.py --puerto 8080
+#   curl --data-binary @resources/input/xray_torso.jpg "http://127.0.0.1:8080/pseudocolor?mapa=JET" -o jet.png
+
+import sys
+import json
+import time
+import asyncio
+import argparse
+import contextlib
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+import numpy as np
+
+from imagen_pseudocolor import ImagenPseudocolor, parametros_codificacion # Importar la clase y los formatos de salida
+from registro_mapas import es_mapa_valido, nombres_mapas # Importar el registro de mapas de color
+from realce_contraste import METODOS_REALCE # Importar los métodos de realce de contraste
+
+# Parámetros por defecto del servicio
+HOST = "127.0.0.1"
+PUERTO = 8080
+MAX_PENDIENTES = 64 # solicitudes aceptadas y no terminadas antes de responder 503
+LOTE_MAXIMO = 16 # imágenes por micro-lote
+ESPERA_LOTE_S = 0.005 # tiempo máximo que una solicitud espera a que se llene su lote
+TAMANO_MAXIMO_MB = 64 # tamaño máximo del cuerpo de una solicitud
+TIEMPO_ESPERA_S = 30.0 # tiempo máximo para recibir una solicitud completa
+
+# Límites superiores (segundos) de las cubetas del histograma de latencias
+CUBETAS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CUBETAS_LOTE = (1, 2, 4, 8, 16, 32, 64)
+
+TIPOS_CONTENIDO = {".png": "image/png", ".jpg": "image/jpeg", ".webp": "image/webp"}
+
+
+class ErrorSolicitud(Exception):
+    """
+    Error que se responde al cliente con el código HTTP indicado.
+    cerrar: bool → True si el cuerpo de la solicitud quedó sin leer y la conexión no se puede reutilizar
+    """
+    def __init__(self, estado: int, mensaje: str, cerrar: bool = False) -> None:
+        super().__init__(mensaje)
+        self.estado: int = estado
+        self.cerrar: bool = cerrar
+
+
+# --------- TRABAJO EN LOS PROCESOS DEL POOL ---------
+def colorear_lote(imagenes: list, mapa: str, formato: str, calidad: int, realce: str) -> list:
+    """
+    Decodifica, colorea y codifica un micro-lote de imágenes con el mismo mapa y las mismas opciones.
+    Se ejecuta en un proceso del pool; cada imagen se colorea en un solo hilo porque el pool ya usa todos los núcleos.
+    Retorna una lista de tuplas (estado HTTP, bytes codificados o mensaje de error), en el mismo orden que imagenes:
+    200 si se coloreó, 400 si la imagen no es válida (error del cliente) y 500 ante cualquier otro fallo.
+    """
+    resultados = []
+    resultado = None
+    for datos in imagenes:
+        try:
+            imagen_gris = cv2.imdecode(np.frombuffer(datos, dtype=np.uint8),
+                                       cv2.IMREAD_GRAYSCALE | cv2.IMREAD_ANYDEPTH)
+            if imagen_gris is None:
+                raise ValueError("No se pudo decodificar la imagen.")
+            # Reutilizar el búfer de salida entre imágenes del lote con la misma forma
+            if resultado is None:
+                resultado = ImagenPseudocolor(imagen_gris, mapa, realce=realce, hilos=1)
+            else:
+                resultado.aplicar(imagen_gris, mapa, realce=realce, hilos=1)
+            resultados.append((200, resultado.codificar(formato, calidad)))
+        except ValueError as e:
+            resultados.append((400, str(e)))
+        except Exception as e:
+            resultados.append((500, f"Error interno: {e}"))
+    return resultados
+
+
+# --------- MÉTRICAS ---------
+class Histograma:
+    """
+    Histograma acumulativo al estilo de Prometheus (cubetas con límite superior, suma y conteo).
+    """
+    def __init__(self, cubetas: tuple) -> None:
+        self.cubetas: tuple = cubetas
+        self.conteos: list = [0] * len(cubetas)
+        self.suma: float = 0.0
+        self.total: int = 0
+
+    def observar(self, valor: float) -> None:
+        self.suma += valor
+        self.total += 1
+        for i, limite in enumerate(self.cubetas):
+            if valor <= limite:
+                self.conteos[i] += 1
+
+    def exportar(self, nombre: str, etiquetas: str = "") -> list:
+        separador = "," if etiquetas else ""
+        # Sin etiquetas, las series _sum y _count se escriben sin llaves
+        sufijo = f"{{{etiquetas}}}" if etiquetas else ""
+        lineas = [f'{nombre}_bucket{{{etiquetas}{separador}le="{limite}"}} {conteo}'
+                  for limite, conteo in zip(self.cubetas, self.conteos)]
+        lineas.append(f'{nombre}_bucket{{{etiquetas}{separador}le="+Inf"}} {self.total}')
+        lineas.append(f"{nombre}_sum{sufijo} {self.suma}")
+        lineas.append(f"{nombre}_count{sufijo} {self.total}")
+        return lineas
+
+
+class MetricasServicio:
+    """
+    Métricas del servicio: latencia por ruta, solicitudes por ruta y código, tamaño de los lotes
+    y profundidad de la cola. Solo se modifican desde el ciclo de eventos, por lo que no requieren candados.
+    """
+    def __init__(self) -> None:
+        self.latencias: dict = {}
+        self.solicitudes: dict = {}
+        self.tamanos_lote = Histograma(CUBETAS_LOTE)
+        self.rechazadas: int = 0
+        self.pendientes: int = 0 # aceptadas y no terminadas
+        self.en_cola: int = 0 # esperando en un lote abierto o a que el pool tome su lote
+        self.lotes_en_proceso: int = 0
+
+    def registrar(self, ruta: str, estado: int, segundos: float) -> None:
+        if ruta not in self.latencias:
+            self.latencias[ruta] = Histograma(CUBETAS_LATENCIA)
+        self.latencias[ruta].observar(segundos)
+        self.solicitudes[(ruta, estado)] = self.solicitudes.get((ruta, estado), 0) + 1
+
+    def exportar(self) -> str:
+        lineas = ["# TYPE pseudocolor_latencia_segundos histogram"]
+        for ruta, histograma in sorted(self.latencias.items()):
+            lineas += histograma.exportar("pseudocolor_latencia_segundos", f'ruta="{ruta}"')
+        lineas.append("# TYPE pseudocolor_solicitudes_total counter")
+        for (ruta, estado), conteo in sorted(self.solicitudes.items()):
+            lineas.append(f'pseudocolor_solicitudes_total{{ruta="{ruta}",estado="{estado}"}} {conteo}')
+        lineas.append("# TYPE pseudocolor_tamano_lote histogram")
+        lineas += self.tamanos_lote.exportar("pseudocolor_tamano_lote")
+        lineas.append("# TYPE pseudocolor_rechazadas_total counter")
+        lineas.append(f"pseudocolor_rechazadas_total {self.rechazadas}")
+        lineas.append("# TYPE pseudocolor_pendientes gauge")
+        lineas.append(f"pseudocolor_pendientes {self.pendientes}")
+        lineas.append("# TYPE pseudocolor_profundidad_cola gauge")
+        lineas.append(f"pseudocolor_profundidad_cola {self.en_cola}")
+        lineas.append("# TYPE pseudocolor_lotes_en_proceso gauge")
+        lineas.append(f"pseudocolor_lotes_en_proceso {self.lotes_en_proceso}")
+        return "\n".join(lineas) + "\n"
+
+
+# --------- MICRO-LOTES ---------
+class AgrupadorLotes:
+    """
+    Agrupa las solicitudes concurrentes con la misma clave (mapa, formato, calidad, realce) en micro-lotes.
+    Un lote se envía al pool cuando alcanza lote_maximo imágenes o cuando pasan espera_s segundos desde
+    que llegó su primera imagen.
+    crear_pool: callable → fábrica del pool; si un proceso muere (por ejemplo, por falta de memoria) el pool queda
+                           inservible y se reemplaza por uno nuevo
+    """
+    def __init__(self, crear_pool, metricas: MetricasServicio, lote_maximo: int = LOTE_MAXIMO,
+                 espera_s: float = ESPERA_LOTE_S) -> None:
+        self.crear_pool = crear_pool
+        self.pool: ProcessPoolExecutor = crear_pool()
+        self.metricas = metricas
+        self.lote_maximo: int = lote_maximo
+        self.espera_s: float = espera_s
+        self._abiertos: dict = {}
+        self._tareas: set = set()
+
+    async def procesar(self, clave: tuple, datos: bytes) -> bytes:
+        """
+        Encola la imagen en el lote abierto de su clave y espera su resultado codificado.
+        """
+        ciclo = asyncio.get_running_loop()
+        futuro = ciclo.create_future()
+        lote = self._abiertos.get(clave)
+        if lote is None:
+            lote = self._abiertos[clave] = []
+            ciclo.call_later(self.espera_s, self._despachar, clave, lote)
+        lote.append((datos, futuro))
+        self.metricas.en_cola += 1
+        if len(lote) >= self.lote_maximo:
+            self._despachar(clave, lote)
+
+        estado, resultado = await futuro
+        if estado != 200:
+            raise ErrorSolicitud(estado, resultado)
+        return resultado
+
+    def _despachar(self, clave: tuple, lote: list) -> None:
+        # El temporizador de un lote ya enviado por estar lleno no debe enviar el siguiente lote de la misma clave
+        if self._abiertos.get(clave) is not lote:
+            return
+        del self._abiertos[clave]
+        tarea = asyncio.ensure_future(self._ejecutar(clave, lote))
+        self._tareas.add(tarea)
+        tarea.add_done_callback(self._tareas.discard)
+
+    async def _ejecutar(self, clave: tuple, lote: list) -> None:
+        self.metricas.tamanos_lote.observar(len(lote))
+        self.metricas.lotes_en_proceso += 1
+        pool = self.pool
+        try:
+            resultados = await asyncio.get_running_loop().run_in_executor(
+                pool, colorear_lote, [datos for datos, _ in lote], *clave)
+        except BrokenProcessPool:
+            # Solo el primer lote que encuentra el pool roto lo reemplaza; los fallos son del servidor, no del cliente
+            if self.pool is pool:
+                pool.shutdown(wait=False, cancel_futures=True)
+                self.pool = self.crear_pool()
+            resultados = [(503, "El pool de procesos falló y se reinició; intenta de nuevo.")] * len(lote)
+        except Exception as e:
+            resultados = [(500, f"Error en el pool de procesos: {e}")] * len(lote)
+        finally:
+            self.metricas.lotes_en_proceso -= 1
+            self.metricas.en_cola -= len(lote)
+        for (_, futuro), resultado in zip(lote, resultados):
+            # El cliente pudo haberse desconectado mientras tanto
+            if not futuro.done():
+                futuro.set_result(resultado)
+
+
+# --------- SERVIDOR HTTP ---------
+class ServicioPseudocolor:
+    """
+    Servidor HTTP/1.1 con conexiones persistentes, límite de solicitudes pendientes y micro-lotes.
+    Atributos:
+        - metricas: MetricasServicio → métricas expuestas en /metrics
+        - max_pendientes: int → solicitudes de coloreado aceptadas a la vez; las demás reciben 503
+        - tamano_maximo: int → tamaño máximo del cuerpo en bytes; los más grandes reciben 413
+    """
+    def __init__(self, workers: int = None, max_pendientes: int = MAX_PENDIENTES, lote_maximo: int = LOTE_MAXIMO,
+                 espera_lote_s: float = ESPERA_LOTE_S, tamano_maximo_mb: float = TAMANO_MAXIMO_MB) -> None:
+        self.metricas = MetricasServicio()
+        self.max_pendientes: int = max_pendientes
+        self.tamano_maximo: int = int(tamano_maximo_mb * 1024 * 1024)
+        self.agrupador = AgrupadorLotes(lambda: ProcessPoolExecutor(max_workers=workers), self.metricas,
+                                        lote_maximo, espera_lote_s)
+
+    async def iniciar(self, host: str = HOST, puerto: int = PUERTO) -> asyncio.AbstractServer:
+        return await asyncio.start_server(self._atender, host, puerto)
+
+    def cerrar(self) -> None:
+        self.agrupador.pool.shutdown(wait=True, cancel_futures=True)
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    cabecera = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), TIEMPO_ESPERA_S)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._responder(writer, 431, b"Cabeceras demasiado grandes.\n", cerrar=True)
+                    break
+                inicio = time.perf_counter()
+                ruta = "desconocida"
+                cerrar = False
+                try:
+                    metodo, objetivo, version, cabeceras = self._analizar(cabecera)
+                    ruta = urlsplit(objetivo).path
+                    cerrar = cabeceras.get("connection", "").lower() == "close" or version == "HTTP/1.0"
+                    estado, cuerpo, tipo = await self._enrutar(metodo, objetivo, cabeceras, reader)
+                except ErrorSolicitud as e:
+                    # Los rechazos antes de leer el cuerpo dejan bytes pendientes en la conexión: se cierra
+                    estado, cuerpo, tipo = e.estado, (str(e) + "\n").encode(), "text/plain; charset=utf-8"
+                    cerrar = cerrar or e.cerrar
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    break
+                except Exception as e:
+                    estado, cuerpo, tipo = 500, f"Error interno: {e}\n".encode(), "text/plain; charset=utf-8"
+                if ruta not in ("/pseudocolor", "/mapas", "/metrics", "/salud"):
+                    ruta = "otra"
+                await self._responder(writer, estado, cuerpo, tipo, cerrar=cerrar,
+                                      cabeceras_extra={"Retry-After": "1"} if estado == 503 else None)
+                self.metricas.registrar(ruta, estado, time.perf_counter() - inicio)
+                if cerrar:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(Exception):
+                await writer.wait_closed()
+
+    @staticmethod
+    def _analizar(cabecera: bytes) -> tuple:
+        """
+        Separa la línea de solicitud y las cabeceras (nombres en minúsculas).
+        """
+        lineas = cabecera.decode("latin-1").split("\r\n")
+        partes = lineas[0].split()
+        if len(partes) != 3 or not partes[2].startswith("HTTP/1."):
+            raise ErrorSolicitud(400, "Línea de solicitud no válida.", cerrar=True)
+        cabeceras = {}
+        for linea in lineas[1:]:
+            if linea:
+                nombre, _, valor = linea.partition(":")
+                cabeceras[nombre.strip().lower()] = valor.strip()
+        return partes[0].upper(), partes[1], partes[2], cabeceras
+
+    async def _enrutar(self, metodo: str, objetivo: str, cabeceras: dict, reader: asyncio.StreamReader) -> tuple:
+        """
+        Atiende la solicitud y retorna (estado, cuerpo, tipo_de_contenido).
+        """
+        partes = urlsplit(objetivo)
+        if partes.path == "/pseudocolor":
+            if metodo != "POST":
+                raise ErrorSolicitud(405, "Usa POST con los bytes de la imagen en el cuerpo.")
+            return await self._pseudocolor(parse_qs(partes.query), cabeceras, reader)
+        if metodo != "GET":
+            raise ErrorSolicitud(405, "Método no permitido.", cerrar=True)
+        if partes.path == "/mapas":
+            return 200, json.dumps(nombres_mapas()).encode(), "application/json"
+        if partes.path == "/metrics":
+            return 200, self.metricas.exportar().encode(), "text/plain; version=0.0.4"
+        if partes.path == "/salud":
+            return 200, b"ok\n", "text/plain; charset=utf-8"
+        raise ErrorSolicitud(404, f"Ruta '{partes.path}' no encontrada.")
+
+    async def _pseudocolor(self, consulta: dict, cabeceras: dict, reader: asyncio.StreamReader) -> tuple:
+        # Validar las opciones antes de leer el cuerpo, para rechazar sin costo las solicitudes inválidas
+        # (el cuerpo queda sin leer, por lo que estos rechazos cierran la conexión)
+        mapa = consulta.get("mapa", ["JET"])[0].upper()
+        formato = consulta.get("formato", ["png"])[0]
+        realce = consulta.get("realce", [None])[0]
+        calidad = consulta.get("calidad", [None])[0]
+        if calidad is not None:
+            try:
+                calidad = int(calidad)
+            except ValueError:
+                raise ErrorSolicitud(400, f"Calidad '{calidad}' no válida: debe ser un número entero.", cerrar=True)
+        try:
+            extension, _ = parametros_codificacion(formato, calidad)
+        except ValueError as e:
+            raise ErrorSolicitud(400, str(e), cerrar=True)
+        if not es_mapa_valido(mapa):
+            raise ErrorSolicitud(400, f"Opción '{mapa}' no válida. Opciones disponibles: {nombres_mapas()}",
+                                 cerrar=True)
+        if realce is not None and realce not in METODOS_REALCE:
+            raise ErrorSolicitud(400, f"Opción '{realce}' no válida. Opciones disponibles: {list(METODOS_REALCE)}",
+                                 cerrar=True)
+
+        if "chunked" in cabeceras.get("transfer-encoding", "").lower() or "content-length" not in cabeceras:
+            raise ErrorSolicitud(411, "Se requiere Content-Length.", cerrar=True)
+        try:
+            longitud = int(cabeceras["content-length"])
+        except ValueError:
+            raise ErrorSolicitud(400, "Content-Length no válido.", cerrar=True)
+        if longitud <= 0:
+            raise ErrorSolicitud(400, "El cuerpo debe contener la imagen.", cerrar=True)
+        if longitud > self.tamano_maximo:
+            raise ErrorSolicitud(413, f"La imagen excede el tamaño máximo de {self.tamano_maximo} bytes.",
+                                 cerrar=True)
+
+        # Contrapresión: rechazar en lugar de acumular trabajo que no se puede atender a tiempo
+        if self.metricas.pendientes >= self.max_pendientes:
+            self.metricas.rechazadas += 1
+            raise ErrorSolicitud(503, "Servicio saturado; intenta de nuevo más tarde.", cerrar=True)
+
+        self.metricas.pendientes += 1
+        try:
+            datos = await asyncio.wait_for(reader.readexactly(longitud), TIEMPO_ESPERA_S)
+            resultado = await self.agrupador.procesar((mapa, formato, calidad, realce), datos)
+        finally:
+            self.metricas.pendientes -= 1
+        return 200, resultado, TIPOS_CONTENIDO[extension]
+
+    @staticmethod
+    async def _responder(writer: asyncio.StreamWriter, estado: int, cuerpo: bytes,
+                         tipo: str = "text/plain; charset=utf-8", cerrar: bool = False,
+                         cabeceras_extra: dict = None) -> None:
+        cabeceras = {
+            "Content-Type": tipo,
+            "Content-Length": str(len(cuerpo)),
+            "Connection": "close" if cerrar else "keep-alive",
+            **(cabeceras_extra or {}),
+        }
+        encabezado = f"HTTP/1.1 {estado} {HTTPStatus(estado).phrase}\r\n"
+        encabezado += "".join(f"{nombre}: {valor}\r\n" for nombre, valor in cabeceras.items()) + "\r\n"
+        writer.write(encabezado.encode("latin-1") + cuerpo)
+        await writer.drain()
+
+
+async def servir(host: str = HOST, puerto: int = PUERTO, **opciones) -> None:
+    """
+    Inicia el servicio y atiende solicitudes hasta que se interrumpa el proceso.
+    """
+    servicio = ServicioPseudocolor(**opciones)
+    try:
+        servidor = await servicio.iniciar(host, puerto)
+        direcciones = ", ".join(str(s.getsockname()) for s in servidor.sockets)
+        print(f"Servicio de pseudocolor escuchando en {direcciones}")
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        servicio.cerrar()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Servicio HTTP local de pseudocolor (asyncio + pool de procesos).")
+    parser.add_argument("--host", default=HOST, help="Dirección en la que se escucha (por defecto solo localhost).")
+    parser.add_argument("-p", "--puerto", type=int, default=PUERTO, help="Puerto TCP.")
+    parser.add_argument("-w", "--workers", type=int, default=None,
+                        help="Número de procesos del pool (por defecto, el número de núcleos).")
+    parser.add_argument("--max-pendientes", type=int, default=MAX_PENDIENTES,
+                        help="Solicitudes de coloreado simultáneas antes de responder 503.")
+    parser.add_argument("--lote-maximo", type=int, default=LOTE_MAXIMO, help="Imágenes por micro-lote.")
+    parser.add_argument("--espera-lote-ms", type=float, default=ESPERA_LOTE_S * 1000,
+                        help="Tiempo máximo de espera para completar un micro-lote.")
+    parser.add_argument("--tamano-maximo-mb", type=float, default=TAMANO_MAXIMO_MB,
+                        help="Tamaño máximo de la imagen recibida.")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(servir(args.host, args.puerto, workers=args.workers, max_pendientes=args.max_pendientes,
+                           lote_maximo=args.lote_maximo, espera_lote_s=args.espera_lote_ms / 1000,
+                           tamano_maximo_mb=args.tamano_maximo_mb))
+    except KeyboardInterrupt:
+        print("Servicio detenido.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,269 @@
+# --------- PSEUDOCOLOR EN TIEMPO REAL PARA VIDEO Y CÁMARA ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Canal productor/consumidor de tres etapas (decodificar → colorear → codificar), cada una en su propio hilo
+# y comunicadas por colas acotadas. OpenCV libera el GIL durante la decodificación, el mapa de color y la
+# codificación, por lo que las tres etapas se ejecutan en paralelo.
+#
+# Ejemplo de uso:
+#   python video_pseudocolor.py termica.mp4 termica_jet.avi -m JET
+#   python video_pseudocolor.py 0 camara_inferno.avi -m INFERNO --max-frames 900
+#   python video_pseudocolor.py sintetico prueba.avi -m PASTEL
+
+import os
+import sys
+import time
+import queue
+import argparse
+import threading
+
+import cv2
+import numpy as np
+
+from registro_mapas import aplicar_mapa, es_mapa_valido, nombres_mapas # Importar el registro de mapas de color
+
+# Tamaño por defecto de las colas entre etapas (en cuadros)
+TAMANO_COLA = 8
+
+# Códec de salida según la extensión del archivo
+CODECS = {".avi": "MJPG", ".mp4": "mp4v", ".mkv": "XVID"}
+
+# Marca de fin de flujo que se propaga entre etapas
+_FIN = None
+
+
+def cuadros_sinteticos(n_cuadros: int = 300, ancho: int = 640, alto: int = 480):
+    """
+    Genera cuadros BGR sintéticos (un gradiente diagonal que se desplaza con una mancha "caliente" en movimiento),
+    útiles para probar el canal sin cámara ni archivos de video.
+    """
+    yy, xx = np.mgrid[0:alto, 0:ancho]
+    base = (xx + yy).astype(np.float32)
+    for i in range(n_cuadros):
+        cx = (ancho / 2) + (ancho / 3) * np.cos(i / 20)
+        cy = (alto / 2) + (alto / 3) * np.sin(i / 20)
+        mancha = 200 * np.exp(-((xx - cx) ** 2 + (yy - cy) ** 2) / (2 * 40 ** 2))
+        gris = np.clip(((base + 4 * i) % 256) * 0.4 + mancha, 0, 255).astype(np.uint8)
+        yield cv2.cvtColor(gris, cv2.COLOR_GRAY2BGR)
+
+
+def generar_video_sintetico(ruta: str, n_cuadros: int = 300, ancho: int = 640, alto: int = 480,
+                            fps: float = 30.0) -> str:
+    """
+    Escribe en disco un video sintético (ver cuadros_sinteticos) y retorna su ruta.
+    """
+    fourcc = cv2.VideoWriter_fourcc(*CODECS.get(os.path.splitext(ruta)[1].lower(), "MJPG"))
+    escritor = cv2.VideoWriter(ruta, fourcc, fps, (ancho, alto))
+    if not escritor.isOpened():
+        raise OSError(f"No se pudo crear el video {ruta}")
+    for cuadro in cuadros_sinteticos(n_cuadros, ancho, alto):
+        escritor.write(cuadro)
+    escritor.release()
+    return ruta
+
+
+class CanalVideoPseudocolor:
+    """
+    Canal de video en tiempo real que aplica un mapa de color a cada cuadro.
+    Atributos:
+        - nombre: str → mapa de color aplicado (OpenCV o paleta personalizada)
+        - descartar: bool → si es True, los cuadros que no caben en la cola se descartan (fuentes en vivo);
+          si es False, el lector espera (archivos de video, sin pérdidas)
+        - estadisticas: dict → cuadros leídos, escritos, descartados, segundos y FPS sostenidos
+    """
+    def __init__(self, nombre: str, tamano_cola: int = TAMANO_COLA, descartar: bool = False) -> None:
+        self.nombre: str = nombre.upper()
+        if not es_mapa_valido(self.nombre):
+            raise ValueError(f"Opción '{self.nombre}' no válida. Opciones disponibles: {nombres_mapas()}")
+        self.descartar: bool = descartar
+        self._cola_gris = queue.Queue(maxsize=tamano_cola)
+        self._cola_color = queue.Queue(maxsize=tamano_cola)
+        self._detener = threading.Event()
+        self._candado_estadisticas = threading.Lock()
+        self._error = None
+        self.estadisticas: dict = {"leidos": 0, "escritos": 0, "descartados": 0, "segundos": 0.0, "fps": 0.0}
+
+    def detener(self) -> None:
+        """
+        Solicita que el canal termine después del cuadro actual.
+        """
+        self._detener.set()
+
+    def _encolar(self, cola: queue.Queue, elemento) -> bool:
+        """
+        Coloca un elemento en la cola respetando la política de descarte.
+        Retorna False si el elemento se descartó.
+        """
+        if self.descartar:
+            try:
+                cola.put_nowait(elemento)
+                return True
+            except queue.Full:
+                # El lector y el coloreador descartan cuadros desde hilos distintos
+                with self._candado_estadisticas:
+                    self.estadisticas["descartados"] += 1
+                return False
+        # Sin descarte: esperar, revisando periódicamente si se pidió detener el canal
+        while not self._detener.is_set():
+            try:
+                cola.put(elemento, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _leer(self, fuente, max_cuadros: int) -> None:
+        """
+        Etapa 1: lee cuadros de la fuente, los convierte a escala de grises y los encola.
+        """
+        try:
+            for cuadro in fuente:
+                if self._detener.is_set() or (max_cuadros and self.estadisticas["leidos"] >= max_cuadros):
+                    break
+                self.estadisticas["leidos"] += 1
+                gris = cuadro if cuadro.ndim == 2 else cv2.cvtColor(cuadro, cv2.COLOR_BGR2GRAY)
+                self._encolar(self._cola_gris, gris)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._cola_gris.put(_FIN)
+
+    def _colorear(self) -> None:
+        """
+        Etapa 2: aplica el mapa de color a cada cuadro en escala de grises.
+        """
+        try:
+            while True:
+                gris = self._cola_gris.get()
+                if gris is _FIN:
+                    break
+                self._encolar(self._cola_color, aplicar_mapa(gris, self.nombre))
+        except Exception as e:
+            self._error = e
+            self._detener.set()
+            # Vaciar la cola para no bloquear a la etapa anterior
+            while self._cola_gris.get() is not _FIN:
+                pass
+        finally:
+            self._cola_color.put(_FIN)
+
+    def _escribir(self, escritor) -> None:
+        """
+        Etapa 3: codifica los cuadros coloreados con el escritor (por ejemplo, un cv2.VideoWriter).
+        """
+        try:
+            while True:
+                color = self._cola_color.get()
+                if color is _FIN:
+                    break
+                escritor.write(color)
+                self.estadisticas["escritos"] += 1
+        except Exception as e:
+            self._error = e
+            self._detener.set()
+            # Vaciar la cola para no bloquear a la etapa anterior
+            while self._cola_color.get() is not _FIN:
+                pass
+
+    def ejecutar(self, fuente, escritor, max_cuadros: int = 0) -> dict:
+        """
+        Ejecuta el canal completo hasta agotar la fuente (o llegar a max_cuadros) y retorna las estadísticas.
+        fuente: iterable de cuadros BGR o en escala de grises (ver iterar_captura y cuadros_sinteticos)
+        escritor: objeto con método write(cuadro), por ejemplo un cv2.VideoWriter
+        """
+        hilos = [
+            threading.Thread(target=self._leer, args=(fuente, max_cuadros), name="lector"),
+            threading.Thread(target=self._colorear, name="colorizador"),
+            threading.Thread(target=self._escribir, args=(escritor,), name="escritor"),
+        ]
+        inicio = time.perf_counter()
+        for hilo in hilos:
+            hilo.start()
+        try:
+            for hilo in hilos:
+                while hilo.is_alive():
+                    hilo.join(timeout=0.2)
+        except KeyboardInterrupt:
+            self.detener()
+            for hilo in hilos:
+                hilo.join()
+        duracion = time.perf_counter() - inicio
+
+        if self._error is not None:
+            raise self._error
+        self.estadisticas["segundos"] = duracion
+        self.estadisticas["fps"] = self.estadisticas["escritos"] / duracion if duracion > 0 else 0.0
+        return self.estadisticas
+
+
+def iterar_captura(captura: cv2.VideoCapture):
+    """
+    Convierte un cv2.VideoCapture en un iterador de cuadros; libera la captura al terminar.
+    """
+    try:
+        while True:
+            ok, cuadro = captura.read()
+            if not ok:
+                break
+            yield cuadro
+    finally:
+        captura.release()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Aplica un mapa de color a un video o a una cámara en tiempo real.")
+    parser.add_argument("entrada",
+                        help="Archivo de video, índice de cámara (0, 1, ...) o 'sintetico' para un video de prueba.")
+    parser.add_argument("salida", help="Archivo de video de salida (.avi, .mp4 o .mkv).")
+    parser.add_argument("-m", "--mapa", default="JET",
+                        help=f"Mapa de color a aplicar. Disponibles: {', '.join(nombres_mapas())}")
+    parser.add_argument("--fps", type=float, default=None, help="FPS de salida (por defecto, los de la entrada).")
+    parser.add_argument("--cola", type=int, default=TAMANO_COLA, help="Tamaño de las colas entre etapas.")
+    parser.add_argument("--max-frames", type=int, default=0, help="Número máximo de cuadros a procesar (0 = todos).")
+    parser.add_argument("--descartar", action="store_true",
+                        help="Descartar cuadros cuando el canal se satura (activado siempre para cámaras).")
+    args = parser.parse_args(argv)
+
+    if not es_mapa_valido(args.mapa):
+        print(f"Mapa '{args.mapa.upper()}' no válido. Opciones disponibles: {nombres_mapas()}")
+        return 2
+
+    # Preparar la fuente de cuadros
+    if args.entrada.lower() == "sintetico":
+        n_cuadros = args.max_frames or 300
+        fuente, ancho, alto, fps = cuadros_sinteticos(n_cuadros), 640, 480, 30.0
+        en_vivo = False
+    else:
+        en_vivo = args.entrada.isdigit()
+        captura = cv2.VideoCapture(int(args.entrada) if en_vivo else args.entrada)
+        if not captura.isOpened():
+            print(f"No se pudo abrir la entrada: {args.entrada}")
+            return 1
+        ancho = int(captura.get(cv2.CAP_PROP_FRAME_WIDTH))
+        alto = int(captura.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = captura.get(cv2.CAP_PROP_FPS) or 30.0
+        fuente = iterar_captura(captura)
+
+    fourcc = cv2.VideoWriter_fourcc(*CODECS.get(os.path.splitext(args.salida)[1].lower(), "MJPG"))
+    escritor = cv2.VideoWriter(args.salida, fourcc, args.fps or fps, (ancho, alto))
+    if not escritor.isOpened():
+        print(f"No se pudo crear el video de salida: {args.salida}")
+        return 1
+
+    try:
+        canal = CanalVideoPseudocolor(args.mapa, args.cola, descartar=args.descartar or en_vivo)
+        estadisticas = canal.ejecutar(fuente, escritor, args.max_frames)
+    finally:
+        escritor.release()
+
+    print("\n=== Resumen ===")
+    print(f"Cuadros leídos: {estadisticas['leidos']}, escritos: {estadisticas['escritos']}, "
+          f"descartados: {estadisticas['descartados']}")
+    print(f"Tiempo total: {estadisticas['segundos']:.2f} s, FPS sostenidos: {estadisticas['fps']:.1f}")
+    print(f"Video guardado en: {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,11 @@
+# --------- CONFIGURACIÓN DE LAS PRUEBAS ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+#
+# Los módulos de la práctica se importan por nombre (import config, import registro_mapas...), igual que
+# cuando se ejecutan desde la carpeta scripts.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "scripts"))
@@ -0,0 +1,16 @@
+# --------- PRUEBAS DE LAS MÉTRICAS PERCEPTUALES ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+from analisis_mapas import clasificar_mapas
+
+
+def test_mapas_perceptuales_superan_a_los_arcoiris():
+    # Clasificación de todos los mapas registrados (el contraste se normaliza respecto al mayor de ellos)
+    puntos = {fila["nombre"]: fila["puntuacion"] for fila in clasificar_mapas()}
+    assert min(puntos["VIRIDIS"], puntos["CIVIDIS"]) > max(puntos["JET"], puntos["RAINBOW"])
+
+
+def test_uniformidad_no_depende_del_ruido_de_cuantizacion():
+    uniformidad = {fila["nombre"]: fila["uniformidad"] for fila in clasificar_mapas()}
+    assert uniformidad["VIRIDIS"] > max(uniformidad["DEEPGREEN"], uniformidad["OCASO"], uniformidad["JET"])
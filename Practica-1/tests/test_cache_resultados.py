@@ -0,0 +1,121 @@
+# --------- PRUEBAS DE LA CACHÉ EN DISCO DE RESULTADOS ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import os
+
+import numpy as np
+import pytest
+
+from cache_resultados import CacheResultados, clave_resultado, huella_imagen
+from config import paletas_personalizadas
+from registro_mapas import registrar_paleta, _cache_luts, _cache_luts_rgb
+
+
+def escribir(contenido: bytes):
+    def generar(ruta):
+        with open(ruta, "wb") as archivo:
+            archivo.write(contenido)
+    return generar
+
+
+def test_obtener_o_generar_reutiliza_el_resultado(tmp_path):
+    cache = CacheResultados(str(tmp_path), 1024)
+    llamadas = []
+
+    def generar(ruta):
+        llamadas.append(ruta)
+        escribir(b"abc")(ruta)
+
+    ruta, reutilizado = cache.obtener_o_generar("k1", ".png", generar)
+    assert not reutilizado and os.path.basename(ruta) == "k1.png"
+    ruta2, reutilizado = cache.obtener_o_generar("k1", ".png", generar)
+    assert reutilizado and ruta2 == ruta and len(llamadas) == 1
+    assert cache.estadisticas()["aciertos"] == 1
+    # El archivo temporal se reemplaza por el definitivo
+    assert sorted(os.listdir(tmp_path)) == ["indice.json", "k1.png"]
+
+
+def test_indice_persistente(tmp_path):
+    cache = CacheResultados(str(tmp_path), 1024)
+    cache.obtener_o_generar("k1", ".png", escribir(b"abc"))
+    recargada = CacheResultados(str(tmp_path), 1024)
+    assert recargada.estadisticas()["entradas"] == 1
+    assert recargada.estadisticas()["bytes"] == 3
+    assert recargada.buscar("k1", ".png") is not None
+
+
+def test_desalojo_lru(tmp_path):
+    cache = CacheResultados(str(tmp_path), 10)
+    cache.obtener_o_generar("a", ".png", escribir(b"1234"))
+    cache.obtener_o_generar("b", ".png", escribir(b"1234"))
+    # Usar "a" la convierte en la más reciente; al exceder el límite se desaloja "b"
+    assert cache.buscar("a", ".png") is not None
+    cache.obtener_o_generar("c", ".png", escribir(b"1234"))
+    assert not os.path.exists(tmp_path / "b.png")
+    assert os.path.exists(tmp_path / "a.png") and os.path.exists(tmp_path / "c.png")
+    assert cache.estadisticas()["bytes"] == 8
+
+
+def test_desalojo_pospuesto(tmp_path):
+    cache = CacheResultados(str(tmp_path), 4)
+    for clave in ("a", "b", "c"):
+        (tmp_path / f"{clave}.png").write_bytes(b"1234")
+        cache.registrar(clave, f"{clave}.png", 4, desalojar=False)
+    # Mientras el desalojo está pospuesto ningún archivo se elimina
+    assert all(os.path.exists(tmp_path / f"{c}.png") for c in "abc")
+    cache.desalojar()
+    assert sorted(p for p in os.listdir(tmp_path)) == ["c.png"]
+
+
+def test_cache_sin_persistir_no_desaloja_ni_escribe_indice(tmp_path):
+    cache = CacheResultados(str(tmp_path), 0, persistir=False)
+    cache.obtener_o_generar("a", ".png", escribir(b"1234"))
+    cache.obtener_o_generar("b", ".png", escribir(b"1234"))
+    assert sorted(os.listdir(tmp_path)) == ["a.png", "b.png"]
+
+
+def test_huella_depende_de_pixeles_forma_y_tipo():
+    imagen = np.zeros((4, 4), dtype=np.uint8)
+    otra = imagen.copy()
+    otra[0, 0] = 1
+    assert huella_imagen(imagen) == huella_imagen(imagen.copy())
+    assert huella_imagen(imagen) != huella_imagen(otra)
+    assert huella_imagen(imagen) != huella_imagen(imagen.reshape(2, 8))
+    assert huella_imagen(imagen) != huella_imagen(imagen.astype(np.uint16))
+
+
+def test_clave_cambia_con_opciones_y_mapas():
+    huella = huella_imagen(np.zeros((4, 4), dtype=np.uint8))
+    base = clave_resultado(huella, ["JET"], formato="png")
+    assert base == clave_resultado(huella, ["jet"], formato="png")
+    assert base != clave_resultado(huella, ["JET"], formato="jpg")
+    assert base != clave_resultado(huella, ["INFERNO"], formato="png")
+
+
+@pytest.fixture
+def paleta_temporal():
+    nombre = "PRUEBA_CACHE"
+    yield nombre
+    paletas_personalizadas.pop(nombre, None)
+    _cache_luts.pop(nombre, None)
+    _cache_luts_rgb.pop(nombre, None)
+
+
+def test_clave_cambia_al_modificar_una_paleta(paleta_temporal):
+    huella = huella_imagen(np.zeros((4, 4), dtype=np.uint8))
+    registrar_paleta(paleta_temporal, [(0.0, 0.0, 0.0), (1.0, 1.0, 1.0)])
+    antes = clave_resultado(huella, [paleta_temporal])
+    registrar_paleta(paleta_temporal, [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0)])
+    assert clave_resultado(huella, [paleta_temporal]) != antes
+
+
+def test_descartar_elimina_la_entrada_y_el_archivo(tmp_path):
+    cache = CacheResultados(str(tmp_path), 1024)
+    cache.obtener_o_generar("a", ".png", escribir(b"1234"))
+    cache.descartar("a", ".png")
+    assert not os.path.exists(tmp_path / "a.png")
+    assert cache.estadisticas()["entradas"] == 0 and cache.estadisticas()["bytes"] == 0
+    # El siguiente acceso es un fallo y el resultado se vuelve a generar
+    _, reutilizado = cache.obtener_o_generar("a", ".png", escribir(b"1234"))
+    assert not reutilizado
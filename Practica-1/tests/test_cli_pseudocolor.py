@@ -0,0 +1,33 @@
+# --------- PRUEBAS DEL MODO POR LOTES ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import os
+
+import pytest
+
+from cli_pseudocolor import main, nombres_salida
+
+
+def test_nombres_unicos_se_conservan():
+    assert nombres_salida(["a/x.png", "b/y.png"]) == {"a/x.png": "x", "b/y.png": "y"}
+
+
+def test_nombres_repetidos_incluyen_la_carpeta():
+    rutas = [os.path.join("a", "x.png"), os.path.join("b", "x.png"), os.path.join("c", "y.png")]
+    assert nombres_salida(rutas) == {rutas[0]: "a_x", rutas[1]: "b_x", rutas[2]: "y"}
+
+
+def test_nombres_generados_no_chocan_con_existentes():
+    rutas = [os.path.join("a", "x.png"), os.path.join("b", "x.png"), "a_x.png"]
+    bases = nombres_salida(rutas)
+    assert len(set(bases.values())) == len(rutas)
+    assert bases["a_x.png"] == "a_x"
+
+
+@pytest.mark.parametrize("argumentos", [["--workers", "0"], ["--hilos", "0"]])
+def test_workers_e_hilos_menores_a_uno_se_rechazan(argumentos, capsys):
+    with pytest.raises(SystemExit) as salida:
+        main(["entrada.png", *argumentos])
+    assert salida.value.code == 2
+    assert "mayor o igual a 1" in capsys.readouterr().err
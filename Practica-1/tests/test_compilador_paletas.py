@@ -0,0 +1,127 @@
+# --------- PRUEBAS DEL COMPILADOR DE PALETAS ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import os
+import json
+
+import numpy as np
+import pytest
+
+import registro_mapas
+from compilador_paletas import cargar_paletas, compilar, interpolar_paleta, lut_paleta, validar_paleta
+from registro_mapas import ARCHIVO_INDICE, PREFIJO_PAQUETE
+
+
+def paleta(**cambios):
+    datos = {"nombre": "prueba", "colores": ["#000000", [1.0, 1.0, 1.0]]}
+    datos.update(cambios)
+    return datos
+
+
+def errores_de(datos) -> list:
+    with pytest.raises(ValueError) as e:
+        validar_paleta(datos, "p.json")
+    return str(e.value).splitlines()
+
+
+def test_paleta_valida_se_normaliza():
+    resultado = validar_paleta(paleta(espacio="LAB", colores=["#ff0000", "#00FF00", [0, 0, 1]]), "p.json")
+    assert resultado["nombre"] == "PRUEBA"
+    assert resultado["espacio"] == "lab"
+    np.testing.assert_allclose(resultado["colores"], np.eye(3))
+    np.testing.assert_allclose(resultado["posiciones"], [0.0, 0.5, 1.0])
+
+
+def test_validacion_reporta_todos_los_errores_de_una_paleta():
+    errores = errores_de({"nombre": "1x", "colores": ["#zz0000", [0, 0, 2], "#ffffff"],
+                          "posiciones": [0, 0.7, 0.5, 1], "espacio": "hsv", "extra": 1})
+    assert len(errores) == 7
+    assert any("'nombre'" in e for e in errores)
+    assert any("'extra'" in e for e in errores)
+    assert any("#zz0000" in e for e in errores)
+    assert any("[0, 0, 2]" in e for e in errores)
+    assert any("una posición por color" in e for e in errores)
+    assert any("sin decrecer" in e for e in errores)
+    assert any("hsv" in e for e in errores)
+
+
+@pytest.mark.parametrize("cambios", [
+    {"colores": ["#000000"]},
+    {"colores": "#000000"},
+    {"colores": ["#000000", [1, 1]]},
+    {"colores": ["#000000", [True, 0, 0]]},
+    {"posiciones": [0.2, 1.0]},
+    {"posiciones": [0.0, 0.9]},
+    {"descripcion": 3},
+])
+def test_definiciones_no_validas(cambios):
+    assert errores_de(paleta(**cambios))
+
+
+def test_cargar_paletas_detecta_nombres_repetidos_y_colisiones(tmp_path):
+    (tmp_path / "a.json").write_text(json.dumps({"paletas": [paleta(), paleta(nombre="JET")]}))
+    (tmp_path / "b.toml").write_text('nombre = "prueba"\ncolores = ["#000000", "#ffffff"]\n')
+    with pytest.raises(ValueError) as e:
+        cargar_paletas([str(tmp_path / "a.json"), str(tmp_path / "b.toml")])
+    errores = str(e.value).splitlines()
+    assert len(errores) == 2
+    assert "JET" in errores[0] and "b.toml" in errores[1]
+
+
+def test_interpolacion_respeta_colores_de_control_y_cambios_bruscos():
+    colores = np.array([[0.0, 0.0, 0.0], [0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 0.0, 0.0]])
+    posiciones = np.array([0.0, 0.5, 0.5, 1.0])
+    for espacio in ("rgb", "lab"):
+        rgb = interpolar_paleta(colores, posiciones, espacio)
+        np.testing.assert_allclose(rgb[:128], 0.0, atol=1e-9)
+        np.testing.assert_allclose(rgb[128:], [[1.0, 0.0, 0.0]] * 128, atol=1e-6)
+
+
+@pytest.fixture
+def carpeta_compilada(tmp_path):
+    yield str(tmp_path)
+    # Restaurar las paletas compiladas del proyecto
+    registro_mapas.cargar_paletas_compiladas()
+
+
+def test_ida_y_vuelta_del_paquete(tmp_path, carpeta_compilada):
+    (tmp_path / "p.toml").write_text('nombre = "ida_vuelta"\nespacio = "lab"\n'
+                                     'colores = ["#1b0c41", "#b63679", "#fcfdbf"]\nposiciones = [0, 0.3, 1]\n')
+    paletas = cargar_paletas([str(tmp_path / "p.toml")])
+    compilar(paletas, carpeta_compilada)
+
+    assert registro_mapas.cargar_paletas_compiladas(carpeta_compilada) == 1
+    assert registro_mapas.es_mapa_valido("ida_vuelta")
+    assert registro_mapas.nombres_mapas()[-1] == "IDA_VUELTA"
+    lut = registro_mapas.obtener_lut("IDA_VUELTA")
+    np.testing.assert_array_equal(lut, lut_paleta(paletas[0]))
+    assert lut.shape == (256, 1, 3) and not lut.flags.writeable
+    gris = np.arange(256, dtype=np.uint8).reshape(16, 16)
+    esperado = lut[gris.ravel(), 0].reshape(16, 16, 3)
+    np.testing.assert_array_equal(registro_mapas.aplicar_mapa(gris, "IDA_VUELTA"), esperado)
+
+
+def test_recompilar_reemplaza_el_paquete(tmp_path, carpeta_compilada):
+    primera = [validar_paleta(paleta(nombre="UNO"), "a.json") | {"archivo": "a.json"}]
+    segunda = [validar_paleta(paleta(nombre="DOS", colores=["#ff0000", "#0000ff"]), "b.json") | {"archivo": "b.json"}]
+    compilar(primera, carpeta_compilada)
+    registro_mapas.cargar_paletas_compiladas(carpeta_compilada)
+    assert registro_mapas.obtener_lut("UNO")[255, 0].tolist() == [255, 255, 255]
+
+    ruta_paquete, ruta_indice = compilar(segunda, carpeta_compilada)
+    # El índice apunta al paquete nuevo y el anterior se elimina
+    with open(ruta_indice, encoding="utf-8") as archivo:
+        assert json.load(archivo)["paquete"] == os.path.basename(ruta_paquete)
+    paquetes = [f for f in os.listdir(carpeta_compilada) if f.startswith(PREFIJO_PAQUETE)]
+    assert paquetes == [os.path.basename(ruta_paquete)]
+
+    registro_mapas.cargar_paletas_compiladas(carpeta_compilada)
+    assert not registro_mapas.es_mapa_valido("UNO")
+    assert registro_mapas.obtener_lut("DOS")[0, 0].tolist() == [0, 0, 255]
+
+
+def test_carpeta_sin_paquete_no_carga_nada(tmp_path, carpeta_compilada):
+    assert registro_mapas.cargar_paletas_compiladas(str(tmp_path / "no_existe")) == 0
+    (tmp_path / ARCHIVO_INDICE).write_text(json.dumps({"version": 2, "paquete": "falta.npy", "paletas": []}))
+    assert registro_mapas.cargar_paletas_compiladas(str(tmp_path)) == 0
@@ -0,0 +1,52 @@
+# --------- PRUEBAS DE LA INTERFAZ GRÁFICA (SIN PANTALLA) ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import cv2
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt5")
+from PyQt5.QtWidgets import QApplication, QFileDialog
+
+import gui_practica_1
+
+
+@pytest.fixture(scope="module")
+def aplicacion():
+    return QApplication.instance() or QApplication([])
+
+
+def esperar_tareas(ventana, aplicacion):
+    ventana.thread_pool.waitForDone()
+    aplicacion.processEvents()
+
+
+def paneles_dibujados(ventana):
+    return [ax.images[0].get_array() for ax in ventana.figure.axes]
+
+
+def test_cambiar_realce_redibuja_el_panel_en_escala_de_grises(aplicacion, tmp_path, monkeypatch):
+    # Gradiente de bajo contraste (100..140): la ecualización lo extiende a 0..255
+    gradiente = np.tile(np.linspace(100, 140, 256).astype(np.uint8), (64, 1))
+    ruta = str(tmp_path / "gradiente.png")
+    cv2.imwrite(ruta, gradiente)
+    monkeypatch.setattr(QFileDialog, "getOpenFileName", lambda *args, **kwargs: (ruta, ""))
+
+    ventana = gui_practica_1.Practica1GUI()
+    ventana.resize(800, 400)
+    ventana.select_image()
+    ventana.preview_colormap("JET")
+    esperar_tareas(ventana, aplicacion)
+    gris, _ = paneles_dibujados(ventana)
+    assert gris.min() >= 100 and gris.max() <= 140
+
+    ventana.combo_realce.setCurrentText("ecualizar")
+    esperar_tareas(ventana, aplicacion)
+    gris, _ = paneles_dibujados(ventana)
+    assert gris.min() == 0 and gris.max() == 255
+    ventana.close()
@@ -0,0 +1,32 @@
+# --------- PRUEBAS DE LA CLASE IMAGENPSEUDOCOLOR ---------
+# Autor: Rodrigo Arturo Fernández González
+# Fecha: 10-18-2026
+
+import numpy as np
+import pytest
+
+from imagen_pseudocolor import ImagenPseudocolor
+
+
+def test_dst_con_forma_distinta_lanza_error():
+    imagen_gris = np.zeros((4, 6), dtype=np.uint8)
+    with pytest.raises(ValueError):
+        ImagenPseudocolor(imagen_gris, "JET", dst=np.empty((6, 4, 3), dtype=np.uint8))
+    resultado = ImagenPseudocolor(imagen_gris, "JET")
+    with pytest.raises(ValueError):
+        resultado.aplicar(imagen_gris, dst=np.empty((4, 5, 3), dtype=np.uint8))
+
+
+def test_dst_se_escribe_sin_asignar_otro_bufer():
+    dst = np.empty((4, 6, 3), dtype=np.uint8)
+    resultado = ImagenPseudocolor(np.zeros((4, 6), dtype=np.uint8), "JET", dst=dst)
+    assert resultado.imagen is dst
+
+
+def test_bufer_reutilizado_se_reemplaza_si_cambia_la_forma():
+    resultado = ImagenPseudocolor(np.zeros((4, 6), dtype=np.uint8), "JET")
+    bufer = resultado.imagen
+    resultado.aplicar(np.zeros((4, 6), dtype=np.uint8), "INFERNO")
+    assert resultado.imagen is bufer
+    resultado.aplicar(np.zeros((8, 3), dtype=np.uint8))
+    assert resultado.imagen.shape == (8, 3, 3)